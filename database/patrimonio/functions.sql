@@ -257,7 +257,7 @@ BEGIN
             COUNT(*) as total_eq,
             COUNT(CASE WHEN alienado = true THEN 1 END) as alienated_eq,
             COALESCE(SUM(valor_aquisicao), 0) as total_value,
-            AVG(EXTRACT(YEAR FROM now()) - ano) as avg_age
+            AVG(EXTRACT(YEAR FROM now()) - ano_fabricacao) as avg_age
         FROM maquinas_equipamentos
         WHERE organizacao_id = p_organizacao_id
     )
@@ -287,15 +287,15 @@ BEGIN
     RETURN QUERY
     SELECT 
         me.id,
-        me.descricao,
+        me.equipamento,
         me.marca,
-        me.ano,
-        (EXTRACT(YEAR FROM now()) - me.ano)::INTEGER,
+        me.ano_fabricacao,
+        (EXTRACT(YEAR FROM now()) - me.ano_fabricacao)::INTEGER,
         me.valor_aquisicao
     FROM maquinas_equipamentos me
     WHERE me.organizacao_id = p_organizacao_id
-      AND (EXTRACT(YEAR FROM now()) - me.ano) >= p_max_age_years
-    ORDER BY (EXTRACT(YEAR FROM now()) - me.ano) DESC;
+      AND (EXTRACT(YEAR FROM now()) - me.ano_fabricacao) >= p_max_age_years
+    ORDER BY (EXTRACT(YEAR FROM now()) - me.ano_fabricacao) DESC;
 END;
 $$ LANGUAGE plpgsql STABLE;
 
@@ -153,7 +153,7 @@ CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_org
 
 -- Year filtering
 CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_ano 
-    ON maquinas_equipamentos(ano);
+    ON maquinas_equipamentos(ano_fabricacao);
 
 -- Brand filtering
 CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_marca 
@@ -176,11 +176,11 @@ CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_numero_serie
 
 -- Text search on descriptions
 CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_descricao_text 
-    ON maquinas_equipamentos USING GIN (to_tsvector('portuguese', descricao));
+    ON maquinas_equipamentos USING GIN (to_tsvector('portuguese', equipamento));
 
 -- Composite indexes
 CREATE INDEX IF NOT EXISTS idx_maquinas_equipamentos_org_ano_alienado 
-    ON maquinas_equipamentos(organizacao_id, ano, alienado);
+    ON maquinas_equipamentos(organizacao_id, ano_fabricacao, alienado);
 
 
 -- =============================================================================
@@ -106,22 +106,28 @@ CREATE TABLE IF NOT EXISTS maquinas_equipamentos (
     organizacao_id UUID NOT NULL REFERENCES organizacoes(id) ON DELETE CASCADE,
     
     -- Equipment details
-    descricao TEXT NOT NULL,
-    ano INTEGER NOT NULL,
+    equipamento TEXT NOT NULL,
+    ano_fabricacao INTEGER NOT NULL,
     marca TEXT,
     modelo TEXT,
     alienado BOOLEAN NOT NULL DEFAULT false,
     numero_chassi TEXT,
     valor_aquisicao DECIMAL(15, 2),
     numero_serie TEXT,
+    quantidade INTEGER DEFAULT 1,
+    valor_unitario DECIMAL(15, 2),
+    reposicao_sr DECIMAL(15, 2) DEFAULT 0,
     
     -- Timestamps
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     
     -- Constraints
-    CONSTRAINT chk_equipamento_ano_valid CHECK (ano >= 1900 AND ano <= EXTRACT(YEAR FROM now()) + 10),
-    CONSTRAINT chk_equipamento_valor_positive CHECK (valor_aquisicao IS NULL OR valor_aquisicao > 0)
+    CONSTRAINT chk_equipamento_ano_valid CHECK (ano_fabricacao >= 1900 AND ano_fabricacao <= EXTRACT(YEAR FROM now()) + 10),
+    CONSTRAINT chk_equipamento_valor_positive CHECK (valor_aquisicao IS NULL OR valor_aquisicao > 0),
+    CONSTRAINT chk_quantidade_positive CHECK (quantidade IS NULL OR quantidade > 0),
+    CONSTRAINT chk_valor_unitario_positive CHECK (valor_unitario IS NULL OR valor_unitario > 0),
+    CONSTRAINT chk_reposicao_sr_non_negative CHECK (reposicao_sr IS NULL OR reposicao_sr >= 0)
 );
 
 -- =============================================================================
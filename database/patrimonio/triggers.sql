@@ -51,9 +51,9 @@ BEGIN
         END IF;
     ELSIF table_name = 'maquinas_equipamentos' THEN
         -- Equipment can be historical but not too far in the future
-        IF NEW.ano < 1900 OR NEW.ano > (current_year + 5) THEN
+        IF NEW.ano_fabricacao < 1900 OR NEW.ano_fabricacao > (current_year + 5) THEN
             RAISE EXCEPTION 'Ano inválido para equipamento: %. Deve estar entre 1900 e %.', 
-                NEW.ano, (current_year + 5);
+                NEW.ano_fabricacao, (current_year + 5);
         END IF;
     END IF;
     
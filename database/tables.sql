@@ -659,7 +659,7 @@ CREATE TABLE IF NOT EXISTS maquinas_equipamentos (
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     
     -- Constraints
-    CONSTRAINT chk_equipamento_ano_valid CHECK (ano >= 1900 AND ano <= EXTRACT(YEAR FROM now()) + 10),
+    CONSTRAINT chk_equipamento_ano_valid CHECK (ano_fabricacao >= 1900 AND ano_fabricacao <= EXTRACT(YEAR FROM now()) + 10),
     CONSTRAINT chk_equipamento_valor_positive CHECK (valor_aquisicao IS NULL OR valor_aquisicao > 0),
     CONSTRAINT chk_quantidade_positive CHECK (quantidade IS NULL OR quantidade > 0),
     CONSTRAINT chk_valor_unitario_positive CHECK (valor_unitario IS NULL OR valor_unitario > 0),
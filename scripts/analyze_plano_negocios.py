@@ -4,144 +4,522 @@ Script para ler e analisar o arquivo Excel do Plano de Negócios
 Arquivo: 062025_PLANO DE NEGÓCIOS WILSEMAR ELGER_070625_Ver. II.xlsx
 """
 
-import pandas as pd
-import numpy as np
 from pathlib import Path
+import argparse
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 
-def analyze_excel_file(file_path):
+from plano_batch import (
+    add_batch_arguments, add_sheet_workers_argument, expand_workbook_paths, print_batch_summary, run_batch
+)
+from plano_cache import ExtractionCache
+from plano_columnar import write_tables
+from plano_profile import NULL_PROFILER, Profiled, StageProfiler, write_profile_report
+from plano_workbook import PlanoWorkbook
+
+# Incrementar quando a estrutura da análise mudar, invalidando o cache
+ANALYZER_VERSION = 3
+
+DEFAULT_FILE = Path("/Users/guilhermeoliveiragomes/Projects/SR-CONSULTORIA/docs/062025_PLANO DE NEGÓCIOS WILSEMAR ELGER_070625_Ver. II.xlsx")
+
+
+def text_cells(col):
+    """
+    Máscara das células de texto da coluna, decidida pelo dtype/infer_dtype
+    da coluna inteira; só colunas de objetos com tipos misturados usam o
+    acessor .str, que devolve NaN no que não é texto
+    """
+    import pandas as pd
+
+    if pd.api.types.is_string_dtype(col.dtype) and col.dtype != object:
+        return col.notna()
+    if col.dtype != object:
+        return pd.Series(False, index=col.index)
+
+    inferido = pd.api.types.infer_dtype(col, skipna=True)
+    if inferido == 'string':
+        return col.notna()
+    if inferido in ('mixed', 'mixed-integer'):
+        try:
+            return col.str.len().notna()
+        except AttributeError:
+            # Tipos misturados, mas nenhum texto
+            pass
+    return pd.Series(False, index=col.index)
+
+
+def detect_header_row(df, max_rows=10):
+    """
+    Procura o cabeçalho nas primeiras linhas: a primeira linha com pelo menos
+    3 valores não nulos, dos quais pelo menos 2 são textos
+    """
+    top = df.head(max_rows)
+    if top.empty:
+        return None
+
+    valores_nao_nulos = top.notna().sum(axis=1)
+    textos = sum(text_cells(top.iloc[:, i]).to_numpy(dtype=int) for i in range(top.shape[1]))
+
+    candidatas = top.index[(valores_nao_nulos >= 3) & (textos >= 2)]
+    return int(candidatas[0]) if len(candidatas) > 0 else None
+
+
+# Tipo dos valores não nulos de uma coluna homogênea, pelo infer_dtype do pandas
+INFERRED_TYPE_NAMES = {
+    'string': 'str',
+    'integer': 'int',
+    'floating': 'float',
+    'boolean': 'bool',
+    'date': 'date',
+    'time': 'time',
+}
+
+# Números de colunas misturadas separados pela representação em texto (astype(str))
+BOOL_TEXTS = ['True', 'False']
+INT_TEXT = r'-?\d+'
+
+
+def _ordered_counts(masks):
+    """
+    {tipo: quantidade} das máscaras não vazias, na ordem da primeira célula de
+    cada tipo; máscaras com o mesmo nome são somadas
+    """
+    contagens = {}
+    primeiros = {}
+    for tipo, mask in masks:
+        mask = mask.to_numpy(dtype=bool) if hasattr(mask, 'to_numpy') else mask
+        qtd = int(mask.sum())
+        if qtd:
+            contagens[tipo] = contagens.get(tipo, 0) + qtd
+            primeiros[tipo] = min(primeiros.get(tipo, len(mask)), int(mask.argmax()))
+    return {tipo: contagens[tipo] for tipo in sorted(contagens, key=primeiros.get)}
+
+
+def mixed_type_counts(col):
+    """
+    Histograma de tipos de uma coluna de objetos com tipos misturados, montado
+    com máscaras da coluna inteira: textos, números (bool/int/float pela
+    representação em texto), datas, nulos (None ou NaN) e 'other' para o resto
+    """
+    import warnings
+
+    import numpy as np
+    import pandas as pd
+
+    valores = col.to_numpy(dtype=object)
+    validos = col.notna().to_numpy()
+    nenhum = np.equal(valores, None)
+
+    texto = text_cells(col).to_numpy()
+    numero = validos & ~texto & pd.to_numeric(col, errors='coerce').notna().to_numpy()
+    representacao = col[numero].astype(str)
+    booleano = np.zeros(len(col), dtype=bool)
+    booleano[numero] = representacao.isin(BOOL_TEXTS).to_numpy()
+    inteiro = np.zeros(len(col), dtype=bool)
+    inteiro[numero] = representacao.str.fullmatch(INT_TEXT).to_numpy(dtype=bool)
+    inteiro &= ~booleano
+
+    resto = validos & ~texto & ~numero
+    data = np.zeros(len(col), dtype=bool)
+    if resto.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            data[resto] = pd.to_datetime(col[resto], errors='coerce').notna().to_numpy()
+
+    return _ordered_counts([
+        ('str', texto),
+        ('bool', booleano),
+        ('int', inteiro),
+        ('float', numero & ~booleano & ~inteiro),
+        ('datetime', data),
+        ('other', resto & ~data),
+        ('NoneType', nenhum),
+        # Demais nulos do leitor são NaN
+        ('float', ~validos & ~nenhum),
+    ])
+
+
+def column_type_counts(col, nulos, primeiro_nulo):
+    """
+    Histograma de tipos da coluna (nome do tipo -> quantidade), na ordem em
+    que cada tipo aparece, como col.apply(type).value_counts()
+
+    Colunas homogêneas são resolvidas pelo dtype e pela contagem de nulos;
+    colunas de objetos com tipos misturados, por mixed_type_counts. Nenhum
+    caminho chama type() em cada célula
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_float_dtype(col.dtype):
+        # NaN também é float
+        return {'float': len(col)}
+    if pd.api.types.is_integer_dtype(col.dtype) and not pd.api.types.is_extension_array_dtype(col.dtype):
+        return {'int': len(col)}
+    if pd.api.types.is_bool_dtype(col.dtype) and not pd.api.types.is_extension_array_dtype(col.dtype):
+        return {'bool': len(col)}
+
+    if col.dtype != object:
+        # Outros dtypes (datas, textos, categorias...) têm um só tipo de valor
+        if nulos == len(col):
+            return {type(col.iloc[0]).__name__: len(col)} if len(col) else {}
+        tipo = type(col.iloc[int(col.notna().to_numpy().argmax())]).__name__
+    else:
+        inferido = pd.api.types.infer_dtype(col, skipna=True)
+        if inferido not in INFERRED_TYPE_NAMES:
+            return mixed_type_counts(col)
+        tipo = INFERRED_TYPE_NAMES[inferido]
+
+    if nulos == 0:
+        return {tipo: len(col)}
+    validos = col.notna()
+    if col.dtype == object:
+        # Nulos de colunas de objetos podem misturar None e NaN
+        nenhum = np.equal(col.to_numpy(dtype=object), None)
+        return _ordered_counts([(tipo, validos), ('NoneType', nenhum), ('float', ~validos & ~nenhum)])
+
+    # Nulos contam como o tipo do próprio valor nulo (NaN -> float, NaT -> NaTType)
+    tipo_nulo = type(col.iloc[primeiro_nulo]).__name__
+    return _ordered_counts([(tipo, validos), (tipo_nulo, ~validos)])
+
+
+def column_statistics(df):
+    """
+    Tipo predominante de cada coluna e estatísticas das colunas numéricas
+    (float64/int64), calculadas de uma vez para o DataFrame inteiro
+
+    Retorna (tipos_dados, valores_numericos) no formato da análise
+    """
+    import pandas as pd
+
+    tipos_dados = {}
+    valores_numericos = {}
+
+    if len(df) > 0:
+        nulos = df.isna()
+        qtd_nulos = nulos.sum().to_numpy()
+        primeiro_nulo = nulos.to_numpy().argmax(axis=0)
+
+        for i, col in enumerate(df.columns):
+            contagens = column_type_counts(df.iloc[:, i], int(qtd_nulos[i]), int(primeiro_nulo[i]))
+            if contagens:
+                # Em caso de empate vale o tipo que aparece primeiro, como no value_counts
+                tipos_dados[str(col)] = max(contagens, key=contagens.get)
+
+    posicoes = [
+        i for i, dtype in enumerate(df.dtypes) if dtype in ['float64', 'int64']
+    ]
+    if posicoes:
+        numericas = df.iloc[:, posicoes]
+        resumo = pd.DataFrame({
+            "min": numericas.min(),
+            "max": numericas.max(),
+            "media": numericas.mean(),
+            "soma": numericas.sum(),
+            "qtd_valores": numericas.count()
+        }).reset_index(drop=True)
+
+        for i, stats in zip(posicoes, resumo.itertuples(index=False)):
+            if stats.qtd_valores > 0:
+                valores_numericos[str(df.columns[i])] = {
+                    "min": float(stats.min),
+                    "max": float(stats.max),
+                    "media": float(stats.media),
+                    "soma": float(stats.soma),
+                    "qtd_valores": int(stats.qtd_valores)
+                }
+
+    return tipos_dados, valores_numericos
+
+
+def analysis_tables(dados_extraidos):
+    """
+    Converte a análise em tabelas para saída colunar: uma linha por planilha,
+    uma por coluna com tipo predominante e uma por coluna numérica
+    """
+    import pandas as pd
+
+    planilhas = pd.DataFrame(
+        [
+            {
+                "planilha": nome,
+                "linhas": dados["dimensoes"]["linhas"],
+                "colunas": dados["dimensoes"]["colunas"],
+                "linha_cabecalho": dados["linha_cabecalho"]
+            }
+            for nome, dados in dados_extraidos["planilhas"].items()
+        ],
+        columns=["planilha", "linhas", "colunas", "linha_cabecalho"]
+    )
+    planilhas["linha_cabecalho"] = planilhas["linha_cabecalho"].astype("Int64")
+    
+    tipos_dados = pd.DataFrame(
+        [
+            {"planilha": nome, "coluna": coluna, "tipo": tipo}
+            for nome, dados in dados_extraidos["planilhas"].items()
+            for coluna, tipo in dados["tipos_dados"].items()
+        ],
+        columns=["planilha", "coluna", "tipo"]
+    )
+    tipos_dados[["planilha", "tipo"]] = tipos_dados[["planilha", "tipo"]].astype("category")
+    
+    valores_numericos = pd.DataFrame(
+        [
+            {"planilha": nome, "coluna": coluna, **stats}
+            for nome, dados in dados_extraidos["planilhas"].items()
+            for coluna, stats in dados["valores_numericos"].items()
+        ],
+        columns=["planilha", "coluna", "min", "max", "media", "soma", "qtd_valores"]
+    )
+    valores_numericos["planilha"] = valores_numericos["planilha"].astype("category")
+    valores_numericos = valores_numericos.astype(
+        {"min": float, "max": float, "media": float, "soma": float, "qtd_valores": "int64"}
+    )
+    
+    return {
+        "planilhas": planilhas,
+        "tipos_dados": tipos_dados,
+        "valores_numericos": valores_numericos
+    }
+
+def save_analysis(dados_extraidos, file_path, output_dir=None, output_format="json"):
+    """
+    Salva a análise como JSON único ou, em 'parquet'/'arrow', como tabelas
+    com colunas e primeiras linhas de cada planilha em metadata.json
+
+    Retorna o caminho do JSON (ou diretório) gerado
+    """
+    output_dir = Path(output_dir) if output_dir else Path(file_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    if output_format == "json":
+        output_file = output_dir / f"analise_{Path(file_path).stem}.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(dados_extraidos, f, ensure_ascii=False, indent=2, default=str)
+        return output_file
+    
+    sidecar = {
+        "metadata": dados_extraidos["metadata"],
+        "planilhas": {
+            nome: {"colunas": dados["colunas"], "primeiras_linhas": dados["primeiras_linhas"]}
+            for nome, dados in dados_extraidos["planilhas"].items()
+        }
+    }
+    return write_tables(
+        analysis_tables(dados_extraidos),
+        sidecar,
+        output_dir / f"analise_{Path(file_path).stem}",
+        output_format
+    )
+
+def analyze_sheet(excel_file, sheet_name, profiler=NULL_PROFILER):
+    """
+    Analisa uma planilha da sessão `excel_file` (PlanoWorkbook)
+
+    Retorna (dados_planilha, log): o resultado no formato da análise e as
+    linhas de log, impressas por quem chama na ordem das planilhas
+    """
+    import numpy as np
+    import pandas as pd
+
+    log = [f"\n📋 Analisando planilha: '{sheet_name}'", "-"*40]
+    
+    # Ler a planilha (já carregada em memória)
+    df = excel_file.sheet(sheet_name, header=None)
+    
+    # Informações básicas
+    log.append(f"  Dimensões: {df.shape[0]} linhas x {df.shape[1]} colunas")
+    
+    # Tentar identificar cabeçalhos
+    with profiler.stage("deteccao_cabecalho", sheet_name) as etapa:
+        header_row = detect_header_row(df)
+        etapa["linhas"] = len(df)
+    
+    if header_row is not None:
+        # Promover o cabeçalho identificado em memória, sem reler a planilha
+        df = excel_file.sheet(sheet_name, header=header_row)
+        log.append(f"  Cabeçalho identificado na linha: {header_row + 1}")
+        log.append(f"  Colunas: {', '.join([str(col) for col in df.columns[:10]])}")
+        if len(df.columns) > 10:
+            log.append(f"  ... e mais {len(df.columns) - 10} colunas")
+    
+    # Análise de conteúdo
+    dados_planilha = {
+        "dimensoes": {"linhas": df.shape[0], "colunas": df.shape[1]},
+        "linha_cabecalho": header_row,
+        "colunas": list(df.columns) if header_row is not None else [],
+        "tipos_dados": {},
+        "valores_numericos": {},
+        "primeiras_linhas": []
+    }
+    
+    # Identificar tipos de dados e valores numéricos
+    with profiler.stage("estatisticas_colunas", sheet_name) as etapa:
+        tipos_dados, valores_numericos = column_statistics(df)
+        dados_planilha["tipos_dados"] = tipos_dados
+        dados_planilha["valores_numericos"] = valores_numericos
+        etapa["linhas"] = len(df)
+    
+    # Capturar primeiras linhas com dados
+    linhas_com_dados = df[df.notna().any(axis=1)].head(5)
+    for idx, row in linhas_com_dados.iterrows():
+        linha_dict = {}
+        for col in row.index:
+            valor = row[col]
+            if pd.notna(valor):
+                # Converter para tipo serializável
+                if isinstance(valor, (np.integer, np.floating)):
+                    valor = float(valor)
+                elif isinstance(valor, np.bool_):
+                    valor = bool(valor)
+                elif pd.api.types.is_datetime64_any_dtype(type(valor)):
+                    valor = str(valor)
+                linha_dict[str(col)] = valor
+        dados_planilha["primeiras_linhas"].append(linha_dict)
+    
+    # Análise específica baseada no nome da planilha
+    if "safra" in sheet_name.lower() or "produção" in sheet_name.lower():
+        log.append("\n  🌾 Planilha de produção/safra detectada")
+        # Procurar por culturas
+        for col in df.columns:
+            if any(cultura in str(col).lower() for cultura in ['soja', 'milho', 'algodão', 'trigo']):
+                log.append(f"    - Cultura encontrada: {col}")
+                
+    elif "financ" in sheet_name.lower() or "divida" in sheet_name.lower():
+        log.append("\n  💰 Planilha financeira detectada")
+        # Procurar por valores monetários
+        for col, stats in dados_planilha["valores_numericos"].items():
+            if stats["max"] > 1000:  # Provavelmente valores monetários
+                log.append(f"    - {col}: R$ {stats['soma']:,.2f}")
+                
+    elif "area" in sheet_name.lower() or "hectare" in sheet_name.lower():
+        log.append("\n  📍 Planilha de áreas detectada")
+        for col, stats in dados_planilha["valores_numericos"].items():
+            if 'area' in str(col).lower() or 'hectare' in str(col).lower():
+                log.append(f"    - {col}: {stats['soma']:,.2f} ha")
+    
+    return dados_planilha, log
+
+# Sessão do arquivo em cada processo da análise por planilha
+_SHEET_WORKBOOK = None
+
+def _init_sheet_worker(file_path, engine):
+    """
+    Prepara o processo: abre uma sessão própria do arquivo (somente leitura),
+    usada em todas as planilhas que o processo analisar (o arquivo é fechado
+    quando o processo termina)
+    """
+    global _SHEET_WORKBOOK
+    _SHEET_WORKBOOK = PlanoWorkbook(file_path, engine=engine)
+
+def _analyze_sheet_task(sheet_name, profile):
+    """
+    Analisa uma planilha no processo; devolve também os registros do perfil
+    """
+    profiler = StageProfiler(trace_memory=False) if profile else NULL_PROFILER
+    _SHEET_WORKBOOK.profiler = profiler
+    try:
+        dados_planilha, log = analyze_sheet(_SHEET_WORKBOOK, sheet_name, profiler)
+    finally:
+        # O processo analisa várias planilhas; as já analisadas saem da memória
+        _SHEET_WORKBOOK.release(sheet_name)
+    return dados_planilha, log, profiler.records
+
+def analyze_sheets(excel_file, sheet_workers=1, profiler=NULL_PROFILER):
+    """
+    Gera (planilha, dados_planilha, log) na ordem de excel_file.sheet_names
+
+    Com sheet_workers > 1, as planilhas são lidas e analisadas em processos
+    separados, cada um com sua sessão do arquivo; os resultados são devolvidos
+    na ordem das planilhas, independente de qual processo termina primeiro
+    """
+    sheet_names = excel_file.sheet_names
+    workers = min(sheet_workers or os.cpu_count() or 1, len(sheet_names))
+    
+    if workers <= 1:
+        excel_file.load(sheet_names)
+        for sheet_name in sheet_names:
+            yield (sheet_name, *analyze_sheet(excel_file, sheet_name, profiler))
+        return
+    
+    # Com fork os processos já começam com pandas/openpyxl importados
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = None
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context,
+        initializer=_init_sheet_worker, initargs=(excel_file.file_path, excel_file.engine)
+    ) as executor:
+        resultados = executor.map(_analyze_sheet_task, sheet_names, repeat(profiler.enabled))
+        for sheet_name, (dados_planilha, log, registros) in zip(sheet_names, resultados):
+            profiler.records.extend(registros)
+            yield sheet_name, dados_planilha, log
+
+def analyze_excel_file(file_path, output_dir=None, cache=None, output_format="json", engine="pandas",
+                       profiler=None, sheet_workers=1):
     """
     Analisa o arquivo Excel e extrai informações relevantes
+
+    Com `cache` (ExtractionCache), um arquivo já analisado e sem alterações
+    é devolvido direto do cache, sem reler a planilha. `engine` escolhe o
+    motor de leitura do PlanoWorkbook ('pandas' ou 'stream'). `profiler`
+    (StageProfiler) mede leitura, detecção de cabeçalho, estatísticas e gravação.
+    `sheet_workers` > 1 analisa as planilhas em paralelo (0: número de CPUs),
+    com o mesmo resultado da análise sequencial
     """
+    profiler = profiler or NULL_PROFILER
     print(f"📊 Analisando arquivo: {file_path}")
     print("="*80)
     
     try:
-        # Ler todas as planilhas do arquivo
-        excel_file = pd.ExcelFile(file_path)
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(file_path, f"analise-{engine}", ANALYZER_VERSION)
+            dados_cache = cache.get(cache_key)
+            if dados_cache is not None:
+                print("\n♻️ Arquivo sem alterações desde a última análise, usando o cache")
+                dados_cache["metadata"]["arquivo"] = Path(file_path).name
+                output_file = save_analysis(dados_cache, file_path, output_dir, output_format)
+                print(f"\n✅ Análise salva em: {output_file}")
+                return dados_cache
         
-        print(f"\n📑 Planilhas encontradas: {len(excel_file.sheet_names)}")
-        for i, sheet_name in enumerate(excel_file.sheet_names, 1):
-            print(f"  {i}. {sheet_name}")
+        # Abrir o arquivo uma única vez; as planilhas são lidas em analyze_sheets
+        # (e fechá-lo ao final, também em caso de erro)
+        with PlanoWorkbook(file_path, engine=engine, profiler=profiler) as excel_file:
+            print(f"\n📑 Planilhas encontradas: {len(excel_file.sheet_names)}")
+            for i, sheet_name in enumerate(excel_file.sheet_names, 1):
+                print(f"  {i}. {sheet_name}")
         
-        print("\n" + "="*80)
-        
-        # Dicionário para armazenar dados importantes
-        dados_extraidos = {
-            "metadata": {
-                "arquivo": file_path.name,
-                "data_analise": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_planilhas": len(excel_file.sheet_names)
-            },
-            "planilhas": {}
-        }
+            print("\n" + "="*80)
         
-        # Analisar cada planilha
-        for sheet_name in excel_file.sheet_names:
-            print(f"\n📋 Analisando planilha: '{sheet_name}'")
-            print("-"*40)
-            
-            # Ler a planilha
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-            
-            # Informações básicas
-            print(f"  Dimensões: {df.shape[0]} linhas x {df.shape[1]} colunas")
-            
-            # Tentar identificar cabeçalhos
-            header_row = None
-            for idx in range(min(10, len(df))):
-                row = df.iloc[idx]
-                # Verificar se a linha tem pelo menos 3 valores não nulos
-                if row.notna().sum() >= 3:
-                    # Verificar se parecem ser cabeçalhos (strings)
-                    if row.apply(lambda x: isinstance(x, str) if pd.notna(x) else False).sum() >= 2:
-                        header_row = idx
-                        break
-            
-            if header_row is not None:
-                # Recarregar com cabeçalho identificado
-                df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row)
-                print(f"  Cabeçalho identificado na linha: {header_row + 1}")
-                print(f"  Colunas: {', '.join([str(col) for col in df.columns[:10]])}")
-                if len(df.columns) > 10:
-                    print(f"  ... e mais {len(df.columns) - 10} colunas")
-            
-            # Análise de conteúdo
-            dados_planilha = {
-                "dimensoes": {"linhas": df.shape[0], "colunas": df.shape[1]},
-                "linha_cabecalho": header_row,
-                "colunas": list(df.columns) if header_row is not None else [],
-                "tipos_dados": {},
-                "valores_numericos": {},
-                "primeiras_linhas": []
+            # Dicionário para armazenar dados importantes
+            dados_extraidos = {
+                "metadata": {
+                    "arquivo": file_path.name,
+                    "data_analise": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "total_planilhas": len(excel_file.sheet_names)
+                },
+                "planilhas": {}
             }
-            
-            # Identificar tipos de dados e valores numéricos
-            for col in df.columns:
-                # Tipo de dado predominante
-                tipos = df[col].apply(type).value_counts()
-                if len(tipos) > 0:
-                    tipo_predominante = tipos.index[0].__name__
-                    dados_planilha["tipos_dados"][str(col)] = tipo_predominante
-                
-                # Se for numérico, extrair estatísticas
-                if df[col].dtype in ['float64', 'int64']:
-                    valores_validos = df[col].dropna()
-                    if len(valores_validos) > 0:
-                        dados_planilha["valores_numericos"][str(col)] = {
-                            "min": float(valores_validos.min()),
-                            "max": float(valores_validos.max()),
-                            "media": float(valores_validos.mean()),
-                            "soma": float(valores_validos.sum()),
-                            "qtd_valores": len(valores_validos)
-                        }
-            
-            # Capturar primeiras linhas com dados
-            linhas_com_dados = df[df.notna().any(axis=1)].head(5)
-            for idx, row in linhas_com_dados.iterrows():
-                linha_dict = {}
-                for col in row.index:
-                    valor = row[col]
-                    if pd.notna(valor):
-                        # Converter para tipo serializável
-                        if isinstance(valor, (np.integer, np.floating)):
-                            valor = float(valor)
-                        elif isinstance(valor, np.bool_):
-                            valor = bool(valor)
-                        elif pd.api.types.is_datetime64_any_dtype(type(valor)):
-                            valor = str(valor)
-                        linha_dict[str(col)] = valor
-                dados_planilha["primeiras_linhas"].append(linha_dict)
-            
-            # Adicionar ao resultado
-            dados_extraidos["planilhas"][sheet_name] = dados_planilha
-            
-            # Análise específica baseada no nome da planilha
-            if "safra" in sheet_name.lower() or "produção" in sheet_name.lower():
-                print("\n  🌾 Planilha de produção/safra detectada")
-                # Procurar por culturas
-                for col in df.columns:
-                    if any(cultura in str(col).lower() for cultura in ['soja', 'milho', 'algodão', 'trigo']):
-                        print(f"    - Cultura encontrada: {col}")
-                        
-            elif "financ" in sheet_name.lower() or "divida" in sheet_name.lower():
-                print("\n  💰 Planilha financeira detectada")
-                # Procurar por valores monetários
-                for col, stats in dados_planilha["valores_numericos"].items():
-                    if stats["max"] > 1000:  # Provavelmente valores monetários
-                        print(f"    - {col}: R$ {stats['soma']:,.2f}")
-                        
-            elif "area" in sheet_name.lower() or "hectare" in sheet_name.lower():
-                print("\n  📍 Planilha de áreas detectada")
-                for col, stats in dados_planilha["valores_numericos"].items():
-                    if 'area' in str(col).lower() or 'hectare' in str(col).lower():
-                        print(f"    - {col}: {stats['soma']:,.2f} ha")
         
-        # Salvar resultado em JSON
-        output_file = Path(file_path).parent / f"analise_{Path(file_path).stem}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(dados_extraidos, f, ensure_ascii=False, indent=2, default=str)
+            # Analisar cada planilha, em ordem; com sheet_workers > 1 as planilhas
+            # são analisadas em paralelo e os resultados chegam na mesma ordem
+            for sheet_name, dados_planilha, log in analyze_sheets(excel_file, sheet_workers, profiler):
+                for linha in log:
+                    print(linha)
+                dados_extraidos["planilhas"][sheet_name] = dados_planilha
+        
+        if cache is not None:
+            cache.put(cache_key, dados_extraidos)
+        
+        # Salvar resultado
+        with profiler.stage("gravacao", output_format):
+            output_file = save_analysis(dados_extraidos, file_path, output_dir, output_format)
         
         print(f"\n✅ Análise salva em: {output_file}")
         
@@ -154,7 +532,7 @@ def analyze_excel_file(file_path):
         total_colunas = sum(p["dimensoes"]["colunas"] for p in dados_extraidos["planilhas"].values())
         
         print(f"Total de dados analisados:")
-        print(f"  - {len(excel_file.sheet_names)} planilhas")
+        print(f"  - {dados_extraidos['metadata']['total_planilhas']} planilhas")
         print(f"  - {total_linhas} linhas totais")
         print(f"  - {total_colunas} colunas totais")
         
@@ -172,23 +550,54 @@ def analyze_excel_file(file_path):
         traceback.print_exc()
         return None
 
-def main():
+def analyze_file(file_path, output_dir=None, cache=None, output_format="json", engine="pandas",
+                 profiler=None, sheet_workers=1):
     """
-    Função principal
+    Analisa um arquivo dentro do lote; falhas viram exceção para o resumo
     """
-    # Caminho do arquivo
-    file_path = Path("/Users/guilhermeoliveiragomes/Projects/SR-CONSULTORIA/docs/062025_PLANO DE NEGÓCIOS WILSEMAR ELGER_070625_Ver. II.xlsx")
+    file_path = Path(file_path)
     
     if not file_path.exists():
-        print(f"❌ Arquivo não encontrado: {file_path}")
-        return
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
     
-    # Analisar o arquivo
-    dados = analyze_excel_file(file_path)
+    dados = analyze_excel_file(file_path, output_dir, cache, output_format, engine, profiler, sheet_workers)
+    if dados is None:
+        raise RuntimeError("falha na análise (detalhes no log acima)")
     
-    if dados:
-        print("\n✅ Análise concluída com sucesso!")
-        print("\n💡 Dica: Verifique o arquivo JSON gerado para uma análise detalhada dos dados.")
+    print("\n✅ Análise concluída com sucesso!")
+    return dados["metadata"]["total_planilhas"]
+
+def run(args):
+    """
+    Analisa em paralelo os arquivos dos argumentos de add_batch_arguments
+    """
+    paths = expand_workbook_paths(args.paths)
+    if not paths:
+        print(f"❌ Nenhum arquivo encontrado em: {', '.join(args.paths)}")
+        return 1
+    
+    # Com --profile o cache fica desligado, senão não haveria etapas para medir
+    cache = None if args.no_cache or args.profile else ExtractionCache(args.cache_dir)
+    worker = Profiled(analyze_file) if args.profile else analyze_file
+    results = run_batch(
+        worker, paths, workers=args.workers, output_dir=args.output_dir, cache=cache,
+        output_format=args.format, engine=args.engine, sheet_workers=args.sheet_workers
+    )
+    
+    if args.profile:
+        write_profile_report(args.profile, results)
+    
+    print("\n💡 Dica: Verifique os arquivos gerados para uma análise detalhada dos dados.")
+    return print_batch_summary(results)
+
+def main(argv=None):
+    """
+    Função principal: analisa um ou vários arquivos em paralelo
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_batch_arguments(parser, DEFAULT_FILE)
+    add_sheet_workers_argument(parser)
+    return run(parser.parse_args(argv))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos extratores e da análise do Plano de Negócios sobre planos
+sintéticos, com comparação contra um resultado anterior para detectar regressões
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from plano_synthetic import add_generator_arguments, generate_workbooks
+from plano_workbook import ENGINES, PlanoWorkbook
+
+# Razão mediana atual/anterior acima da qual um caso é considerado regressão
+DEFAULT_THRESHOLD = 1.2
+
+
+def benchmark_cases(engine, output_dir):
+    """
+    Casos medidos: nome -> função que processa um arquivo
+    """
+    import analyze_plano_negocios as analyzer
+    import extract_plano_negocios_data as extractor
+
+    def with_workbook(extract):
+        def run(path):
+            with PlanoWorkbook(path, engine=engine) as workbook:
+                return extract(workbook)
+        return run
+
+    return {
+        'extract_production_data': with_workbook(extractor.extract_production_data),
+        'extract_financial_data': with_workbook(extractor.extract_financial_data),
+        'extract_property_data': with_workbook(extractor.extract_property_data),
+        'analyze_excel_file': lambda path: analyzer.analyze_excel_file(
+            path, output_dir=output_dir, engine=engine
+        ),
+    }
+
+
+def time_case(func, paths, repeat):
+    """
+    Executa func em todos os arquivos `repeat` vezes; cada amostra é o tempo
+    de uma passada pelo lote inteiro. A saída impressa pelos scripts é descartada
+    """
+    samples = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for path in paths:
+                if func(path) is None:
+                    raise RuntimeError(f"falha ao processar {path.name}")
+            samples.append(time.perf_counter() - start)
+    return {
+        'min_s': round(min(samples), 6),
+        'mediana_s': round(statistics.median(samples), 6),
+        'media_s': round(statistics.mean(samples), 6),
+        'amostras_s': [round(s, 6) for s in samples],
+    }
+
+
+def environment_info():
+    import pandas as pd
+    import openpyxl
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'openpyxl': openpyxl.__version__,
+        'plataforma': platform.platform(),
+    }
+
+
+def run_benchmark(workbook_dir, files=1, safras=9, rows=10, seed=0, repeat=5, engine='pandas'):
+    """
+    Gera os planos sintéticos em `workbook_dir` e mede cada caso; retorna o
+    resultado pronto para ser salvo
+    """
+    paths = generate_workbooks(workbook_dir, files, safras, rows, seed)
+
+    cases = benchmark_cases(engine, Path(workbook_dir) / 'saida')
+    resultados = {}
+    for name, func in cases.items():
+        # Uma execução de aquecimento (imports, caches do pandas)
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(paths[0])
+        resultados[name] = time_case(func, paths, repeat)
+        print(f"  ⏱️ {name:<26} mediana {resultados[name]['mediana_s'] * 1000:10.1f} ms")
+
+    return {
+        'metadata': {
+            'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'parametros': {
+                'arquivos': files, 'safras': safras, 'linhas': rows,
+                'seed': seed, 'repeticoes': repeat, 'engine': engine
+            },
+            'ambiente': environment_info(),
+        },
+        'resultados': resultados,
+    }
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara as medianas com um resultado anterior
+
+    Retorna a lista de (caso, mediana anterior, mediana atual, razão) e a
+    lista dos casos com razão acima de `threshold`
+    """
+    if current['metadata']['parametros'] != baseline['metadata']['parametros']:
+        print("  ⚠️ Parâmetros diferentes do resultado anterior; a comparação pode não ser válida")
+
+    comparacao = []
+    regressoes = []
+    for name, atual in current['resultados'].items():
+        anterior = baseline['resultados'].get(name)
+        if anterior is None:
+            continue
+        razao = atual['mediana_s'] / anterior['mediana_s'] if anterior['mediana_s'] else float('inf')
+        comparacao.append((name, anterior['mediana_s'], atual['mediana_s'], razao))
+        if razao > threshold:
+            regressoes.append(name)
+    return comparacao, regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_generator_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições por caso (padrão: 5)')
+    parser.add_argument('--engine', choices=ENGINES, default='pandas', help='Motor de leitura')
+    parser.add_argument(
+        '--workbook-dir', type=Path, default=None,
+        help='Onde gerar os planos sintéticos (padrão: diretório temporário)'
+    )
+    parser.add_argument('-o', '--output', type=Path, default=None, help='Salva o resultado em JSON')
+    parser.add_argument('--baseline', type=Path, default=None, help='Resultado anterior para comparação')
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help=f'Razão atual/anterior considerada regressão (padrão: {DEFAULT_THRESHOLD})'
+    )
+    args = parser.parse_args(argv)
+
+    print("🏁 BENCHMARK DO PLANO DE NEGÓCIOS")
+    print("="*80)
+    print(f"Arquivos: {args.files} | Safras: {args.safras} | Linhas por planilha: {args.rows} | "
+          f"Repetições: {args.repeat} | Motor: {args.engine}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultado = run_benchmark(
+            args.workbook_dir or tmp, args.files, args.safras, args.rows,
+            args.seed, args.repeat, args.engine
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Resultado salvo em: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            anterior = json.load(f)
+        comparacao, regressoes = compare_results(resultado, anterior, args.threshold)
+
+        print("\n📊 Comparação com", args.baseline.name)
+        for name, antes, depois, razao in comparacao:
+            marca = '❌' if name in regressoes else '✅'
+            print(f"  {marca} {name:<26} {antes * 1000:10.1f} ms -> {depois * 1000:10.1f} ms ({razao:.2f}x)")
+
+        if regressoes:
+            print(f"\n❌ Regressão acima de {args.threshold:.2f}x em: {', '.join(regressoes)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
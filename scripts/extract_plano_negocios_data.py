@@ -3,305 +3,393 @@
 Script para extrair dados específicos do Plano de Negócios e preparar para importação
 """
 
-import pandas as pd
-import numpy as np
 from pathlib import Path
+import argparse
 import json
+import re
+import unicodedata
 from datetime import datetime
 
-def extract_production_data(file_path):
+from plano_batch import add_batch_arguments, expand_workbook_paths, print_batch_summary, run_batch
+from plano_cache import ExtractionCache
+from plano_columnar import extraction_sidecar, extraction_tables, write_tables
+from plano_layout import LAYOUT_INDEX
+from plano_profile import NULL_PROFILER, Profiled, write_profile_report
+from plano_records import dump_json
+from plano_specs import PROPERTY_SHEETS, SHEET_SPECS, extract_sheet, record_table, spec_fields, summarize_records
+from plano_workbook import PlanoWorkbook
+from plano_xlsx import sheet_fingerprints
+
+# Incrementar quando a estrutura dos dados extraídos mudar, invalidando o cache
+# e as extrações anteriores usadas na reextração incremental
+EXTRACTOR_VERSION = 5
+
+DEFAULT_FILE = Path("/Users/guilhermeoliveiragomes/Projects/SR-CONSULTORIA/docs/062025_PLANO DE NEGÓCIOS WILSEMAR ELGER_070625_Ver. II.xlsx")
+
+# Nome do produtor no nome do arquivo: '062025_PLANO DE NEGÓCIOS <PRODUTOR>_070625_Ver. II.xlsx'
+PRODUCER_PATTERN = re.compile(r'PLANO\s+DE\s+NEG[OÓ]CIOS\s+(.+?)\s*(?:_|$)', re.IGNORECASE)
+
+# Planilhas de safras individuais
+SAFRAS = ['21-22', '22-23', '23-24', '24-25', '25-26', '26-27', '27-28', '28-29', '29-30']
+
+FINANCIAL_SHEETS = ['Bancos', 'Endiv. Imóveis', 'Fornecedores']
+
+# Todas as planilhas usadas pelos extratores, lidas de uma só vez
+EXTRACTION_SHEETS = SAFRAS + FINANCIAL_SHEETS + PROPERTY_SHEETS
+
+# Campos extraídos por cultura, definidos na especificação das safras
+PRODUCTION_FIELDS = spec_fields('safra')
+
+def build_production_frame(workbook, safras=None):
     """
-    Extrai dados de produção/safra
+    Lê todas as planilhas de safra em um único DataFrame longo, uma linha por
+    cultura, com a coluna 'safra' (ex.: '2021-22') como chave
+
+    `workbook` pode ser o caminho do arquivo ou um PlanoWorkbook já aberto;
+    `safras` limita a leitura a algumas planilhas de SAFRAS
     """
-    print("\n🌾 DADOS DE PRODUÇÃO POR SAFRA")
-    print("="*80)
-    
-    # Planilhas de safras individuais
-    safras = ['21-22', '22-23', '23-24', '24-25', '25-26', '26-27', '27-28', '28-29', '29-30']
-    
-    production_data = {}
+    import pandas as pd
+
+    safras = SAFRAS if safras is None else safras
+    frames = []
+    safras_lidas = []
     
-    for safra in safras:
-        try:
-            df = pd.read_excel(file_path, sheet_name=safra, header=6)
+    with PlanoWorkbook.open(workbook, safras) as workbook:
+        for safra in safras:
+            try:
+                # Linhas de cultura já filtradas (sem vazias e TOTAL) e convertidas
+                df = extract_sheet(workbook, safra, 'safra')
+            except Exception as e:
+                print(f"  ⚠️ Erro ao processar safra {safra}: {e}")
+                continue
             
-            # Remover linhas vazias e totais
-            df = df[df['CULTURA'].notna()]
-            df = df[~df['CULTURA'].str.contains('TOTAL', na=False)]
-            
-            safra_data = {
-                'culturas': [],
-                'area_total': 0,
-                'custo_total': 0,
-                'producao_total': 0,
-                'receita_total': 0,
-                'lucro_total': 0
-            }
-            
-            for _, row in df.iterrows():
-                if pd.notna(row.get('CULTURA')):
-                    cultura_info = {
-                        'cultura': row['CULTURA'],
-                        'ciclo': row.get('CICLO', ''),
-                        'sistema': row.get('SISTEMA', ''),
-                        'area_plantada': float(row.get('Área Plantada', 0) or 0),
-                        'custo_ha': float(row.get('Custo/ha - R$', 0) or 0),
-                        'custo_total': float(row.get('Custo Total', 0) or 0),
-                        'produtividade_ha': float(row.get('Produt./ha', 0) or 0),
-                        'producao_total': float(row.get('Produção Total', 0) or 0),
-                        'preco_unitario': float(row.get('Preço/unid', 0) or 0),
-                        'receita_total': float(row.get('Receita Total', 0) or 0),
-                        'lucro': float(row.get('Lucro', 0) or 0)
-                    }
-                    
-                    safra_data['culturas'].append(cultura_info)
-                    safra_data['area_total'] += cultura_info['area_plantada']
-                    safra_data['custo_total'] += cultura_info['custo_total']
-                    safra_data['producao_total'] += cultura_info['producao_total']
-                    safra_data['receita_total'] += cultura_info['receita_total']
-                    safra_data['lucro_total'] += cultura_info['lucro']
-            
-            production_data[f"20{safra}"] = safra_data
-            
-            print(f"\n📅 Safra 20{safra}:")
-            print(f"  - Culturas: {len(safra_data['culturas'])}")
-            print(f"  - Área total: {safra_data['area_total']:,.2f} ha")
-            print(f"  - Custo total: R$ {safra_data['custo_total']:,.2f}")
-            print(f"  - Receita total: R$ {safra_data['receita_total']:,.2f}")
-            print(f"  - Lucro total: R$ {safra_data['lucro_total']:,.2f}")
-            
-        except Exception as e:
-            print(f"  ⚠️ Erro ao processar safra {safra}: {e}")
+            df.insert(0, 'safra', f"20{safra}")
+            frames.append(df)
+            safras_lidas.append(f"20{safra}")
     
-    return production_data
+    if frames:
+        producao = pd.concat(frames, ignore_index=True)
+    else:
+        producao = pd.DataFrame(columns=['safra'] + PRODUCTION_FIELDS)
+    
+    # Safras lidas sem culturas continuam presentes como categoria vazia
+    producao['safra'] = pd.Categorical(producao['safra'], categories=safras_lidas)
+    return producao
 
-def extract_financial_data(file_path):
+def producer_name(file_path):
     """
-    Extrai dados financeiros (dívidas, investimentos, etc)
+    Produtor do plano a partir do nome do arquivo, ou o próprio nome do
+    arquivo (sem extensão) quando ele não segue o padrão
     """
-    print("\n💰 DADOS FINANCEIROS")
+    # Nomes vindos do macOS chegam decompostos (NFD): 'O' + acento combinante
+    stem = unicodedata.normalize('NFC', Path(file_path).stem)
+    match = PRODUCER_PATTERN.search(stem)
+    return (match.group(1) if match else stem).strip()
+
+def extract_production_data(workbook, safras=None):
+    """
+    Extrai dados de produção/safra
+
+    `workbook` pode ser o caminho do arquivo ou um PlanoWorkbook já aberto;
+    `safras` limita a extração a algumas planilhas de SAFRAS
+    """
+    print("\n🌾 DADOS DE PRODUÇÃO POR SAFRA")
     print("="*80)
     
-    financial_data = {}
+    safras = SAFRAS if safras is None else safras
+    with PlanoWorkbook.open(workbook, safras) as workbook:
+        producao = build_production_frame(workbook, safras)
     
-    # 1. Dívidas Bancárias
-    try:
-        df_bancos = pd.read_excel(file_path, sheet_name='Bancos', header=5)
-        
-        bancos_data = {}
-        anos = [2025, 2026, 2027, 2028, 2029, 2030, 2031, 2032]
+    with workbook.profiler.stage('agregacao', 'producao') as record:
+        # Totais por safra calculados por soma de colunas
+        totais = producao.groupby('safra', observed=False)[
+            ['area_plantada', 'custo_total', 'producao_total', 'receita_total', 'lucro']
+        ].sum()
         
-        for ano in anos:
-            if str(ano) in df_bancos.columns:
-                total = df_bancos[str(ano)].sum()
-                bancos_data[str(ano)] = float(total) if pd.notna(total) else 0
+        production_data = {}
         
-        financial_data['dividas_bancarias'] = bancos_data
-        
-        print("\n📊 Dívidas Bancárias por ano:")
-        for ano, valor in bancos_data.items():
-            if valor > 0:
-                print(f"  {ano}: R$ {valor:,.2f}")
-                
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar dívidas bancárias: {e}")
+        # Culturas em colunas; os registros só viram JSON na gravação
+        for safra, culturas in producao.groupby('safra', observed=False):
+            production_data[safra] = {
+                'culturas': record_table(culturas.drop(columns='safra'), 'safra'),
+                'area_total': float(totais.at[safra, 'area_plantada']),
+                'custo_total': float(totais.at[safra, 'custo_total']),
+                'producao_total': float(totais.at[safra, 'producao_total']),
+                'receita_total': float(totais.at[safra, 'receita_total']),
+                'lucro_total': float(totais.at[safra, 'lucro'])
+            }
+        record['linhas'] = len(producao)
     
-    # 2. Dívidas de Imóveis
-    try:
-        df_imoveis = pd.read_excel(file_path, sheet_name='Endiv. Imóveis', header=6)
-        
-        imoveis_data = {}
-        anos = list(range(2023, 2034))
-        
-        for ano in anos:
-            if str(ano) in df_imoveis.columns:
-                total = df_imoveis[str(ano)].sum()
-                imoveis_data[str(ano)] = float(total) if pd.notna(total) else 0
-        
-        financial_data['dividas_imoveis'] = imoveis_data
-        
-        print("\n🏡 Dívidas de Imóveis por ano:")
-        for ano, valor in imoveis_data.items():
-            if valor > 0:
-                print(f"  {ano}: R$ {valor:,.2f}")
-                
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar dívidas de imóveis: {e}")
+    for safra, safra_data in production_data.items():
+        print(f"\n📅 Safra {safra}:")
+        print(f"  - Culturas: {len(safra_data['culturas'])}")
+        print(f"  - Área total: {safra_data['area_total']:,.2f} ha")
+        print(f"  - Custo total: R$ {safra_data['custo_total']:,.2f}")
+        print(f"  - Receita total: R$ {safra_data['receita_total']:,.2f}")
+        print(f"  - Lucro total: R$ {safra_data['lucro_total']:,.2f}")
     
-    # 3. Fornecedores
-    try:
-        df_fornecedores = pd.read_excel(file_path, sheet_name='Fornecedores', header=5)
+    return production_data
+
+def extract_financial_data(workbook):
+    """
+    Extrai dados financeiros (dívidas, investimentos, etc)
+
+    `workbook` pode ser o caminho do arquivo ou um PlanoWorkbook já aberto
+    """
+    with PlanoWorkbook.open(workbook, FINANCIAL_SHEETS) as workbook:
+
+        print("\n💰 DADOS FINANCEIROS")
+        print("="*80)
         
-        fornecedores_total = 0
-        meses_cols = ['Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro']
+        financial_data = {}
         
-        for mes in meses_cols:
-            if mes in df_fornecedores.columns:
-                total_mes = df_fornecedores[mes].sum()
-                fornecedores_total += float(total_mes) if pd.notna(total_mes) else 0
+        # 1. Dívidas Bancárias
+        try:
+            bancos_data = extract_sheet(workbook, 'Bancos')
+            financial_data[SHEET_SPECS['Bancos']['section']] = bancos_data
+            
+            print("\n📊 Dívidas Bancárias por ano:")
+            for ano, valor in bancos_data.items():
+                if valor > 0:
+                    print(f"  {ano}: R$ {valor:,.2f}")
+                    
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar dívidas bancárias: {e}")
         
-        financial_data['dividas_fornecedores'] = fornecedores_total
+        # 2. Dívidas de Imóveis
+        try:
+            imoveis_data = extract_sheet(workbook, 'Endiv. Imóveis')
+            financial_data[SHEET_SPECS['Endiv. Imóveis']['section']] = imoveis_data
+            
+            print("\n🏡 Dívidas de Imóveis por ano:")
+            for ano, valor in imoveis_data.items():
+                if valor > 0:
+                    print(f"  {ano}: R$ {valor:,.2f}")
+                    
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar dívidas de imóveis: {e}")
         
-        print(f"\n📦 Dívidas com Fornecedores: R$ {fornecedores_total:,.2f}")
+        # 3. Fornecedores
+        try:
+            fornecedores_total = extract_sheet(workbook, 'Fornecedores')
+            financial_data[SHEET_SPECS['Fornecedores']['section']] = fornecedores_total
+            
+            print(f"\n📦 Dívidas com Fornecedores: R$ {fornecedores_total:,.2f}")
+            
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar fornecedores: {e}")
         
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar fornecedores: {e}")
-    
-    return financial_data
+        return financial_data
 
-def extract_property_data(file_path):
+def extract_property_data(workbook):
     """
     Extrai dados de propriedades e bens
+
+    `workbook` pode ser o caminho do arquivo ou um PlanoWorkbook já aberto
     """
-    print("\n🏞️ DADOS DE PROPRIEDADES E BENS")
-    print("="*80)
-    
-    property_data = {}
-    
-    # 1. Bens Imóveis
-    try:
-        df_imoveis = pd.read_excel(file_path, sheet_name='Bens Imóveis', header=5)
+    with PlanoWorkbook.open(workbook, PROPERTY_SHEETS) as workbook:
+
+        print("\n🏞️ DADOS DE PROPRIEDADES E BENS")
+        print("="*80)
         
-        imoveis = []
-        area_total = 0
-        valor_total = 0
+        property_data = {}
         
-        for _, row in df_imoveis.iterrows():
-            if pd.notna(row.get('DENOMINAÇÃO DO IMÓVEL')):
-                imovel = {
-                    'nome': row['DENOMINAÇÃO DO IMÓVEL'],
-                    'municipio': row.get('MUNICIPIO/UF', ''),
-                    'area_ha': float(row.get('ÁREA (HA)', 0) or 0),
-                    'valor_ha': float(row.get('R$/ha', 0) or 0),
-                    'valor_total': float(row.get('Valor Total', 0) or 0)
-                }
-                
-                if imovel['area_ha'] > 0:
-                    imoveis.append(imovel)
-                    area_total += imovel['area_ha']
-                    valor_total += imovel['valor_total']
+        # 1. Bens Imóveis
+        try:
+            imoveis = summarize_records(extract_sheet(workbook, 'Bens Imóveis'), 'Bens Imóveis')
+            property_data[SHEET_SPECS['Bens Imóveis']['section']] = imoveis
+            
+            print(f"\n🏡 Imóveis:")
+            print(f"  - Total de propriedades: {imoveis['total_propriedades']}")
+            print(f"  - Área total: {imoveis['area_total_ha']:,.2f} ha")
+            print(f"  - Valor total: R$ {imoveis['valor_total']:,.2f}")
+            
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar imóveis: {e}")
         
-        property_data['imoveis'] = {
-            'lista': imoveis,
-            'total_propriedades': len(imoveis),
-            'area_total_ha': area_total,
-            'valor_total': valor_total
-        }
+        # 2. Bens Móveis (Máquinas e Equipamentos)
+        try:
+            maquinas = summarize_records(extract_sheet(workbook, 'Bens Móveis'), 'Bens Móveis')
+            property_data[SHEET_SPECS['Bens Móveis']['section']] = maquinas
+            
+            print(f"\n🚜 Máquinas e Equipamentos:")
+            print(f"  - Total de itens: {maquinas['total_itens']}")
+            print(f"  - Valor total: R$ {maquinas['valor_total']:,.2f}")
+            
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar máquinas: {e}")
         
-        print(f"\n🏡 Imóveis:")
-        print(f"  - Total de propriedades: {len(imoveis)}")
-        print(f"  - Área total: {area_total:,.2f} ha")
-        print(f"  - Valor total: R$ {valor_total:,.2f}")
+        # 3. Arrendamentos
+        try:
+            arrendamentos = summarize_records(extract_sheet(workbook, 'Arrendamentos'), 'Arrendamentos')
+            property_data[SHEET_SPECS['Arrendamentos']['section']] = arrendamentos
+            
+            print(f"\n📄 Arrendamentos:")
+            print(f"  - Total de contratos: {arrendamentos['total_contratos']}")
+            print(f"  - Área total arrendada: {arrendamentos['area_total_arrendada']:,.2f} ha")
+            
+        except Exception as e:
+            print(f"  ⚠️ Erro ao processar arrendamentos: {e}")
         
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar imóveis: {e}")
-    
-    # 2. Bens Móveis (Máquinas e Equipamentos)
+        return property_data
+
+def load_previous_extraction(output_file, engine):
+    """
+    Extração anterior gravada em `output_file`, se feita pela mesma versão do
+    extrator e com o mesmo motor de leitura; senão None
+    """
     try:
-        df_moveis = pd.read_excel(file_path, sheet_name='Bens Móveis', header=5)
-        
-        maquinas = []
-        valor_total_maquinas = 0
-        
-        for _, row in df_moveis.iterrows():
-            if pd.notna(row.get('DESCRIÇÃO')):
-                valor = float(row.get('VALOR AQUISIÇÃO', 0) or 0)
-                if valor > 0:
-                    maquina = {
-                        'descricao': row['DESCRIÇÃO'],
-                        'ano': row.get('ANO', ''),
-                        'marca': row.get('MARCA', ''),
-                        'valor': valor
-                    }
-                    maquinas.append(maquina)
-                    valor_total_maquinas += valor
-        
-        property_data['maquinas'] = {
-            'lista': maquinas,
-            'total_itens': len(maquinas),
-            'valor_total': valor_total_maquinas
-        }
-        
-        print(f"\n🚜 Máquinas e Equipamentos:")
-        print(f"  - Total de itens: {len(maquinas)}")
-        print(f"  - Valor total: R$ {valor_total_maquinas:,.2f}")
-        
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar máquinas: {e}")
+        with open(output_file, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
     
-    # 3. Arrendamentos
-    try:
-        df_arrend = pd.read_excel(file_path, sheet_name='Arrendamentos', header=5)
-        
-        arrendamentos = []
-        area_arrendada_total = 0
-        
-        for _, row in df_arrend.iterrows():
-            if pd.notna(row.get('FAZENDA')):
-                area = float(row.get('ÁREA ARRENDADA', 0) or 0)
-                if area > 0:
-                    arrend = {
-                        'fazenda': row['FAZENDA'],
-                        'proprietario': row.get('PROPRIETÁRIO', ''),
-                        'area_arrendada': area,
-                        'prazo': row.get('PRAZO', ''),
-                        'valor_ha': float(row.get('VALOR/ha (SC)', 0) or 0)
-                    }
-                    arrendamentos.append(arrend)
-                    area_arrendada_total += area
-        
-        property_data['arrendamentos'] = {
-            'lista': arrendamentos,
-            'total_contratos': len(arrendamentos),
-            'area_total_arrendada': area_arrendada_total
-        }
-        
-        print(f"\n📄 Arrendamentos:")
-        print(f"  - Total de contratos: {len(arrendamentos)}")
-        print(f"  - Área total arrendada: {area_arrendada_total:,.2f} ha")
-        
-    except Exception as e:
-        print(f"  ⚠️ Erro ao processar arrendamentos: {e}")
+    extracao = previous.get('metadata', {}).get('extracao', {})
+    if extracao.get('versao') != EXTRACTOR_VERSION or extracao.get('engine') != engine:
+        return None
+    return previous
+
+def changed_sheets(previous, fingerprints):
+    """
+    Planilhas usadas na extração cujo hash mudou desde a extração anterior
+    (incluindo planilhas que surgiram ou deixaram de existir)
+    """
+    anteriores = previous['metadata']['extracao'].get('planilhas', {})
+    return [
+        name for name in EXTRACTION_SHEETS
+        if anteriores.get(name) != fingerprints.get(name)
+    ]
+
+def reextract_changed(workbook, previous, changed):
+    """
+    Refaz apenas o que depende das planilhas em `changed` e reaproveita o
+    restante de `previous`: produção é refeita por safra, dados financeiros
+    e de propriedades por seção
+    """
+    all_data = {key: previous[key] for key in ('producao', 'financeiro', 'propriedades') if key in previous}
+    
+    safras = [safra for safra in SAFRAS if safra in changed]
+    if safras:
+        novas = extract_production_data(workbook, safras)
+        anteriores = previous.get('producao', {})
+        all_data['producao'] = {}
+        for safra in SAFRAS:
+            origem = novas if safra in safras else anteriores
+            if f"20{safra}" in origem:
+                all_data['producao'][f"20{safra}"] = origem[f"20{safra}"]
     
-    return property_data
+    if any(name in changed for name in FINANCIAL_SHEETS):
+        all_data['financeiro'] = extract_financial_data(workbook)
+    
+    if any(name in changed for name in PROPERTY_SHEETS):
+        all_data['propriedades'] = extract_property_data(workbook)
+    
+    return all_data
 
-def main():
+def extract_file(file_path, output_dir=None, cache=None, output_format='json', engine='pandas',
+                 profiler=None, incremental=False):
     """
-    Função principal
+    Extrai os dados de um plano de negócios e salva o resultado
+
+    Com `cache` (ExtractionCache), um arquivo já extraído e sem alterações é
+    devolvido direto do cache, sem reler a planilha. Com `output_format`
+    'parquet' ou 'arrow', grava um diretório com uma tabela por seção e
+    metadata.json em vez do JSON único. `engine` escolhe o motor de leitura
+    do PlanoWorkbook ('pandas' ou 'stream'). `profiler` (StageProfiler)
+    mede cada etapa, da abertura do arquivo à gravação do resultado
+
+    Com `incremental` e saída JSON, se já existir uma extração anterior do
+    arquivo no destino, só as planilhas cujo hash mudou são relidas e o
+    resultado é mesclado ao JSON anterior
+
+    Retorna o caminho do JSON (ou diretório) gerado
     """
-    file_path = Path("/Users/guilhermeoliveiragomes/Projects/SR-CONSULTORIA/docs/062025_PLANO DE NEGÓCIOS WILSEMAR ELGER_070625_Ver. II.xlsx")
+    file_path = Path(file_path)
     
     if not file_path.exists():
-        print(f"❌ Arquivo não encontrado: {file_path}")
-        return
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
     
     print("📊 EXTRAÇÃO DE DADOS DO PLANO DE NEGÓCIOS")
     print("="*80)
     print(f"Arquivo: {file_path.name}")
     print(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Extrair dados
-    all_data = {
-        'metadata': {
-            'arquivo': file_path.name,
-            'data_extracao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'produtor': 'WILSEMAR ELGER'
-        }
-    }
-    
-    # 1. Dados de Produção
-    all_data['producao'] = extract_production_data(file_path)
+    output_dir = Path(output_dir) if output_dir else file_path.parent
+    json_output = output_dir / f"dados_extraidos_{file_path.stem}.json"
     
-    # 2. Dados Financeiros
-    all_data['financeiro'] = extract_financial_data(file_path)
+    all_data = None
+    if cache is not None:
+        # Layouts detectados ficam no mesmo cache, para os próximos arquivos do modelo
+        LAYOUT_INDEX.use_cache(cache)
+        cache_key = cache.key(file_path, f'dados_extraidos-{engine}', EXTRACTOR_VERSION)
+        all_data = cache.get(cache_key)
     
-    # 3. Dados de Propriedades
-    all_data['propriedades'] = extract_property_data(file_path)
+    if all_data is not None:
+        print("\n♻️ Arquivo sem alterações desde a última extração, usando o cache")
+        all_data['metadata']['arquivo'] = file_path.name
+        all_data['metadata']['produtor'] = producer_name(file_path)
+    else:
+        # Extrair dados
+        all_data = {
+            'metadata': {
+                'arquivo': file_path.name,
+                'data_extracao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'produtor': producer_name(file_path)
+            }
+        }
+        
+        fingerprints = sheet_fingerprints(file_path)
+        previous = None
+        if incremental and output_format == 'json':
+            previous = load_previous_extraction(json_output, engine)
+        
+        if previous is not None:
+            # Ler só as planilhas alteradas desde a extração anterior
+            changed = changed_sheets(previous, fingerprints)
+            print(f"\n♻️ Extração anterior encontrada: {len(changed)} de "
+                  f"{len(EXTRACTION_SHEETS)} planilhas alteradas")
+            for name in changed:
+                print(f"  - {name}")
+            with PlanoWorkbook(file_path, changed, engine=engine, profiler=profiler) as workbook:
+                all_data.update(reextract_changed(workbook, previous, changed))
+        else:
+            # Abrir o arquivo uma única vez e ler todas as planilhas necessárias
+            with PlanoWorkbook(file_path, EXTRACTION_SHEETS, engine=engine, profiler=profiler) as workbook:
+                # 1. Dados de Produção
+                all_data['producao'] = extract_production_data(workbook)
+                
+                # 2. Dados Financeiros
+                all_data['financeiro'] = extract_financial_data(workbook)
+                
+                # 3. Dados de Propriedades
+                all_data['propriedades'] = extract_property_data(workbook)
+        
+        # Hash de cada planilha, para a próxima extração incremental
+        all_data['metadata']['extracao'] = {
+            'versao': EXTRACTOR_VERSION,
+            'engine': engine,
+            'planilhas': {
+                name: fingerprints[name] for name in EXTRACTION_SHEETS if name in fingerprints
+            }
+        }
+        
+        if cache is not None:
+            cache.put(cache_key, all_data)
     
-    # Salvar dados extraídos
-    output_file = Path(file_path).parent / "dados_extraidos_plano_negocios.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2, default=str)
+    # Salvar dados extraídos (um resultado por arquivo, para não colidir em lote)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with (profiler or NULL_PROFILER).stage('gravacao', output_format):
+        if output_format == 'json':
+            output_file = json_output
+            with open(output_file, 'w', encoding='utf-8') as f:
+                dump_json(all_data, f, indent=2)
+        else:
+            output_file = write_tables(
+                extraction_tables(all_data),
+                extraction_sidecar(all_data),
+                output_dir / f"dados_extraidos_{file_path.stem}",
+                output_format
+            )
     
     print("\n" + "="*80)
     print(f"✅ Dados extraídos e salvos em: {output_file}")
@@ -310,6 +398,37 @@ def main():
     print(f"  - Propriedades: {all_data.get('propriedades', {}).get('imoveis', {}).get('total_propriedades', 0)}")
     print(f"  - Máquinas/Equipamentos: {all_data.get('propriedades', {}).get('maquinas', {}).get('total_itens', 0)}")
     print(f"  - Arrendamentos: {all_data.get('propriedades', {}).get('arrendamentos', {}).get('total_contratos', 0)}")
+    
+    return output_file
+
+def run(args):
+    """
+    Extrai em paralelo os arquivos dos argumentos de add_batch_arguments
+    """
+    paths = expand_workbook_paths(args.paths)
+    if not paths:
+        print(f"❌ Nenhum arquivo encontrado em: {', '.join(args.paths)}")
+        return 1
+    
+    # Com --profile o cache e a reextração incremental ficam desligados,
+    # senão não haveria etapas para medir
+    cache = None if args.no_cache or args.profile else ExtractionCache(args.cache_dir)
+    worker = Profiled(extract_file) if args.profile else extract_file
+    results = run_batch(
+        worker, paths, workers=args.workers, output_dir=args.output_dir, cache=cache,
+        output_format=args.format, engine=args.engine, incremental=cache is not None
+    )
+    if args.profile:
+        write_profile_report(args.profile, results)
+    return print_batch_summary(results)
+
+def main(argv=None):
+    """
+    Função principal: extrai um ou vários planos de negócios em paralelo
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_batch_arguments(parser, DEFAULT_FILE)
+    return run(parser.parse_args(argv))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Linha de comando única dos scripts do Plano de Negócios
+
+Subcomandos:
+  analyze      análise exploratória das planilhas (analyze_plano_negocios.py)
+  extract      extração dos dados para importação (extract_plano_negocios_data.py)
+  list-sheets  lista as planilhas de cada arquivo
+
+Os módulos de cada subcomando, e com eles pandas/numpy/openpyxl, só são
+importados quando o subcomando executa; --help e list-sheets não os carregam
+e list-sheets lê só o workbook.xml de dentro do .xlsx
+
+Uso:
+    python plano.py list-sheets planos/*.xlsx
+    python plano.py extract planos/ -w 4
+    python plano.py analyze plano.xlsx --engine stream
+"""
+
+import argparse
+import json
+import sys
+import zipfile
+
+from plano_batch import add_batch_arguments, add_sheet_workers_argument, expand_workbook_paths
+
+
+def list_sheets(args):
+    """
+    Imprime as planilhas de cada arquivo, sem abrir o arquivo no pandas
+    """
+    from plano_xlsx import sheet_names
+
+    paths = expand_workbook_paths(args.paths)
+    if not paths:
+        print(f"❌ Nenhum arquivo encontrado em: {', '.join(args.paths)}")
+        return 1
+
+    resultado = {}
+    falhas = 0
+    for path in paths:
+        try:
+            resultado[str(path)] = sheet_names(path)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            print(f"❌ {path.name}: {e}", file=sys.stderr)
+            falhas += 1
+
+    if args.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    else:
+        for path, nomes in resultado.items():
+            print(f"\n📑 {path}: {len(nomes)} planilhas")
+            for i, nome in enumerate(nomes, 1):
+                print(f"  {i}. {nome}")
+
+    return 1 if falhas else 0
+
+
+def analyze(args):
+    import analyze_plano_negocios
+
+    return analyze_plano_negocios.run(args)
+
+
+def extract(args):
+    import extract_plano_negocios_data
+
+    return extract_plano_negocios_data.run(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='comando', required=True, metavar='COMANDO')
+
+    analyze_parser = subparsers.add_parser('analyze', help='Análise exploratória das planilhas')
+    add_batch_arguments(analyze_parser)
+    add_sheet_workers_argument(analyze_parser)
+    analyze_parser.set_defaults(handler=analyze)
+
+    extract_parser = subparsers.add_parser('extract', help='Extração dos dados para importação')
+    add_batch_arguments(extract_parser)
+    extract_parser.set_defaults(handler=extract)
+
+    list_parser = subparsers.add_parser('list-sheets', help='Lista as planilhas de cada arquivo')
+    list_parser.add_argument('paths', nargs='+', help='Arquivos, diretórios ou globs (.xlsx)')
+    list_parser.add_argument('--json', action='store_true', help='Saída em JSON: {arquivo: [planilhas]}')
+    list_parser.set_defaults(handler=list_sheets)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
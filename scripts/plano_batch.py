@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Execução em lote dos scripts do Plano de Negócios: expande arquivos,
+diretórios e globs e distribui os arquivos entre processos
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from plano_columnar import OUTPUT_FORMATS
+from plano_workbook import ENGINES
+
+# Extensões aceitas ao varrer um diretório
+WORKBOOK_SUFFIXES = ('.xlsx', '.xlsm')
+
+
+def add_batch_arguments(parser, default_path=None):
+    """
+    Argumentos comuns aos scripts: arquivos/diretórios/globs, workers,
+    formato/diretório de saída, motor de leitura e cache
+
+    Sem `default_path`, ao menos um arquivo precisa ser informado
+    """
+    if default_path is None:
+        parser.add_argument(
+            'paths', nargs='+',
+            help='Arquivos, diretórios ou globs de planos de negócios (.xlsx)'
+        )
+    else:
+        parser.add_argument(
+            'paths', nargs='*', default=[str(default_path)],
+            help='Arquivos, diretórios ou globs de planos de negócios (.xlsx)'
+        )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count(),
+        help='Número de processos em paralelo (padrão: número de CPUs)'
+    )
+    parser.add_argument(
+        '-o', '--output-dir', type=Path, default=None,
+        help='Diretório dos JSON gerados (padrão: o mesmo de cada arquivo)'
+    )
+    parser.add_argument(
+        '-f', '--format', choices=OUTPUT_FORMATS, default='json',
+        help='Formato de saída: JSON único ou tabelas Parquet/Arrow por seção'
+    )
+    parser.add_argument(
+        '--engine', choices=ENGINES, default='pandas',
+        help="Leitura das planilhas: 'pandas' (completa) ou 'stream' (openpyxl somente "
+             "leitura, descartando linhas vazias; para planilhas muito grandes)"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Reprocessa todos os arquivos por completo, ignorando o cache e as extrações anteriores'
+    )
+    parser.add_argument(
+        '--cache-dir', type=Path, default=None,
+        help='Diretório do cache de resultados (padrão: ~/.cache/plano_negocios)'
+    )
+    parser.add_argument(
+        '--profile', type=Path, default=None, metavar='RELATORIO',
+        help='Mede tempo, CPU e memória de cada etapa e grava o relatório '
+             '(.json ou .csv); desativa o cache'
+    )
+    return parser
+
+
+def add_sheet_workers_argument(parser):
+    """
+    Processos para as planilhas de um mesmo arquivo (análise)
+    """
+    parser.add_argument(
+        '--sheet-workers', type=int, default=1, metavar='N',
+        help='Analisa as planilhas de cada arquivo em N processos (0: número de CPUs); '
+             'reduz o tempo de um único arquivo grande'
+    )
+    return parser
+
+
+def expand_workbook_paths(patterns):
+    """
+    Expande arquivos, diretórios e globs em uma lista ordenada e sem repetições
+    """
+    paths = []
+    seen = set()
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(
+                p for p in path.iterdir() if p.suffix.lower() in WORKBOOK_SUFFIXES
+            )
+        elif any(char in pattern for char in '*?['):
+            candidates = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+        else:
+            candidates = [path]
+
+        for candidate in candidates:
+            # Ignorar arquivos de bloqueio do Excel (~$arquivo.xlsx)
+            if candidate.name.startswith('~$'):
+                continue
+            key = candidate.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(candidate)
+
+    return paths
+
+
+def run_batch(worker, paths, workers=None, **kwargs):
+    """
+    Executa worker(path, **kwargs) para cada arquivo, em processos separados
+    quando houver mais de um arquivo e mais de um worker. A falha de um
+    arquivo não interrompe os demais.
+
+    Retorna uma lista de (path, resultado, erro) na ordem de `paths`
+    """
+    outcomes = {}
+
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                outcomes[path] = (worker(path, **kwargs), None)
+            except Exception as e:
+                outcomes[path] = (None, e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(worker, path, **kwargs): path for path in paths
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    outcomes[path] = (future.result(), None)
+                except Exception as e:
+                    outcomes[path] = (None, e)
+
+    return [(path, *outcomes[path]) for path in paths]
+
+
+def print_batch_summary(results):
+    """
+    Imprime o resumo do lote e retorna o código de saída (1 se houve falhas)
+    """
+    failures = [(path, error) for path, _, error in results if error is not None]
+
+    print("\n" + "="*80)
+    print(f"📦 Lote concluído: {len(results) - len(failures)}/{len(results)} arquivos processados")
+    for path, error in failures:
+        print(f"  ❌ {path.name}: {error}")
+
+    return 1 if failures else 0
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cache em disco dos resultados de extração/análise, indexado pelo hash do
+conteúdo do arquivo Excel e pela versão do extrator
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from plano_records import dump_json
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('PLANO_CACHE_DIR', Path.home() / '.cache' / 'plano_negocios')
+)
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """
+    Hash SHA-256 do conteúdo do arquivo, lido em blocos
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Um arquivo JSON por resultado. A data de modificação de cada entrada é
+    atualizada a cada leitura, e as entradas menos usadas são removidas quando
+    o cache passa de `max_entries` arquivos ou `max_bytes` em disco
+    """
+
+    def __init__(self, cache_dir=None, max_entries=2000, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, file_path, kind, version):
+        """
+        Chave da entrada: tipo do resultado + versão do extrator + hash do arquivo
+        """
+        return f"{kind}-v{version}-{file_sha256(file_path)}"
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """
+        Retorna o resultado em cache ou None
+        """
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Marca a entrada como usada recentemente (LRU)
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        """
+        Grava o resultado de forma atômica e aplica a política de remoção
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                dump_json(data, f)
+            os.replace(tmp, entry)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove as entradas menos usadas até respeitar os limites do cache
+        """
+        entries = []
+        for entry in self.cache_dir.glob('*.json'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, entry = entries.pop(0)
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def clear(self):
+        for entry in self.cache_dir.glob('*.json'):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Saída colunar (Parquet ou Arrow IPC) dos dados extraídos: uma tabela tipada por
+seção e os metadados em um JSON ao lado
+"""
+
+import json
+from pathlib import Path
+
+from plano_specs import PROPERTY_SHEETS, SHEET_SPECS, spec_fields
+
+# Formatos aceitos em --format; 'json' mantém a saída original
+OUTPUT_FORMATS = ('json', 'parquet', 'arrow')
+
+TABLE_SUFFIXES = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def as_text(series):
+    """
+    Converte valores não nulos em texto, para colunas que misturam números e
+    strings (ex.: PRAZO, ANO) poderem ser gravadas com tipo único
+    """
+    return series.where(series.isna(), series.astype(str))
+
+
+def extraction_tables(all_data):
+    """
+    Converte os dados extraídos em tabelas tipadas para saída colunar: produção
+    (uma linha por safra/cultura), financeiro (uma linha por categoria/ano) e
+    uma tabela por lista de bens
+    """
+    import pandas as pd
+
+    producao = pd.DataFrame(
+        [
+            {'safra': safra, **cultura}
+            for safra, safra_data in all_data.get('producao', {}).items()
+            for cultura in safra_data['culturas']
+        ],
+        columns=['safra'] + spec_fields('safra')
+    )
+    producao['safra'] = producao['safra'].astype('category')
+    for col in spec_fields('safra', 'text'):
+        producao[col] = as_text(producao[col])
+    numeric_cols = spec_fields('safra', 'number')
+    producao[numeric_cols] = producao[numeric_cols].astype(float)
+    
+    financeiro_data = all_data.get('financeiro', {})
+    financeiro_rows = [
+        {'categoria': categoria, 'ano': int(ano), 'valor': valor}
+        for categoria in ('dividas_bancarias', 'dividas_imoveis')
+        for ano, valor in financeiro_data.get(categoria, {}).items()
+    ]
+    if 'dividas_fornecedores' in financeiro_data:
+        # Fornecedores são somados por mês, sem ano
+        financeiro_rows.append({
+            'categoria': 'dividas_fornecedores',
+            'ano': None,
+            'valor': financeiro_data['dividas_fornecedores']
+        })
+    financeiro = pd.DataFrame(financeiro_rows, columns=['categoria', 'ano', 'valor'])
+    financeiro['categoria'] = financeiro['categoria'].astype('category')
+    financeiro['ano'] = financeiro['ano'].astype('Int64')
+    financeiro['valor'] = financeiro['valor'].astype(float)
+    
+    propriedades = all_data.get('propriedades', {})
+    tables = {'producao': producao, 'financeiro': financeiro}
+    for sheet_name in PROPERTY_SHEETS:
+        section = SHEET_SPECS[sheet_name]['section']
+        df = pd.DataFrame(
+            propriedades.get(section, {}).get('lista', []),
+            columns=spec_fields(sheet_name)
+        )
+        for col in spec_fields(sheet_name, 'text'):
+            df[col] = as_text(df[col])
+        numeric_cols = spec_fields(sheet_name, 'number')
+        df[numeric_cols] = df[numeric_cols].astype(float)
+        tables[section] = df
+    
+    return tables
+
+
+def extraction_sidecar(all_data):
+    """
+    Metadados e totais que acompanham as tabelas colunares
+    """
+    propriedades = all_data.get('propriedades', {})
+    return {
+        'metadata': all_data.get('metadata', {}),
+        'totais_producao': {
+            safra: {k: v for k, v in safra_data.items() if k != 'culturas'}
+            for safra, safra_data in all_data.get('producao', {}).items()
+        },
+        'totais_propriedades': {
+            secao: {k: v for k, v in dados.items() if k != 'lista'}
+            for secao, dados in propriedades.items()
+        }
+    }
+
+
+def write_tables(tables, metadata, output_dir, output_format):
+    """
+    Grava cada DataFrame de `tables` como <nome>.parquet/.arrow dentro de
+    `output_dir`, mais metadata.json com `metadata`
+
+    Retorna o diretório gerado
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Saída em Parquet/Arrow requer o pacote pyarrow (pip install pyarrow)"
+        ) from e
+
+    if output_format not in TABLE_SUFFIXES:
+        raise ValueError(f"Formato de saída não suportado: {output_format}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = TABLE_SUFFIXES[output_format]
+
+    for name, df in tables.items():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table_path = output_dir / f"{name}{suffix}"
+        if output_format == 'parquet':
+            pq.write_table(table, table_path)
+        else:
+            with pa.OSFile(str(table_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+    with open(output_dir / "metadata.json", 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2, default=str)
+
+    return output_dir
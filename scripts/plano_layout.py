@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Detecção automática do layout das planilhas: linha do cabeçalho e colunas de
+ano (números ou textos) e de mês, com um índice de layouts por modelo de
+arquivo para que planos do mesmo modelo não repitam a detecção
+"""
+
+import hashlib
+import re
+import unicodedata
+
+# Linhas do topo da planilha examinadas na procura do cabeçalho
+MAX_HEADER_SCAN = 30
+
+# Incrementar quando a detecção mudar, invalidando os layouts salvos no cache
+LAYOUT_VERSION = 1
+
+YEAR_PATTERN = re.compile(r'^(\d{4})(?:\.0+)?$')
+
+
+def normalize_label(value):
+    """
+    Rótulo para comparação: sem acentos, sem diferença de maiúsculas e com
+    espaços normalizados ('ÁREA  (HA)' e 'Área (ha)' são iguais)
+    """
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.casefold().split())
+
+
+def year_of(value):
+    """
+    Ano representado por um rótulo de coluna (2025, 2025.0 ou '2025'), ou None
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if 1900 <= value <= 2200 else None
+    if isinstance(value, float):
+        return year_of(int(value)) if value.is_integer() else None
+    if isinstance(value, str):
+        match = YEAR_PATTERN.match(value.strip())
+        return year_of(int(match.group(1))) if match else None
+    return None
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, float) and value != value) or value == ''
+
+
+def header_score(row, spec):
+    """
+    Quantos rótulos esperados pela especificação aparecem na linha; 0 se a
+    linha não serve de cabeçalho (ex.: falta a coluna chave)
+    """
+    cells = [value for value in row if not _is_empty(value)]
+
+    if 'years' in spec:
+        years = set(spec['years'])
+        score = sum(1 for value in cells if year_of(value) in years)
+        return score if score >= min(2, len(years)) else 0
+
+    if 'columns' in spec:
+        expected = {normalize_label(label) for label in spec['columns']}
+        found = {normalize_label(value) for value in cells} & expected
+        if normalize_label(spec['key']) not in found:
+            return 0
+        return len(found) if len(found) >= min(2, len(expected)) else 0
+
+    expected = {normalize_label(label) for label in spec['sum_columns']}
+    found = {normalize_label(value) for value in cells} & expected
+    return len(found) if len(found) >= min(2, len(expected)) else 0
+
+
+def detect_header_row(rows, spec):
+    """
+    Linha (base 0) com mais rótulos esperados entre `rows`; em empate, a
+    primeira. None se nenhuma linha servir de cabeçalho
+    """
+    best, best_score = None, 0
+    for i, row in enumerate(rows):
+        score = header_score(row, spec)
+        if score > best_score:
+            best, best_score = i, score
+    return best
+
+
+def template_fingerprint(sheet_names):
+    """
+    Identifica o modelo do arquivo pela lista de planilhas
+    """
+    return hashlib.sha256('\x00'.join(sheet_names).encode('utf-8')).hexdigest()
+
+
+class LayoutIndex:
+    """
+    Linha do cabeçalho de cada planilha por modelo de arquivo
+
+    Para um modelo já visto, só a linha guardada é conferida; a procura nas
+    primeiras MAX_HEADER_SCAN linhas só acontece em modelos novos ou quando a
+    conferência falha. Com `cache` (ExtractionCache), o índice também é
+    gravado em disco e compartilhado entre processos e execuções
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._layouts = {}
+
+    def use_cache(self, cache):
+        self.cache = cache
+
+    def _cache_key(self, template):
+        return f"layout-v{LAYOUT_VERSION}-{template}"
+
+    def _layout(self, template):
+        if template not in self._layouts:
+            layout = self.cache.get(self._cache_key(template)) if self.cache is not None else None
+            self._layouts[template] = layout or {}
+        return self._layouts[template]
+
+    def header_row(self, workbook, sheet_name, spec, spec_name=None):
+        """
+        Linha do cabeçalho da planilha segundo a especificação; se a
+        planilha não tiver um cabeçalho reconhecível, usa spec['header']
+        """
+        template = template_fingerprint(workbook.sheet_names)
+        layout = self._layout(template)
+        key = f"{spec_name or sheet_name}:{sheet_name}"
+
+        cached = layout.get(key)
+        if cached is not None:
+            rows = workbook.head(sheet_name, cached + 1)
+            if len(rows) > cached and header_score(rows[cached], spec) > 0:
+                return cached
+
+        header = detect_header_row(workbook.head(sheet_name, MAX_HEADER_SCAN), spec)
+        if header is None:
+            return spec['header']
+
+        layout[key] = header
+        if self.cache is not None:
+            self.cache.put(self._cache_key(template), layout)
+        return header
+
+
+# Índice do processo; extract_file liga o cache em disco quando houver
+LAYOUT_INDEX = LayoutIndex()
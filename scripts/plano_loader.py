@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Carga dos dados extraídos do Plano de Negócios no banco (database/tables.sql)
+com COPY em lote, uma transação por organização
+
+Uso:
+    python plano_loader.py --dsn postgresql://localhost/agrofarm \\
+        <organizacao_id>=dados_extraidos_<plano>.json [...]
+
+Para testar localmente basta um Postgres com database/types.sql e
+database/tables.sql aplicados (incluindo as tabelas base comentadas lá:
+organizacoes, culturas, sistemas, ciclos e safras) e uma linha em
+organizacoes; os testes de integração (tests/test_plano_loader.py) usam o
+banco de $PLANO_TEST_DSN.
+
+Uma organização que já tem registros nas tabelas de destino só é carregada
+com --replace, que os substitui pelos do plano. Vários planos da mesma
+organização entram lado a lado: produtividades e custos ficam na propriedade
+principal de cada plano e os registros consolidados levam o nome do plano.
+"""
+
+import argparse
+import json
+import os
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from plano_columnar import extraction_tables
+from plano_safras import extraction_year, normalize_name, safra_ano_inicio
+
+# Valores fixos para campos obrigatórios que o plano não informa; as dívidas e
+# fornecedores do plano são totais por ano, então entram como um registro
+# consolidado por plano
+REGISTRO_CONSOLIDADO = 'PLANO DE NEGÓCIOS (CONSOLIDADO)'
+NAO_INFORMADO = 'NÃO INFORMADO'
+DIVIDA_BANCARIA_PADRAO = {
+    'tipo': 'BANCO',
+    'modalidade': 'CUSTEIO',
+    'indexador': 'PRE_FIXADO',
+    'taxa_real': 0
+}
+
+# Custo dos arrendamentos vem em sacas de soja por hectare ('VALOR/ha (SC)')
+# e é convertido em R$ pelo preço da soja de cada safra
+CULTURA_ARRENDAMENTO = 'SOJA'
+
+# Ordem de remoção no modo --replace (dependentes antes de propriedades)
+REPLACE_ORDER = [
+    'arrendamentos', 'areas_plantio', 'produtividades', 'custos_producao',
+    'dividas_imoveis', 'dividas_bancarias', 'fornecedores',
+    'maquinas_equipamentos', 'propriedades'
+]
+
+
+def safra_nome(ano_inicio):
+    """
+    Nome da safra no padrão do app: 2021 -> '2021/22'
+    """
+    return f"{ano_inicio}/{str(ano_inicio + 1)[-2:]}"
+
+
+def _as_year(valor):
+    try:
+        ano = int(float(valor))
+    except (TypeError, ValueError):
+        return None
+    return ano if 1900 <= ano <= 2100 else None
+
+
+def _positive(valor):
+    return float(valor) if valor and float(valor) > 0 else None
+
+
+def consolidated_name(all_data):
+    """
+    Nome dos registros consolidados de um plano (dívidas e fornecedores):
+    'PLANO DE NEGÓCIOS (CONSOLIDADO) - <produtor> (<arquivo>)', que distingue
+    os planos de uma organização na chave única de fornecedores
+    """
+    metadata = all_data.get('metadata', {})
+    plano = ' '.join(filter(None, [
+        metadata.get('produtor'),
+        f"({metadata['arquivo']})" if metadata.get('arquivo') else None
+    ]))
+    return f"{REGISTRO_CONSOLIDADO} - {plano}" if plano else REGISTRO_CONSOLIDADO
+
+
+def machines_without_year(all_data):
+    """
+    Máquinas sem ano de fabricação válido, que não são carregadas porque a
+    coluna é obrigatória no banco
+    """
+    maquinas = all_data.get('propriedades', {}).get('maquinas', {}).get('lista', [])
+    return [maquina['descricao'] for maquina in maquinas if _as_year(maquina.get('ano')) is None]
+
+
+def production_frame(all_data):
+    """
+    Tabela longa de produção com área plantada, o ano de início da safra e
+    chaves normalizadas de cultura/sistema/ciclo (vazio vira 'NÃO INFORMADO')
+    """
+    producao = extraction_tables(all_data)['producao']
+    producao = producao[producao['area_plantada'] > 0].copy()
+    producao['ano'] = producao['safra'].astype(str).map(safra_ano_inicio)
+    for col in ('cultura', 'sistema', 'ciclo'):
+        producao[col] = producao[col].fillna(NAO_INFORMADO).replace('', NAO_INFORMADO)
+        producao[f"{col}_key"] = producao[col].map(normalize_name)
+    return producao
+
+
+def lease_prices(producao):
+    """
+    Preço da saca de soja (R$) por ano de início da safra, médio ponderado
+    pela área plantada, para converter o custo dos arrendamentos
+    """
+    soja = producao[
+        (producao['cultura_key'] == CULTURA_ARRENDAMENTO) & (producao['preco_unitario'] > 0)
+    ]
+    receita = (soja['preco_unitario'] * soja['area_plantada']).groupby(soja['ano']).sum()
+    area = soja.groupby('ano')['area_plantada'].sum()
+    return {int(ano): float(valor) for ano, valor in (receita / area).items()}
+
+
+def _price_for_year(precos, ano):
+    """
+    Preço da safra ou, sem preço nela, o da safra mais próxima (a anterior
+    em caso de empate)
+    """
+    if ano in precos:
+        return precos[ano]
+    return precos[min(precos, key=lambda outro: (abs(outro - ano), outro > ano))]
+
+
+def required_names(all_data):
+    """
+    Safras (anos de início) e culturas/sistemas/ciclos usados pelo plano, estes
+    como {nome normalizado: nome original}
+    """
+    producao = production_frame(all_data)
+    financeiro = all_data.get('financeiro', {})
+
+    anos = {safra_ano_inicio(safra) for safra in all_data.get('producao', {})}
+    for categoria in ('dividas_bancarias', 'dividas_imoveis'):
+        anos.update(int(ano) for ano in financeiro.get(categoria, {}))
+    anos.add(extraction_year(all_data))
+
+    names = {'safras': sorted(anos)}
+    for table, col in (('culturas', 'cultura'), ('sistemas', 'sistema'), ('ciclos', 'ciclo')):
+        pares = producao[[f"{col}_key", col]].drop_duplicates(f"{col}_key")
+        names[table] = dict(pares.itertuples(index=False, name=None))
+    return names
+
+
+def build_rows(organizacao_id, all_data, lookups, numero_inicial=1):
+    """
+    Mapeia os dados extraídos para linhas das tabelas de destino
+
+    `lookups` traz os ids já existentes no banco: 'safras' (ano_inicio -> id)
+    e 'culturas'/'sistemas'/'ciclos' (nome normalizado -> id). Os
+    arrendamentos são numerados a partir de `numero_inicial` (ARR-001...),
+    para que vários planos da mesma organização não repitam números.
+    Retorna {tabela: (colunas, linhas)} na ordem de inserção
+    """
+    safras = lookups['safras']
+    tables = {}
+    producao = production_frame(all_data)
+    consolidado = consolidated_name(all_data)
+
+    # Propriedades próprias (Bens Imóveis) e arrendadas (Arrendamentos)
+    propriedades = all_data.get('propriedades', {})
+    prop_rows = []
+    principal = None
+    for imovel in propriedades.get('imoveis', {}).get('lista', []):
+        prop_id = uuid.uuid4()
+        municipio = str(imovel.get('municipio') or '')
+        cidade, _, estado = municipio.partition('/')
+        prop_rows.append((
+            prop_id, organizacao_id, imovel['nome'], cidade.strip() or None,
+            estado.strip() or None, _positive(imovel['area_ha']),
+            _positive(imovel['valor_total']), 'PROPRIO'
+        ))
+        if principal is None or imovel['area_ha'] > principal[1]:
+            principal = (prop_id, imovel['area_ha'])
+
+    anos_plano = sorted(safra_ano_inicio(safra) for safra in all_data.get('producao', {}))
+    primeiro_ano = anos_plano[0] if anos_plano else extraction_year(all_data)
+    ultimo_ano = anos_plano[-1] if anos_plano else primeiro_ano
+
+    arrend_rows = []
+    precos = lease_prices(producao)
+    for i, arrend in enumerate(propriedades.get('arrendamentos', {}).get('lista', []), numero_inicial):
+        prop_id = uuid.uuid4()
+        area = float(arrend['area_arrendada'])
+        prop_rows.append((
+            prop_id, organizacao_id, arrend['fazenda'], None, None, area, None, 'ARRENDADO'
+        ))
+        if principal is None:
+            principal = (prop_id, area)
+
+        ano_termino = _as_year(arrend.get('prazo')) or ultimo_ano + 1
+        ano_termino = max(ano_termino, primeiro_ano + 1)
+        custo_ha = _positive(arrend.get('valor_ha'))
+        if custo_ha and not precos:
+            raise ValueError(
+                f"Plano sem preço da soja: não há como converter o custo do arrendamento "
+                f"'{arrend['fazenda']}' de sacas/ha para R$"
+            )
+        # Custo total da safra em R$, como o app espera: {safra_id: valor}
+        anos_custo = [ano for ano in anos_plano if ano < ano_termino and ano in safras] or [primeiro_ano]
+        custos_por_ano = {
+            str(safras[ano]): round(area * custo_ha * _price_for_year(precos, ano), 2) if custo_ha else 0
+            for ano in anos_custo
+        }
+        arrend_rows.append((
+            organizacao_id, prop_id, safras[primeiro_ano], f"ARR-{i:03d}",
+            arrend['fazenda'], arrend.get('proprietario') or NAO_INFORMADO,
+            date(primeiro_ano, 1, 1), date(ano_termino, 9, 30), area, area,
+            custo_ha, 'SACAS', json.dumps(custos_por_ano)
+        ))
+
+    tables['propriedades'] = (
+        ['id', 'organizacao_id', 'nome', 'cidade', 'estado', 'area_total',
+         'valor_atual', 'tipo'],
+        prop_rows
+    )
+    tables['arrendamentos'] = (
+        ['organizacao_id', 'propriedade_id', 'safra_id', 'numero_arrendamento',
+         'nome_fazenda', 'arrendantes', 'data_inicio', 'data_termino',
+         'area_fazenda', 'area_arrendada', 'custo_hectare', 'tipo_pagamento',
+         'custos_por_ano'],
+        arrend_rows
+    )
+
+    # Produção: tabela longa safra x cultura, agregada por combinação
+    areas_rows = []
+    if not producao.empty and principal is None:
+        raise ValueError("Plano sem propriedades: não há onde associar as áreas de plantio")
+    for (cultura, sistema, ciclo), grupo in producao.groupby(['cultura_key', 'sistema_key', 'ciclo_key']):
+        areas = grupo.groupby('ano')['area_plantada'].sum()
+        areas_rows.append((
+            organizacao_id, principal[0], lookups['culturas'][cultura],
+            lookups['sistemas'][sistema], lookups['ciclos'][ciclo],
+            json.dumps({str(safras[ano]): float(area) for ano, area in areas.items()})
+        ))
+
+    # Produtividade e custo/ha por cultura e sistema, ponderados pela área e
+    # gravados na propriedade principal, já que a chave única do banco não
+    # distingue propriedade_id nulo entre planos
+    produtividade_rows = []
+    custo_rows = []
+    producao['produtividade_x_area'] = producao['produtividade_ha'] * producao['area_plantada']
+    producao['custo_x_area'] = producao['custo_ha'] * producao['area_plantada']
+    ponderado = producao.groupby(['cultura_key', 'sistema_key', 'ano'])[
+        ['produtividade_x_area', 'custo_x_area', 'area_plantada']
+    ].sum()
+    ponderado['produtividade'] = ponderado['produtividade_x_area'] / ponderado['area_plantada']
+    ponderado['custo'] = ponderado['custo_x_area'] / ponderado['area_plantada']
+    for (cultura, sistema), grupo in ponderado.groupby(level=['cultura_key', 'sistema_key']):
+        por_ano = grupo.droplevel(['cultura_key', 'sistema_key'])
+        produtividades = {
+            str(safras[ano]): round(float(v), 4) for ano, v in por_ano['produtividade'].items() if v > 0
+        }
+        custos = {
+            str(safras[ano]): round(float(v), 2) for ano, v in por_ano['custo'].items() if v > 0
+        }
+        if produtividades:
+            produtividade_rows.append((
+                organizacao_id, principal[0], lookups['culturas'][cultura],
+                lookups['sistemas'][sistema], json.dumps(produtividades)
+            ))
+        if custos:
+            custo_rows.append((
+                organizacao_id, principal[0], lookups['culturas'][cultura],
+                lookups['sistemas'][sistema], 'OUTROS', json.dumps(custos), 'R$/ha'
+            ))
+
+    tables['areas_plantio'] = (
+        ['organizacao_id', 'propriedade_id', 'cultura_id', 'sistema_id', 'ciclo_id',
+         'areas_por_safra'],
+        areas_rows
+    )
+    tables['produtividades'] = (
+        ['organizacao_id', 'propriedade_id', 'cultura_id', 'sistema_id',
+         'produtividades_por_safra'],
+        produtividade_rows
+    )
+    tables['custos_producao'] = (
+        ['organizacao_id', 'propriedade_id', 'cultura_id', 'sistema_id', 'categoria',
+         'custos_por_safra', 'descricao'],
+        custo_rows
+    )
+
+    # Dívidas e fornecedores consolidados
+    financeiro = all_data.get('financeiro', {})
+
+    bancarias = {int(ano): v for ano, v in financeiro.get('dividas_bancarias', {}).items() if v > 0}
+    bancarias_rows = []
+    if bancarias:
+        bancarias_rows.append((
+            organizacao_id, DIVIDA_BANCARIA_PADRAO['tipo'], DIVIDA_BANCARIA_PADRAO['modalidade'],
+            consolidado, min(bancarias), DIVIDA_BANCARIA_PADRAO['indexador'],
+            DIVIDA_BANCARIA_PADRAO['taxa_real'],
+            json.dumps({str(safras[ano]): valor for ano, valor in sorted(bancarias.items())})
+        ))
+    tables['dividas_bancarias'] = (
+        ['organizacao_id', 'tipo', 'modalidade', 'instituicao_bancaria', 'ano_contratacao',
+         'indexador', 'taxa_real', 'fluxo_pagamento_anual'],
+        bancarias_rows
+    )
+
+    imoveis = {int(ano): v for ano, v in financeiro.get('dividas_imoveis', {}).items() if v > 0}
+    imoveis_rows = []
+    if imoveis:
+        if principal is None:
+            raise ValueError("Plano sem propriedades: não há onde associar as dívidas de imóveis")
+        imoveis_rows.append((
+            organizacao_id, safras[min(imoveis)], principal[0], 'FINANCIAMENTO_AQUISICAO',
+            consolidado, date(min(imoveis), 1, 1), date(max(imoveis), 12, 31),
+            round(sum(imoveis.values()), 2),
+            json.dumps({str(safras[ano]): valor for ano, valor in sorted(imoveis.items())})
+        ))
+    tables['dividas_imoveis'] = (
+        ['organizacao_id', 'safra_id', 'propriedade_id', 'tipo_divida', 'credor',
+         'data_aquisicao', 'data_vencimento', 'valor_total', 'fluxo_pagamento_anual'],
+        imoveis_rows
+    )
+
+    fornecedores_rows = []
+    total_fornecedores = financeiro.get('dividas_fornecedores', 0) or 0
+    if total_fornecedores > 0:
+        safra_atual = safras[extraction_year(all_data)]
+        fornecedores_rows.append((
+            organizacao_id, safra_atual, consolidado, 'INSUMOS_GERAIS',
+            json.dumps({str(safra_atual): total_fornecedores})
+        ))
+    tables['fornecedores'] = (
+        ['organizacao_id', 'safra_id', 'nome', 'categoria', 'valores_por_ano'],
+        fornecedores_rows
+    )
+
+    # Máquinas: o ano de fabricação é obrigatório no banco, as sem ano são
+    # informadas por machines_without_year
+    maquinas_rows = []
+    for maquina in propriedades.get('maquinas', {}).get('lista', []):
+        ano = _as_year(maquina.get('ano'))
+        if ano is None:
+            continue
+        valor = _positive(maquina['valor'])
+        maquinas_rows.append((
+            organizacao_id, maquina['descricao'], ano, maquina.get('marca') or None,
+            valor, 1, valor
+        ))
+    tables['maquinas_equipamentos'] = (
+        ['organizacao_id', 'equipamento', 'ano_fabricacao', 'marca', 'valor_aquisicao',
+         'quantidade', 'valor_unitario'],
+        maquinas_rows
+    )
+
+    return tables
+
+
+class PlanoLoader:
+    """
+    Carrega planos extraídos no Postgres usando um pool de conexões; cada
+    organização é gravada em uma única transação com COPY por tabela
+    """
+
+    # Ordem de inserção respeitando as chaves estrangeiras
+    LOAD_ORDER = [
+        'propriedades', 'arrendamentos', 'areas_plantio', 'produtividades',
+        'custos_producao', 'dividas_bancarias', 'dividas_imoveis', 'fornecedores',
+        'maquinas_equipamentos'
+    ]
+
+    def __init__(self, conninfo, min_size=1, max_size=4):
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise ImportError(
+                "A carga no banco requer psycopg e psycopg_pool "
+                "(pip install 'psycopg[binary]' psycopg_pool)"
+            ) from e
+
+        self.pool = ConnectionPool(conninfo, min_size=min_size, max_size=max_size, open=True)
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def load(self, organizacao_id, planos, replace=False):
+        """
+        Grava um ou mais planos extraídos (dicts no formato dados_extraidos)
+        de uma organização. Tudo é desfeito se qualquer tabela falhar.
+
+        Com `replace`, remove antes os registros da organização nas tabelas de
+        destino (incluindo propriedades, o que apaga em cascata seus dependentes)
+
+        Retorna ({tabela: linhas inseridas}, [avisos]), com as máquinas que
+        ficaram de fora por não terem ano de fabricação
+        """
+        counts = defaultdict(int)
+        avisos = []
+
+        nomes = [consolidated_name(all_data) for all_data in planos]
+        repetidos = sorted({nome for nome in nomes if nomes.count(nome) > 1})
+        if repetidos:
+            raise ValueError(f"planos repetidos na carga: {', '.join(repetidos)}")
+
+        with self.pool.connection() as conn:
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    if replace:
+                        for table in REPLACE_ORDER:
+                            cur.execute(
+                                f"DELETE FROM {table} WHERE organizacao_id = %s",
+                                (organizacao_id,)
+                            )
+                    else:
+                        existentes = self._tables_with_rows(cur, organizacao_id)
+                        if existentes:
+                            raise ValueError(
+                                f"organização já tem registros em {', '.join(existentes)}; "
+                                f"use --replace para substituí-los"
+                            )
+
+                    # Linhas de todos os planos, com os arrendamentos numerados em sequência
+                    combined = {}
+                    for all_data in planos:
+                        lookups = self._resolve_lookups(cur, organizacao_id, required_names(all_data))
+                        numero = len(combined.get('arrendamentos', ((), []))[1]) + 1
+                        tables = build_rows(organizacao_id, all_data, lookups, numero_inicial=numero)
+                        for table, (columns, rows) in tables.items():
+                            combined.setdefault(table, (columns, []))[1].extend(rows)
+
+                        sem_ano = machines_without_year(all_data)
+                        if sem_ano:
+                            avisos.append(
+                                f"{len(sem_ano)} máquina(s) sem ano de fabricação não carregada(s) "
+                                f"({consolidated_name(all_data)}): {', '.join(map(str, sem_ano))}"
+                            )
+
+                    for table in self.LOAD_ORDER:
+                        columns, rows = combined.get(table, ((), []))
+                        counts[table] += self._copy_rows(cur, table, columns, rows)
+
+        return dict(counts), avisos
+
+    @staticmethod
+    def _tables_with_rows(cur, organizacao_id):
+        """
+        Tabelas de destino em que a organização já tem registros
+        """
+        tabelas = []
+        for table in REPLACE_ORDER:
+            cur.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {table} WHERE organizacao_id = %s)",
+                (organizacao_id,)
+            )
+            if cur.fetchone()[0]:
+                tabelas.append(table)
+        return tabelas
+
+    @staticmethod
+    def _copy_rows(cur, table, columns, rows):
+        if not rows:
+            return 0
+        with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        return len(rows)
+
+    def _resolve_lookups(self, cur, organizacao_id, names):
+        """
+        Busca (e cria quando faltam) safras, culturas, sistemas e ciclos da
+        organização, em um comando por tabela
+        """
+        anos = names['safras']
+        cur.execute(
+            """
+            INSERT INTO safras (organizacao_id, nome, ano_inicio, ano_fim)
+            SELECT %s, t.nome, t.ano_inicio, t.ano_inicio + 1
+            FROM unnest(%s::int[], %s::text[]) AS t(ano_inicio, nome)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM safras s
+                WHERE s.organizacao_id = %s AND s.ano_inicio = t.ano_inicio
+            )
+            ON CONFLICT (organizacao_id, nome) DO NOTHING
+            """,
+            (organizacao_id, anos, [safra_nome(ano) for ano in anos], organizacao_id)
+        )
+        cur.execute(
+            "SELECT ano_inicio, id FROM safras WHERE organizacao_id = %s ORDER BY created_at",
+            (organizacao_id,)
+        )
+        safras = {}
+        for ano_inicio, safra_id in cur.fetchall():
+            safras.setdefault(ano_inicio, safra_id)
+
+        lookups = {'safras': safras}
+        for table in ('culturas', 'sistemas', 'ciclos'):
+            lookups[table] = self._resolve_names(cur, table, organizacao_id, names[table])
+        return lookups
+
+    @staticmethod
+    def _resolve_names(cur, table, organizacao_id, nomes):
+        """
+        `nomes` é {nome normalizado: nome original}; nomes já cadastrados com
+        outra grafia ('Soja' x 'SOJA') são reaproveitados
+        """
+        cur.execute(f"SELECT nome, id FROM {table} WHERE organizacao_id = %s", (organizacao_id,))
+        ids = {normalize_name(nome): row_id for nome, row_id in cur.fetchall()}
+
+        faltantes = [nome for chave, nome in nomes.items() if chave not in ids]
+        if faltantes:
+            cur.execute(
+                f"""
+                INSERT INTO {table} (organizacao_id, nome)
+                SELECT %s, nome FROM unnest(%s::text[]) AS t(nome)
+                ON CONFLICT (organizacao_id, nome) DO NOTHING
+                RETURNING nome, id
+                """,
+                (organizacao_id, faltantes)
+            )
+            ids.update((normalize_name(nome), row_id) for nome, row_id in cur.fetchall())
+
+        return ids
+
+
+def parse_plan_args(pairs):
+    """
+    Agrupa argumentos '<organizacao_id>=<arquivo.json>' por organização
+    """
+    planos = defaultdict(list)
+    for pair in pairs:
+        organizacao_id, sep, arquivo = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Use <organizacao_id>=<arquivo.json>: {pair}")
+        planos[organizacao_id].append(Path(arquivo))
+    return planos
+
+
+def main(argv=None):
+    """
+    Função principal: carrega os planos de várias organizações em paralelo
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        'planos', nargs='+',
+        help='Pares <organizacao_id>=<dados_extraidos.json>'
+    )
+    parser.add_argument(
+        '--dsn', default=os.environ.get('DATABASE_URL'),
+        help='String de conexão do Postgres (padrão: $DATABASE_URL)'
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=4,
+        help='Organizações carregadas em paralelo (tamanho do pool)'
+    )
+    parser.add_argument(
+        '--replace', action='store_true',
+        help='Remove os dados existentes da organização antes da carga '
+             '(sem ela, organizações que já têm dados não são carregadas)'
+    )
+    args = parser.parse_args(argv)
+
+    if not args.dsn:
+        parser.error("informe --dsn ou defina DATABASE_URL")
+
+    planos = parse_plan_args(args.planos)
+
+    def load_organization(organizacao_id):
+        dados = []
+        for arquivo in planos[organizacao_id]:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados.append(json.load(f))
+        return loader.load(organizacao_id, dados, replace=args.replace)
+
+    print("🗄️ CARGA DOS PLANOS DE NEGÓCIOS NO BANCO")
+    print("="*80)
+
+    falhas = 0
+    with PlanoLoader(args.dsn, max_size=args.workers) as loader:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = {
+                organizacao_id: executor.submit(load_organization, organizacao_id)
+                for organizacao_id in planos
+            }
+            for organizacao_id, future in futures.items():
+                try:
+                    counts, avisos = future.result()
+                except Exception as e:
+                    falhas += 1
+                    print(f"  ❌ {organizacao_id}: {e}")
+                    continue
+                total = sum(counts.values())
+                print(f"  ✅ {organizacao_id}: {total} linhas")
+                for table, count in counts.items():
+                    if count:
+                        print(f"     - {table}: {count}")
+                for aviso in avisos:
+                    print(f"     ⚠️ {aviso}")
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
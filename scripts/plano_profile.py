@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Medição por etapa do processamento dos planos (abertura do arquivo, leitura
+de cada planilha, detecção de cabeçalho, transformação, agregação e gravação):
+tempo de relógio, tempo de CPU, pico de memória e quantidade de linhas
+"""
+
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FIELDS = [
+    'arquivo', 'etapa', 'detalhe', 'linhas', 'tempo_s', 'cpu_s',
+    'pico_tracemalloc_kb', 'pico_rss_kb'
+]
+
+
+def _peak_rss_kb():
+    """
+    Pico de memória residente do processo até agora (ru_maxrss vem em bytes no macOS)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class StageProfiler:
+    """
+    Registra uma linha por etapa. Etapas podem ser aninhadas; o pico de
+    memória de uma etapa (acima do alocado no início dela) inclui o das
+    etapas internas
+
+    Desabilitado (enabled=False), stage() não mede nada e serve de no-op.
+    `on_record`, se informado, é chamado com cada registro assim que a etapa
+    termina (ex.: para enviar o progresso a outro processo)
+    """
+
+    def __init__(self, enabled=True, trace_memory=True, on_record=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.on_record = on_record
+        self.records = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name, detail=None):
+        """
+        Mede o bloco; quem chama pode preencher record['linhas']
+        """
+        record = {'etapa': name, 'detalhe': detail, 'linhas': None}
+        if not self.enabled:
+            yield record
+            return
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # O pico acumulado até aqui pertence à etapa externa
+            if self._stack:
+                parent = self._stack[-1]
+                parent['_pico'] = max(parent['_pico'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        start_traced = tracemalloc.get_traced_memory()[0] if tracing else 0
+        record['_pico'] = 0
+        self._stack.append(record)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['tempo_s'] = round(time.perf_counter() - wall_start, 6)
+            record['cpu_s'] = round(time.process_time() - cpu_start, 6)
+            self._stack.pop()
+
+            peak = record.pop('_pico')
+            if tracing:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record['pico_tracemalloc_kb'] = round((peak - start_traced) / 1024, 1)
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent['_pico'] = max(parent['_pico'], peak)
+            else:
+                record['pico_tracemalloc_kb'] = None
+            record['pico_rss_kb'] = _peak_rss_kb()
+            self.records.append(record)
+            if self.on_record is not None:
+                self.on_record(record)
+
+
+# Perfilador desligado usado quando nenhum é informado
+NULL_PROFILER = StageProfiler(enabled=False)
+
+
+class Profiled:
+    """
+    Envolve um worker do lote (extract_file, analyze_file) para medir suas
+    etapas no processo onde ele roda; o resultado volta como
+    {'resultado': ..., 'perfil': [registros]}
+    """
+
+    def __init__(self, worker, trace_memory=True):
+        self.worker = worker
+        self.trace_memory = trace_memory
+
+    def __call__(self, path, **kwargs):
+        profiler = StageProfiler(trace_memory=self.trace_memory)
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            with profiler.stage('total', Path(path).name):
+                result = self.worker(path, profiler=profiler, **kwargs)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        records = [{'arquivo': Path(path).name, **record} for record in profiler.records]
+        return {'resultado': result, 'perfil': records}
+
+
+def write_profile_report(report_path, results):
+    """
+    Junta os registros de todos os arquivos do lote (resultados de Profiled)
+    em um único relatório JSON ou CSV, conforme a extensão de `report_path`
+    """
+    records = [
+        record
+        for _, result, error in results
+        if error is None and result is not None
+        for record in result['perfil']
+    ]
+
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    if report_path.suffix.lower() == '.csv':
+        with open(report_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2, default=str)
+
+    print(f"\n⏱️ Perfil de execução salvo em: {report_path}")
+    return report_path
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Projeção dos indicadores do Plano de Negócios por safra em cenários de preço e
+produtividade, calculada em NumPy sobre arrays safra × cultura: milhares de
+cenários são avaliados de uma vez, sem laço por cenário
+
+Indicadores por cenário e safra: receita, custo, EBITDA (receita - custo de
+produção), margem EBITDA, dívida (saldo a vencer), dívida/receita,
+dívida/EBITDA e cobertura do serviço da dívida (EBITDA / parcelas do ano)
+
+Uso:
+    python plano_projection.py dados_extraidos_<plano>.json
+    python plano_projection.py dados.json --precos=-0.3:0.3:0.01 --produtividade=-0.2:0.15:0.01
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from plano_columnar import extraction_tables
+from plano_safras import extraction_year, safra_ano_inicio
+
+# Padrões de parametros_sensibilidade (database/indicators/tables.sql)
+VARIACOES_PRECOS = {'cenario_baixo': -0.25, 'cenario_base': 0.0, 'cenario_alto': 0.30}
+VARIACOES_PRODUTIVIDADE = {'cenario_baixo': -0.20, 'cenario_base': 0.0, 'cenario_alto': 0.15}
+
+# Padrões de configuracao_indicadores; níveis como get_risk_level():
+# valor <= baixo -> BAIXO, <= medio -> MEDIO, <= alto -> ALTO, senão CRITICO
+LIMIARES = {
+    'divida_ebitda': {'baixo': 2.0, 'medio': 3.5, 'alto': 5.0},
+    'divida_receita': {'baixo': 0.3, 'medio': 0.5, 'alto': 0.7},
+}
+NIVEIS_RISCO = np.array(['BAIXO', 'MEDIO', 'ALTO', 'CRITICO'])
+
+INDICADORES = (
+    'receita', 'custo', 'ebitda', 'margem_ebitda', 'divida',
+    'divida_receita', 'divida_ebitda', 'cobertura_servico'
+)
+PERCENTIS = (5, 50, 95)
+
+CULTURA_KEY = ['cultura', 'ciclo', 'sistema']
+
+
+def _ratio(numerator, denominator):
+    """
+    numerator / denominator, com NaN onde o denominador não é positivo
+    """
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+@dataclass
+class PlanArrays:
+    """
+    Dados do plano como arrays: safras (S) × culturas (C) para a produção e
+    por safra para a dívida. Cultura é a combinação cultura/ciclo/sistema
+    """
+    safras: list
+    anos: np.ndarray
+    culturas: list
+    area: np.ndarray
+    produtividade: np.ndarray
+    preco: np.ndarray
+    custo: np.ndarray
+    divida: np.ndarray
+    servico_divida: np.ndarray
+
+    @classmethod
+    def from_extraction(cls, all_data):
+        """
+        Monta os arrays a partir dos dados extraídos (dados_extraidos_*.json)
+
+        Produtividade e preço de cada cultura são médias ponderadas (produção
+        / área e receita / produção). A dívida de uma safra é o saldo das
+        parcelas bancárias e de imóveis a vencer do ano de início em diante;
+        fornecedores entram como dívida corrente até o ano da extração
+        """
+        producao = extraction_tables(all_data)['producao']
+        producao['safra'] = producao['safra'].astype(str)
+        for col in CULTURA_KEY:
+            producao[col] = producao[col].fillna('').astype(str)
+
+        safras = sorted(all_data.get('producao', {}), key=safra_ano_inicio)
+        totais = producao.groupby(['safra'] + CULTURA_KEY, sort=True)[
+            ['area_plantada', 'producao_total', 'receita_total', 'custo_total']
+        ].sum()
+        grid = {
+            col: totais[col].unstack(CULTURA_KEY, fill_value=0.0).reindex(safras, fill_value=0.0)
+            for col in totais.columns
+        }
+        culturas = [' / '.join(part for part in key if part) for key in grid['area_plantada'].columns]
+
+        area = grid['area_plantada'].to_numpy(float)
+        producao_total = grid['producao_total'].to_numpy(float)
+        anos = np.array([safra_ano_inicio(safra) for safra in safras], dtype=int)
+
+        financeiro = all_data.get('financeiro', {})
+        parcelas = {}
+        for categoria in ('dividas_bancarias', 'dividas_imoveis'):
+            for ano, valor in financeiro.get(categoria, {}).items():
+                parcelas[int(ano)] = parcelas.get(int(ano), 0.0) + float(valor)
+        anos_parcelas = np.array(sorted(parcelas), dtype=int)
+        valores_parcelas = np.array([parcelas[ano] for ano in anos_parcelas], dtype=float)
+
+        # Saldo a vencer: soma das parcelas com ano >= ano da safra
+        a_vencer = anos_parcelas[None, :] >= anos[:, None]
+        divida = (a_vencer * valores_parcelas).sum(axis=1)
+        servico = (anos_parcelas[None, :] == anos[:, None]) @ valores_parcelas if len(anos) else np.zeros(0)
+
+        ano_extracao = extraction_year(all_data)
+        divida = divida + np.where(anos <= ano_extracao, float(financeiro.get('dividas_fornecedores') or 0), 0.0)
+
+        return cls(
+            safras=safras,
+            anos=anos,
+            culturas=culturas,
+            area=area,
+            produtividade=_ratio(producao_total, area),
+            preco=_ratio(grid['receita_total'].to_numpy(float), producao_total),
+            custo=grid['custo_total'].to_numpy(float),
+            divida=divida,
+            servico_divida=np.asarray(servico, dtype=float),
+        )
+
+    @property
+    def producao_base(self):
+        """
+        Receita de cada safra × cultura no cenário base (S, C)
+        """
+        return np.nan_to_num(self.area * self.produtividade * self.preco)
+
+
+def _factors(variacoes, culturas):
+    """
+    Fatores (1 + variação) como matriz cenários × culturas: aceita uma
+    variação por cenário (N,) ou por cenário e cultura (N, C)
+    """
+    variacoes = np.atleast_1d(np.asarray(variacoes, dtype=float))
+    if variacoes.ndim == 1:
+        variacoes = variacoes[:, None]
+    return np.broadcast_to(1.0 + variacoes, (variacoes.shape[0], culturas))
+
+
+def project(plan, variacoes_precos, variacoes_produtividade):
+    """
+    Indicadores de todos os cenários preço (P) × produtividade (Q) × safra (S)
+
+    A receita de cada cenário é sum_c fp[p,c] · fq[q,c] · base[s,c], feita com
+    um único einsum; o custo de produção não varia com os cenários. Retorna
+    {indicador: array (P, Q, S)}
+    """
+    base = plan.producao_base
+    fp = _factors(variacoes_precos, base.shape[1])
+    fq = _factors(variacoes_produtividade, base.shape[1])
+
+    receita = np.einsum('pc,qc,sc->pqs', fp, fq, base, optimize=True)
+    custo = np.broadcast_to(plan.custo.sum(axis=1), receita.shape)
+    ebitda = receita - custo
+    divida = np.broadcast_to(plan.divida, receita.shape)
+
+    return {
+        'receita': receita,
+        'custo': custo,
+        'ebitda': ebitda,
+        'margem_ebitda': _ratio(ebitda, receita),
+        'divida': divida,
+        'divida_receita': _ratio(divida, receita),
+        'divida_ebitda': _ratio(divida, ebitda),
+        'cobertura_servico': _ratio(ebitda, np.broadcast_to(plan.servico_divida, receita.shape)),
+    }
+
+
+def risk_levels(values, limiares):
+    """
+    Nível de risco de cada valor (BAIXO, MEDIO, ALTO, CRITICO); NaN (EBITDA ou
+    receita não positivos) é CRITICO
+    """
+    bounds = np.array([limiares['baixo'], limiares['medio'], limiares['alto']])
+    index = np.searchsorted(bounds, values, side='left')
+    return NIVEIS_RISCO[np.where(np.isnan(values), len(bounds), index)]
+
+
+def parse_range(text):
+    """
+    Variações a partir de 'inicio:fim:passo' (fim incluso) ou de uma lista
+    'v1,v2,...'
+    """
+    if ':' in text:
+        inicio, fim, passo = (float(part) for part in text.split(':'))
+        count = int(round((fim - inicio) / passo)) + 1
+        return np.round(inicio + passo * np.arange(count), 10)
+    return np.array([float(part) for part in text.split(',')])
+
+
+def _value(x):
+    return None if np.isnan(x) else float(x)
+
+
+def _percentiles(valores):
+    """
+    PERCENTIS de cada safra (colunas de `valores`) ignorando NaN; safras sem
+    nenhum valor definido ficam NaN (sem valor no resumo), sem passar pelo
+    nanpercentile, que avisa a cada fatia toda NaN
+    """
+    out = np.full((len(PERCENTIS), valores.shape[1]), np.nan)
+    definidas = ~np.isnan(valores).all(axis=0)
+    if definidas.any():
+        out[:, definidas] = np.nanpercentile(valores[:, definidas], PERCENTIS, axis=0)
+    return out
+
+
+def summarize(plan, resultado, variacoes_precos, variacoes_produtividade):
+    """
+    Resumo por safra: indicadores do cenário base (sem variação), percentis
+    sobre todos os cenários e a parcela de cenários em cada nível de risco.
+    Indicadores sem valor em nenhum cenário da safra (ex.: dívida/EBITDA com
+    EBITDA sempre negativo) têm os percentis nulos
+    """
+    variacoes_precos = np.asarray(variacoes_precos, dtype=float)
+    variacoes_produtividade = np.asarray(variacoes_produtividade, dtype=float)
+    base = project(plan, [0.0], [0.0])
+
+    flat = {nome: valores.reshape(-1, len(plan.safras)) for nome, valores in resultado.items()}
+    percentis = {
+        nome: _percentiles(flat[nome])
+        for nome in ('receita', 'ebitda', 'divida_ebitda', 'divida_receita')
+    }
+    niveis = {
+        nome: risk_levels(flat[nome], limiares)
+        for nome, limiares in LIMIARES.items()
+    }
+
+    safras = {}
+    for s, safra in enumerate(plan.safras):
+        safras[safra] = {
+            'ano': int(plan.anos[s]),
+            'base': {nome: _value(base[nome][0, 0, s]) for nome in INDICADORES},
+            'percentis': {
+                nome: {f"p{p}": _value(valores[i, s]) for i, p in enumerate(PERCENTIS)}
+                for nome, valores in percentis.items()
+            },
+            'risco': {
+                nome: {
+                    nivel: float((valores[:, s] == nivel).mean())
+                    for nivel in NIVEIS_RISCO
+                }
+                for nome, valores in niveis.items()
+            },
+        }
+
+    return {
+        'cenarios': {
+            'precos': len(variacoes_precos),
+            'produtividade': len(variacoes_produtividade),
+            'total': len(variacoes_precos) * len(variacoes_produtividade),
+        },
+        'culturas': plan.culturas,
+        'limiares': LIMIARES,
+        'safras': safras,
+    }
+
+
+def sensitivity_table(plan):
+    """
+    Os 9 cenários nomeados de parametros_sensibilidade (baixo/base/alto de
+    preço × produtividade): {'preco=..., produtividade=...': {safra: {...}}}
+    """
+    resultado = project(plan, list(VARIACOES_PRECOS.values()), list(VARIACOES_PRODUTIVIDADE.values()))
+    tabela = {}
+    for p, cenario_preco in enumerate(VARIACOES_PRECOS):
+        for q, cenario_prod in enumerate(VARIACOES_PRODUTIVIDADE):
+            nome = f"preco={cenario_preco}, produtividade={cenario_prod}"
+            tabela[nome] = {
+                safra: {
+                    nome_ind: _value(resultado[nome_ind][p, q, s])
+                    for nome_ind in ('receita', 'ebitda', 'divida_receita', 'divida_ebitda')
+                }
+                for s, safra in enumerate(plan.safras)
+            }
+    return tabela
+
+
+def print_summary(resumo):
+    print("\n📈 PROJEÇÃO POR SAFRA (cenário base e faixa p5–p95 dos cenários)")
+    print("="*80)
+    print(f"{'Safra':<10} {'EBITDA base':>18} {'Dív/EBITDA base':>16} {'Dív/EBITDA p5–p95':>20} {'% CRÍTICO':>10}")
+    for safra, dados in resumo['safras'].items():
+        base = dados['base']
+        faixa = dados['percentis'].get('divida_ebitda', {})
+        p5, p95 = faixa.get('p5'), faixa.get('p95')
+        faixa_txt = f"{p5:.2f}–{p95:.2f}" if p5 is not None and p95 is not None else '-'
+        dl = base['divida_ebitda']
+        print(
+            f"{safra:<10} {base['ebitda']:>18,.2f} {(f'{dl:.2f}' if dl is not None else '-'):>16} "
+            f"{faixa_txt:>20} {dados['risco']['divida_ebitda']['CRITICO']:>9.1%}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Projeção de indicadores do Plano de Negócios por cenários')
+    parser.add_argument('dados', type=Path, help='JSON gerado por extract_plano_negocios_data.py')
+    parser.add_argument(
+        '--precos', type=parse_range, default=parse_range('-0.30:0.30:0.01'),
+        help="Variações de preço: 'inicio:fim:passo' ou 'v1,v2,...' (padrão: -0.30:0.30:0.01)"
+    )
+    parser.add_argument(
+        '--produtividade', type=parse_range, default=parse_range('-0.20:0.15:0.01'),
+        help="Variações de produtividade, no mesmo formato (padrão: -0.20:0.15:0.01)"
+    )
+    parser.add_argument('-o', '--output', type=Path, default=None, help='Arquivo JSON do resumo')
+    parser.add_argument('--npz', type=Path, default=None, help='Salva a grade completa de cenários (.npz)')
+    args = parser.parse_args(argv)
+
+    with open(args.dados, 'r', encoding='utf-8') as f:
+        all_data = json.load(f)
+
+    plan = PlanArrays.from_extraction(all_data)
+    print(f"📄 Plano: {all_data.get('metadata', {}).get('arquivo', args.dados.name)}")
+    print(f"Safras: {len(plan.safras)} | Culturas: {len(plan.culturas)} | "
+          f"Cenários: {len(args.precos)} preços × {len(args.produtividade)} produtividades")
+
+    inicio = time.perf_counter()
+    resultado = project(plan, args.precos, args.produtividade)
+    tempo = time.perf_counter() - inicio
+    print(f"⏱️  {len(args.precos) * len(args.produtividade):,} cenários calculados em {tempo * 1000:.1f} ms")
+
+    resumo = summarize(plan, resultado, args.precos, args.produtividade)
+    resumo['sensibilidade'] = sensitivity_table(plan)
+    print_summary(resumo)
+
+    output_file = args.output or args.dados.with_name(f"projecao_{args.dados.stem}.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resumo salvo em: {output_file}")
+
+    if args.npz:
+        np.savez_compressed(
+            args.npz, safras=np.array(plan.safras), variacoes_precos=args.precos,
+            variacoes_produtividade=args.produtividade, **resultado
+        )
+        print(f"💾 Grade de cenários salva em: {args.npz}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
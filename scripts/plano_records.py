@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Registros extraídos guardados em colunas: números em arrays tipados, textos
+repetidos (cultura, município, marca...) codificados como categorias, e o
+JSON gravado direto das colunas, um registro por vez, sem montar uma lista
+de dicts com as mesmas chaves repetidas em cada linha
+"""
+
+import json
+import math
+from array import array
+from json.encoder import encode_basestring
+
+# Códigos das categorias; -1 marca célula vazia (NaN)
+CODE_TYPECODE = 'i'
+NUMBER_TYPECODE = 'd'
+
+# Registros convertidos em texto JSON por vez na gravação
+ENCODE_CHUNK_ROWS = 4096
+
+
+def _encode_value(value):
+    if type(value) is str:
+        return encode_basestring(value)
+    if type(value) is float:
+        return _encode_float(value)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# repr() dos floats não finitos -> como o json os escreve
+NON_FINITE = {'nan': 'NaN', 'inf': 'Infinity', '-inf': '-Infinity'}
+
+
+def _encode_float(value):
+    text = float.__repr__(value)
+    return NON_FINITE.get(text, text)
+
+
+class CategoricalColumn:
+    """
+    Coluna de texto com cada valor distinto guardado uma única vez
+    """
+
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return math.nan if code < 0 else self.categories[code]
+
+    def __iter__(self):
+        categories = self.categories
+        for code in self.codes:
+            yield math.nan if code < 0 else categories[code]
+
+
+class RecordTable:
+    """
+    Registros de uma seção (culturas, imóveis, máquinas, arrendamentos) em
+    colunas. Para quem lê, funciona como a lista de dicts que substitui:
+    len(), iteração e índice devolvem os registros como dicts
+
+    `fields` é a ordem dos campos; `columns` tem uma coluna por campo
+    (array de floats, CategoricalColumn ou lista de valores)
+    """
+
+    __slots__ = ('fields', 'columns')
+
+    def __init__(self, fields, columns):
+        self.fields = list(fields)
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df, categorical=()):
+        """
+        Converte o DataFrame de registros de extract_sheet: campos float viram
+        arrays, campos em `categorical` viram categorias e os demais listas
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns = {}
+        for field in df.columns:
+            col = df[field]
+            if field in categorical:
+                codes, categories = pd.factorize(col, use_na_sentinel=True)
+                encoded = array(CODE_TYPECODE)
+                encoded.frombytes(codes.astype(np.intc).tobytes())
+                columns[field] = CategoricalColumn(encoded, list(categories))
+            elif col.dtype == np.float64:
+                values = array(NUMBER_TYPECODE)
+                values.frombytes(col.to_numpy().tobytes())
+                columns[field] = values
+            else:
+                columns[field] = col.tolist()
+        return cls(df.columns, columns)
+
+    def __len__(self):
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+    def rows(self):
+        """
+        Registros como tuplas na ordem de `fields`
+        """
+        return zip(*(self.columns[field] for field in self.fields))
+
+    def __iter__(self):
+        fields = self.fields
+        for row in self.rows():
+            yield dict(zip(fields, row))
+
+    def __getitem__(self, i):
+        return {field: self.columns[field][i] for field in self.fields}
+
+    def column(self, field):
+        """
+        Valores de um campo, já decodificados
+        """
+        return list(self.columns[field])
+
+    def _encoded_column(self, field, start, stop):
+        """
+        Texto JSON dos valores de um campo nas linhas [start, stop); cada
+        categoria é convertida uma única vez
+        """
+        col = self.columns[field]
+        if isinstance(col, CategoricalColumn):
+            encoded = [_encode_value(category) for category in col.categories]
+            return ['NaN' if code < 0 else encoded[code] for code in col.codes[start:stop]]
+        if isinstance(col, array):
+            texts = map(float.__repr__, col[start:stop])
+            return [NON_FINITE.get(text, text) for text in texts]
+        return [_encode_value(value) for value in col[start:stop]]
+
+    def iter_json(self, indent=None, level=0):
+        """
+        Texto JSON de cada registro (objeto no nível de indentação `level`),
+        montado coluna a coluna em blocos de ENCODE_CHUNK_ROWS linhas
+        """
+        if indent is None:
+            opening, separator, closing = '{', ', ', '}'
+        else:
+            newline = '\n' + ' ' * (indent * (level + 1))
+            opening, separator, closing = '{' + newline, ',' + newline, '\n' + ' ' * (indent * level) + '}'
+        keys = [_encode_value(str(field)) + ': ' for field in self.fields]
+
+        for start in range(0, len(self), ENCODE_CHUNK_ROWS):
+            stop = min(start + ENCODE_CHUNK_ROWS, len(self))
+            columns = [self._encoded_column(field, start, stop) for field in self.fields]
+            for values in zip(*columns):
+                yield opening + separator.join(key + value for key, value in zip(keys, values)) + closing
+
+
+def _key(key):
+    """
+    Chave de objeto como o módulo json a converte
+    """
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _has_records(obj):
+    if isinstance(obj, RecordTable):
+        return True
+    if isinstance(obj, dict):
+        return any(_has_records(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_records(value) for value in obj)
+    return False
+
+
+def _encode_plain(obj, indent, level):
+    """
+    Valor sem RecordTable, pelo próprio json, reindentado para o nível atual
+    """
+    text = json.dumps(obj, ensure_ascii=False, default=str, indent=indent)
+    if indent is not None and level:
+        text = text.replace('\n', '\n' + ' ' * (indent * level))
+    return text
+
+
+def _iterencode(obj, indent, level):
+    if not _has_records(obj):
+        yield _encode_plain(obj, indent, level)
+        return
+
+    if isinstance(obj, dict):
+        items, opening, closing = obj.items(), '{', '}'
+    else:
+        items, opening, closing = obj, '[', ']'
+
+    if not obj:
+        yield opening + closing
+        return
+
+    if indent is None:
+        separator, newline, end = ', ', '', ''
+    else:
+        newline = '\n' + ' ' * (indent * (level + 1))
+        separator, end = ',' + newline, '\n' + ' ' * (indent * level)
+
+    yield opening + newline
+    if isinstance(obj, RecordTable):
+        first = True
+        for row in obj.iter_json(indent, level + 1):
+            if not first:
+                yield separator
+            first = False
+            yield row
+        yield end + closing
+        return
+
+    first = True
+    for item in items:
+        if not first:
+            yield separator
+        first = False
+        if isinstance(obj, dict):
+            key, item = item
+            yield json.dumps(_key(key), ensure_ascii=False) + ': '
+        yield from _iterencode(item, indent, level + 1)
+    yield end + closing
+
+
+def dump_json(data, f, indent=None):
+    """
+    Grava `data` em `f` com o mesmo texto de json.dump(data, f,
+    ensure_ascii=False, indent=indent, default=str), escrevendo os
+    RecordTable registro a registro
+    """
+    for chunk in _iterencode(data, indent, 0):
+        f.write(chunk)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Chaves comuns aos scripts que consomem os dados extraídos (carga no banco,
+armazenamento local e projeção): ano de início das safras, ano da extração
+e nomes normalizados para comparação
+"""
+
+import unicodedata
+from datetime import datetime
+
+
+def normalize_name(nome):
+    """
+    Chave de comparação de nomes: sem acentos/ordinais, maiúsculas e espaços
+    simples ('1ª SAFRA' e '1 Safra' viram '1 SAFRA')
+    """
+    nome = str(nome).replace('ª', '').replace('º', '')
+    nome = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode()
+    return ' '.join(nome.upper().split())
+
+
+def safra_ano_inicio(chave):
+    """
+    Ano de início a partir da chave da extração: '2021-22' -> 2021
+    """
+    return int(str(chave).split('-')[0])
+
+
+def extraction_year(all_data):
+    """
+    Ano da extração (metadata.data_extracao), ou o ano atual se não houver
+    """
+    data_extracao = all_data.get('metadata', {}).get('data_extracao')
+    try:
+        return datetime.strptime(data_extracao, '%Y-%m-%d %H:%M:%S').year
+    except (TypeError, ValueError):
+        return datetime.now().year
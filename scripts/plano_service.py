@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Serviço local de extração de planos de negócios: recebe planilhas por HTTP
+(TCP ou socket Unix), enfileira os jobs e os processa em um pool fixo de
+processos já aquecidos, transmitindo o progresso de cada etapa
+
+Rotas:
+  POST /jobs?nome=<arquivo.xlsx>   corpo = conteúdo do .xlsx; cria o job
+                                   (ou devolve o job do mesmo arquivo)
+  GET  /jobs                       lista os jobs
+  GET  /jobs/<id>                  situação do job
+  GET  /jobs/<id>/events           progresso em NDJSON até o job terminar
+  GET  /jobs/<id>/result           JSON com os dados extraídos
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from plano_cache import ExtractionCache
+from plano_profile import StageProfiler
+from plano_workbook import ENGINES
+
+DEFAULT_WORK_DIR = Path(
+    os.environ.get('PLANO_SERVICE_DIR', Path.home() / '.cache' / 'plano_negocios' / 'servico')
+)
+
+# Limites do serviço
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_QUEUE = 100
+# Jobs terminados mantidos (com seus arquivos); os mais antigos são descartados
+DEFAULT_MAX_FINISHED = 1000
+# Espera pelos eventos que o processo de trabalho ainda não repassou ao terminar
+EVENTS_DRAIN_TIMEOUT = 5
+
+# Situações de um job
+NA_FILA = 'na_fila'
+PROCESSANDO = 'processando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+FINAL_STATUSES = (CONCLUIDO, ERRO)
+
+JOB_PATH = re.compile(r'^/jobs/(?P<id>[0-9a-f]+)(?:/(?P<acao>events|result))?/?$')
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Fila de eventos do processo de trabalho para o serviço (definida no initializer)
+_events = None
+
+
+def _init_worker(events):
+    """
+    Inicializa um processo do pool: guarda a fila de eventos e já importa o
+    extrator (pandas, openpyxl) para o primeiro job não pagar esse custo
+    """
+    global _events
+    _events = events
+    # Ctrl+C é tratado pelo serviço, que encerra o pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import extract_plano_negocios_data  # noqa: F401
+
+
+def _run_job(job_id, file_path, output_dir, cache_dir, use_cache, engine):
+    """
+    Executa a extração de um job no processo de trabalho; cada etapa
+    concluída é enviada como evento de progresso, e (job_id, None) marca o
+    fim dos eventos do job
+    """
+    from extract_plano_negocios_data import extract_file
+
+    profiler = StageProfiler(
+        trace_memory=False,
+        on_record=lambda record: _events.put((job_id, record))
+    )
+    cache = ExtractionCache(cache_dir) if use_cache else None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            output_file = extract_file(
+                file_path, output_dir=output_dir, cache=cache, engine=engine, profiler=profiler
+            )
+    finally:
+        _events.put((job_id, None))
+    return str(output_file)
+
+
+class Job:
+    """
+    Um arquivo enviado: situação, histórico de eventos e assinantes do progresso
+    """
+
+    def __init__(self, job_id, sha256, file_path):
+        self.id = job_id
+        self.sha256 = sha256
+        self.file_path = file_path
+        self.status = NA_FILA
+        self.created = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.output_file = None
+        self.error = None
+        self.events = []
+        self._subscribers = []
+        # Marcado quando todos os eventos do processo de trabalho foram repassados
+        self.events_done = asyncio.Event()
+
+    def emit(self, **event):
+        event = {'job': self.id, 'status': self.status, **event}
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def set_status(self, status, **event):
+        self.status = status
+        self.emit(**event)
+
+    def subscribe(self):
+        """
+        Fila com o histórico de eventos e, em seguida, os novos eventos
+        """
+        queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.remove(queue)
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'arquivo': self.file_path.name,
+            'sha256': self.sha256,
+            'status': self.status,
+            'criado_em': self.created,
+            'resultado': self.output_file,
+            'erro': self.error,
+        }
+
+
+class ExtractionService:
+    """
+    Fila de jobs atendida por um pool fixo de processos. Envios do mesmo
+    arquivo (mesmo SHA-256) reaproveitam o job existente, a menos que ele
+    tenha falhado
+
+    Só os `max_finished` jobs terminados mais recentes são mantidos; os mais
+    antigos saem da lista e seus arquivos são apagados
+    """
+
+    def __init__(self, work_dir=None, workers=None, max_queue=DEFAULT_MAX_QUEUE,
+                 cache_dir=None, use_cache=True, engine='pandas',
+                 max_finished=DEFAULT_MAX_FINISHED):
+        self.work_dir = Path(work_dir) if work_dir else DEFAULT_WORK_DIR
+        self.workers = workers or os.cpu_count()
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.engine = engine
+        self.max_finished = max_finished
+        self.jobs = {}
+        # Jobs terminados, do mais antigo ao mais recente
+        self._finished = deque()
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        # Envios com vaga na fila já reservada, ainda gravando o arquivo
+        self._reserved = 0
+        self._tasks = []
+        self._pool = None
+        self._events = None
+
+    async def start(self):
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._events = multiprocessing.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self._events,)
+        )
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._forward_events()))
+
+    async def stop(self):
+        # O sentinela libera a thread que espera eventos dos processos
+        self._events.put(None)
+        for task in self._tasks[:-1]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pool.shutdown(cancel_futures=True)
+        self._events.close()
+
+    async def submit(self, data, nome):
+        """
+        Cria o job do arquivo enviado, ou devolve o job existente do mesmo
+        conteúdo; retorna (job, duplicado)
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        job_id = sha256[:16]
+
+        job = self.jobs.get(job_id)
+        if job is not None and job.status != ERRO:
+            return job, True
+
+        if 0 < self._queue.maxsize <= self._queue.qsize() + self._reserved:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "Fila de extração cheia, tente novamente")
+
+        # Job e vaga na fila são registrados antes de gravar o arquivo, para
+        # que envios simultâneos do mesmo conteúdo reaproveitem este job
+        job = Job(job_id, sha256, self.work_dir / job_id / nome)
+        self.jobs[job_id] = job
+        self._reserved += 1
+        try:
+            await asyncio.to_thread(self._save_upload, job.file_path, data)
+        except Exception as e:
+            del self.jobs[job_id]
+            job.error = str(e)
+            job.set_status(ERRO, erro=job.error)
+            raise
+        finally:
+            self._reserved -= 1
+
+        self._queue.put_nowait(job)
+        job.emit(posicao=self._queue.qsize())
+        return job, False
+
+    @staticmethod
+    def _save_upload(file_path, data):
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(data)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.set_status(PROCESSANDO)
+            try:
+                job.output_file = await loop.run_in_executor(
+                    self._pool, _run_job, job.id, str(job.file_path), str(job.file_path.parent),
+                    self.cache_dir, self.use_cache, self.engine
+                )
+                status, event = CONCLUIDO, {'resultado': job.output_file}
+            except Exception as e:
+                job.error = str(e)
+                status, event = ERRO, {'erro': job.error}
+            try:
+                # Os últimos eventos de etapa podem chegar depois do resultado;
+                # sem a marca de fim (processo encerrado à força) não há o que esperar
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(job.events_done.wait(), EVENTS_DRAIN_TIMEOUT)
+                await self._finish(job, status, **event)
+            finally:
+                self._queue.task_done()
+
+    async def _finish(self, job, status, **event):
+        """
+        Marca o job como terminado e descarta os terminados mais antigos além
+        de `max_finished`
+        """
+        job.set_status(status, **event)
+        self._finished.append(job)
+        while len(self._finished) > self.max_finished:
+            antigo = self._finished.popleft()
+            # Um job com erro pode ter sido reenviado: o novo usa o mesmo id e diretório
+            if self.jobs.get(antigo.id) is antigo:
+                del self.jobs[antigo.id]
+                await asyncio.to_thread(shutil.rmtree, antigo.file_path.parent, True)
+
+    async def _forward_events(self):
+        """
+        Repassa aos jobs os eventos de etapa enviados pelos processos de trabalho
+        """
+        while True:
+            message = await asyncio.to_thread(self._events.get)
+            if message is None:
+                return
+            job_id, record = message
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            if record is None:
+                job.events_done.set()
+            elif job.status == PROCESSANDO:
+                job.emit(
+                    etapa=record['etapa'], detalhe=record['detalhe'],
+                    linhas=record['linhas'], tempo_s=record['tempo_s']
+                )
+
+    # HTTP
+
+    async def handle(self, reader, writer):
+        try:
+            method, path, query, body = await self._read_request(reader)
+            await self._route(method, path, query, body, writer)
+        except HttpError as e:
+            await self._send_json(writer, {'erro': str(e)}, e.status)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send_json(writer, {'erro': str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        finally:
+            with contextlib.suppress(ConnectionError):
+                writer.close()
+                await writer.wait_closed()
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        if not request_line:
+            raise ConnectionError("conexão fechada")
+        try:
+            method, target, _ = request_line.split(' ', 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Requisição inválida")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0) or 0)
+        if length > MAX_UPLOAD_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Arquivo maior que o limite do serviço")
+        body = await reader.readexactly(length) if length else b''
+
+        url = urlsplit(target)
+        return method.upper(), unquote(url.path), parse_qs(url.query), body
+
+    async def _route(self, method, path, query, body, writer):
+        if path.rstrip('/') == '/jobs':
+            if method == 'POST':
+                if not body:
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "Envie o conteúdo do .xlsx no corpo da requisição")
+                nome = Path(query.get('nome', ['plano.xlsx'])[0]).name
+                if not nome.lower().endswith(('.xlsx', '.xlsm')):
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "O arquivo deve ser .xlsx ou .xlsm")
+                job, duplicado = await self.submit(body, nome)
+                status = HTTPStatus.OK if duplicado else HTTPStatus.ACCEPTED
+                return await self._send_json(writer, {**job.as_dict(), 'duplicado': duplicado}, status)
+            if method == 'GET':
+                return await self._send_json(writer, [job.as_dict() for job in self.jobs.values()])
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Método não permitido")
+
+        match = JOB_PATH.match(path)
+        if match is None or method != 'GET':
+            raise HttpError(HTTPStatus.NOT_FOUND, "Rota não encontrada")
+        job = self.jobs.get(match['id'])
+        if job is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Job não encontrado")
+
+        if match['acao'] == 'events':
+            return await self._stream_events(job, writer)
+        if match['acao'] == 'result':
+            if job.status != CONCLUIDO:
+                raise HttpError(HTTPStatus.CONFLICT, f"Job ainda não concluído ({job.status})")
+            data = await asyncio.to_thread(Path(job.output_file).read_bytes)
+            return await self._send(writer, data, 'application/json; charset=utf-8')
+        return await self._send_json(writer, job.as_dict())
+
+    async def _stream_events(self, job, writer):
+        """
+        Envia o histórico e os novos eventos do job, um JSON por linha, até
+        o job terminar
+        """
+        queue = job.subscribe()
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            while True:
+                event = await queue.get()
+                writer.write(json.dumps(event, ensure_ascii=False, default=str).encode('utf-8') + b"\n")
+                await writer.drain()
+                if event['status'] in FINAL_STATUSES:
+                    break
+        finally:
+            job.unsubscribe(queue)
+
+    async def _send_json(self, writer, payload, status=HTTPStatus.OK):
+        data = json.dumps(payload, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+        await self._send(writer, data, 'application/json; charset=utf-8', status)
+
+    async def _send(self, writer, data, content_type, status=HTTPStatus.OK):
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + data
+        )
+        await writer.drain()
+
+
+async def serve(args):
+    service = ExtractionService(
+        work_dir=args.work_dir, workers=args.workers, max_queue=args.max_queue,
+        cache_dir=args.cache_dir, use_cache=not args.no_cache, engine=args.engine,
+        max_finished=args.max_finished
+    )
+    await service.start()
+
+    if args.socket:
+        server = await asyncio.start_unix_server(service.handle, path=str(args.socket))
+        endereco = f"unix:{args.socket}"
+    else:
+        server = await asyncio.start_server(service.handle, args.host, args.port)
+        endereco = f"http://{args.host}:{args.port}"
+
+    print("🛰️ SERVIÇO DE EXTRAÇÃO DO PLANO DE NEGÓCIOS")
+    print("="*80)
+    print(f"Endereço: {endereco}")
+    print(f"Processos: {service.workers} | Fila máxima: {args.max_queue} | Diretório: {service.work_dir}")
+
+    # Ctrl+C ou SIGTERM encerram o servidor, o pool e a leitura de eventos
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        await service.stop()
+    print("\n👋 Serviço encerrado")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço TCP (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Porta TCP (padrão: 8765)')
+    parser.add_argument('--socket', type=Path, default=None, help='Atende em um socket Unix em vez de TCP')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count(),
+        help='Processos de extração (padrão: número de CPUs)'
+    )
+    parser.add_argument(
+        '--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+        help=f'Jobs aguardando na fila antes de recusar envios (padrão: {DEFAULT_MAX_QUEUE})'
+    )
+    parser.add_argument(
+        '--max-finished', type=int, default=DEFAULT_MAX_FINISHED,
+        help=f'Jobs terminados mantidos com seus arquivos (padrão: {DEFAULT_MAX_FINISHED})'
+    )
+    parser.add_argument('--work-dir', type=Path, default=None, help='Diretório dos arquivos recebidos e resultados')
+    parser.add_argument('--engine', choices=ENGINES, default='pandas', help='Motor de leitura das planilhas')
+    parser.add_argument('--no-cache', action='store_true', help='Não usa o cache de resultados')
+    parser.add_argument('--cache-dir', type=Path, default=None, help='Diretório do cache de resultados')
+    args = parser.parse_args(argv)
+
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
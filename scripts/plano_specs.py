@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Especificações declarativas das planilhas do Plano de Negócios e o extrator
+genérico que as aplica. Cada planilha é descrita por linha de cabeçalho,
+mapa de colunas, tipos e filtros; um layout novo pede só uma nova entrada
+em SHEET_SPECS
+"""
+
+from functools import lru_cache
+
+from plano_layout import LAYOUT_INDEX, normalize_label, year_of
+from plano_records import RecordTable
+from plano_workbook import PlanoWorkbook
+
+MESES = ['Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro']
+
+# Cada especificação tem 'header' (linha do cabeçalho esperada, base 0, usada
+# quando a detecção automática não reconhece o cabeçalho) e um dos tipos:
+#
+# - registros: 'columns' mapeia rótulo da coluna -> (campo, tipo), com tipo
+#   'text' (valor da célula como está; '' se a coluna não existir) ou 'number'
+#   (float; 0 se a coluna não existir). 'key' é a coluna que precisa estar
+#   preenchida, 'exclude' descarta linhas cuja chave contém o texto (ex.:
+#   TOTAL), 'fill' substitui números vazios/inválidos e 'positive' mantém só
+#   as linhas com o campo > 0. 'count' e 'totals' definem o resumo da seção e
+#   'categorical' lista os campos de texto repetidos guardados como categorias
+# - totais por ano: 'years' lista os anos cujas colunas são somadas; a
+#   coluna pode ter o ano como número ou texto
+# - total de colunas: 'sum_columns' lista as colunas somadas em um só total
+#
+# Em todos os tipos, linhas de totalização (primeira célula preenchida
+# começando com 'TOTAL') são descartadas antes de extrair ou somar: o motor
+# stream já as descarta na leitura e o pandas em extract_sheet. Rótulos são comparados sem acentos e sem diferença de
+# maiúsculas
+SHEET_SPECS = {
+    # Todas as planilhas de safra (21-22, 22-23, ...)
+    'safra': {
+        'header': 6,
+        'key': 'CULTURA',
+        'exclude': 'TOTAL',
+        'fill': 0,
+        'categorical': ['cultura', 'ciclo', 'sistema'],
+        'columns': {
+            'CULTURA': ('cultura', 'text'),
+            'CICLO': ('ciclo', 'text'),
+            'SISTEMA': ('sistema', 'text'),
+            'Área Plantada': ('area_plantada', 'number'),
+            'Custo/ha - R$': ('custo_ha', 'number'),
+            'Custo Total': ('custo_total', 'number'),
+            'Produt./ha': ('produtividade_ha', 'number'),
+            'Produção Total': ('producao_total', 'number'),
+            'Preço/unid': ('preco_unitario', 'number'),
+            'Receita Total': ('receita_total', 'number'),
+            'Lucro': ('lucro', 'number'),
+        },
+    },
+    'Bancos': {
+        'section': 'dividas_bancarias',
+        'header': 5,
+        'years': list(range(2025, 2033)),
+    },
+    'Endiv. Imóveis': {
+        'section': 'dividas_imoveis',
+        'header': 6,
+        'years': list(range(2023, 2034)),
+    },
+    'Fornecedores': {
+        'section': 'dividas_fornecedores',
+        'header': 5,
+        'sum_columns': MESES,
+    },
+    'Bens Imóveis': {
+        'section': 'imoveis',
+        'header': 5,
+        'key': 'DENOMINAÇÃO DO IMÓVEL',
+        'positive': 'area_ha',
+        'categorical': ['municipio'],
+        'columns': {
+            'DENOMINAÇÃO DO IMÓVEL': ('nome', 'text'),
+            'MUNICIPIO/UF': ('municipio', 'text'),
+            'ÁREA (HA)': ('area_ha', 'number'),
+            'R$/ha': ('valor_ha', 'number'),
+            'Valor Total': ('valor_total', 'number'),
+        },
+        'count': 'total_propriedades',
+        'totals': {'area_total_ha': 'area_ha', 'valor_total': 'valor_total'},
+    },
+    'Bens Móveis': {
+        'section': 'maquinas',
+        'header': 5,
+        'key': 'DESCRIÇÃO',
+        'positive': 'valor',
+        'categorical': ['marca'],
+        'columns': {
+            'DESCRIÇÃO': ('descricao', 'text'),
+            'ANO': ('ano', 'text'),
+            'MARCA': ('marca', 'text'),
+            'VALOR AQUISIÇÃO': ('valor', 'number'),
+        },
+        'count': 'total_itens',
+        'totals': {'valor_total': 'valor'},
+    },
+    'Arrendamentos': {
+        'section': 'arrendamentos',
+        'header': 5,
+        'key': 'FAZENDA',
+        'positive': 'area_arrendada',
+        'columns': {
+            'FAZENDA': ('fazenda', 'text'),
+            'PROPRIETÁRIO': ('proprietario', 'text'),
+            'ÁREA ARRENDADA': ('area_arrendada', 'number'),
+            'PRAZO': ('prazo', 'text'),
+            'VALOR/ha (SC)': ('valor_ha', 'number'),
+        },
+        'count': 'total_contratos',
+        'totals': {'area_total_arrendada': 'area_arrendada'},
+    },
+}
+
+
+# Planilhas de bens (especificações de registros), na ordem da saída
+PROPERTY_SHEETS = ['Bens Imóveis', 'Bens Móveis', 'Arrendamentos']
+
+
+def spec_fields(spec_name, kind=None):
+    """
+    Campos extraídos por uma especificação de registros, opcionalmente só os
+    de um tipo ('text' ou 'number')
+    """
+    return [
+        field for field, field_kind in SHEET_SPECS[spec_name]['columns'].values()
+        if kind is None or field_kind == kind
+    ]
+
+
+def total_rows(df):
+    """
+    Máscara das linhas de totalização: a primeira célula preenchida da linha
+    é um texto que começa com 'TOTAL' (mesma regra do motor stream)
+
+    Só a primeira célula preenchida de cada linha é examinada, com operações
+    por coluna; textos só com espaços não contam como preenchidos
+    """
+    import numpy as np
+    import pandas as pd
+
+    if df.empty:
+        return pd.Series(False, index=df.index)
+
+    filled = df.notna().to_numpy(copy=True)
+    rows = np.arange(len(df))
+    label = pd.Series(None, index=df.index, dtype=object)
+    while True:
+        has = filled.any(axis=1)
+        first = filled.argmax(axis=1)
+        first_cells = np.full(len(df), None, dtype=object)
+        for position in np.unique(first[has]):
+            selected = rows[has & (first == position)]
+            first_cells[selected] = df.iloc[selected, position].to_numpy(dtype=object)
+        try:
+            # .str devolve NaN para o que não é texto
+            label = pd.Series(first_cells, index=df.index, dtype=object).str.strip()
+        except AttributeError:
+            # Nenhuma primeira célula é texto
+            break
+        blank = rows[label.eq('').to_numpy()]
+        if not len(blank):
+            break
+        filled[blank, first[blank]] = False
+    return label.fillna('').astype(str).str.upper().str.startswith('TOTAL').astype(bool)
+
+
+def _numeric(col):
+    import pandas as pd
+
+    return pd.to_numeric(col, errors='coerce').astype(float)
+
+
+class CompiledSpec:
+    """
+    Especificação resolvida para um cabeçalho concreto: a posição de cada
+    coluna é procurada uma única vez e as conversões são feitas por coluna
+    inteira
+    """
+
+    def __init__(self, spec, columns):
+        self.spec = spec
+
+        if 'years' in spec:
+            self.kind = 'years'
+            positions = {}
+            for i, label in enumerate(columns):
+                if year_of(label) is not None:
+                    positions.setdefault(year_of(label), i)
+            self.columns = [
+                (str(ano), positions[ano]) for ano in spec['years'] if ano in positions
+            ]
+            return
+
+        positions = {}
+        for i, label in enumerate(columns):
+            positions.setdefault(normalize_label(label), i)
+
+        if 'columns' in spec:
+            self.kind = 'records'
+            self.key = positions.get(normalize_label(spec['key']))
+            self.fields = [
+                (field, field_kind, positions.get(normalize_label(label)))
+                for label, (field, field_kind) in spec['columns'].items()
+            ]
+        else:
+            self.kind = 'sum'
+            self.columns = [
+                (label, positions[normalize_label(label)])
+                for label in spec['sum_columns'] if normalize_label(label) in positions
+            ]
+
+    def records(self, df):
+        """
+        Linhas válidas da planilha com os campos já convertidos
+        """
+        import pandas as pd
+
+        if self.key is None:
+            raise KeyError(self.spec['key'])
+
+        key = df.iloc[:, self.key]
+        mask = key.notna()
+        if 'exclude' in self.spec and (key.dtype == object or pd.api.types.is_string_dtype(key.dtype)):
+            mask &= ~key.str.contains(self.spec['exclude'], na=False)
+        rows = df[mask.to_numpy()]
+
+        out = {}
+        for field, field_kind, position in self.fields:
+            if position is None:
+                out[field] = '' if field_kind == 'text' else 0.0
+            elif field_kind == 'number':
+                out[field] = _numeric(rows.iloc[:, position])
+                if 'fill' in self.spec:
+                    out[field] = out[field].fillna(self.spec['fill'])
+            else:
+                out[field] = rows.iloc[:, position]
+        out = pd.DataFrame(out, index=rows.index)
+
+        if 'positive' in self.spec:
+            out = out[out[self.spec['positive']] > 0]
+        return out.reset_index(drop=True)
+
+    def totals(self, df):
+        """
+        Soma de cada coluna de `columns`: {rótulo: total}
+        """
+        import pandas as pd
+
+        if not self.columns:
+            return {}
+        sums = df.iloc[:, [position for _, position in self.columns]].apply(_numeric).sum()
+        return {
+            label: float(total) if pd.notna(total) else 0
+            for (label, _), total in zip(self.columns, sums)
+        }
+
+    def apply(self, df):
+        if self.kind == 'records':
+            return self.records(df)
+        if self.kind == 'years':
+            return self.totals(df)
+        return sum(self.totals(df).values())
+
+
+@lru_cache(maxsize=256)
+def compile_spec(spec_name, columns):
+    """
+    CompiledSpec por especificação e cabeçalho; planilhas com o mesmo
+    cabeçalho (ex.: todas as safras de um lote) reaproveitam a mesma
+    """
+    return CompiledSpec(SHEET_SPECS[spec_name], columns)
+
+
+def extract_sheet(workbook, sheet_name, spec_name=None, layouts=None):
+    """
+    Extrator genérico: aplica a especificação `spec_name` (padrão: o nome da
+    planilha) e retorna um DataFrame de registros, um dict de totais por ano
+    ou um total, conforme o tipo da especificação
+
+    A linha do cabeçalho é detectada e guardada em `layouts` (padrão: o
+    LAYOUT_INDEX do processo). `workbook` pode ser o caminho do arquivo ou um
+    PlanoWorkbook já aberto
+    """
+    spec_name = spec_name or sheet_name
+    spec = SHEET_SPECS[spec_name]
+    layouts = layouts if layouts is not None else LAYOUT_INDEX
+    with PlanoWorkbook.open(workbook, [sheet_name]) as workbook:
+        if sheet_name not in workbook.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        with workbook.profiler.stage('deteccao_cabecalho', sheet_name):
+            header = layouts.header_row(workbook, sheet_name, spec, spec_name)
+        df = workbook.sheet(sheet_name, header=header)
+        if workbook.engine == 'pandas':
+            df = df[~total_rows(df).to_numpy()]
+    compiled = compile_spec(spec_name, tuple(df.columns))
+
+    stage = 'transformacao' if compiled.kind == 'records' else 'agregacao'
+    with workbook.profiler.stage(stage, sheet_name) as record:
+        result = compiled.apply(df)
+        record['linhas'] = len(df)
+    return result
+
+
+def record_table(records, spec_name):
+    """
+    Registros de extract_sheet em colunas (RecordTable), com os campos
+    'categorical' da especificação codificados como categorias
+    """
+    return RecordTable.from_frame(records, SHEET_SPECS[spec_name].get('categorical', ()))
+
+
+def summarize_records(records, spec_name):
+    """
+    Seção de saída de uma especificação de registros: a lista (RecordTable) e
+    o resumo definido em 'count'/'totals'
+    """
+    spec = SHEET_SPECS[spec_name]
+    section = {'lista': record_table(records, spec_name), spec['count']: len(records)}
+    for name, field in spec['totals'].items():
+        section[name] = float(records[field].sum())
+    return section
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Carteira consolidada dos planos de negócios: reúne os dados_extraidos_*.json
+de vários produtores em um único arquivo SQLite indexado por produtor, safra,
+cultura e ano, para consultas da carteira sem reabrir cada JSON
+
+Uso:
+    python plano_store.py ingest saidas/ planos/dados_extraidos_*.json
+    python plano_store.py area-cultura --safra 2025-26
+    python plano_store.py vencimentos --de 2025 --ate 2030
+    python plano_store.py produtores
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from plano_cache import file_sha256
+from plano_safras import normalize_name, safra_ano_inicio
+
+DEFAULT_DB = Path(
+    os.environ.get('PLANO_STORE_DB', Path.home() / '.cache' / 'plano_negocios' / 'carteira.sqlite')
+)
+
+# Incrementar quando o esquema mudar; um banco de versão anterior é recriado
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS planos (
+    id INTEGER PRIMARY KEY,
+    produtor TEXT NOT NULL UNIQUE,
+    arquivo TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    data_extracao TEXT,
+    importado_em TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS producao (
+    plano_id INTEGER NOT NULL REFERENCES planos(id) ON DELETE CASCADE,
+    produtor TEXT NOT NULL,
+    safra TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    cultura TEXT,
+    cultura_key TEXT NOT NULL,
+    ciclo TEXT,
+    sistema TEXT,
+    area_plantada REAL,
+    custo_ha REAL,
+    custo_total REAL,
+    produtividade_ha REAL,
+    producao_total REAL,
+    preco_unitario REAL,
+    receita_total REAL,
+    lucro REAL
+);
+
+CREATE TABLE IF NOT EXISTS dividas (
+    plano_id INTEGER NOT NULL REFERENCES planos(id) ON DELETE CASCADE,
+    produtor TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    ano INTEGER,
+    valor REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS imoveis (
+    plano_id INTEGER NOT NULL REFERENCES planos(id) ON DELETE CASCADE,
+    produtor TEXT NOT NULL,
+    nome TEXT,
+    municipio TEXT,
+    area_ha REAL,
+    valor_ha REAL,
+    valor_total REAL
+);
+
+CREATE TABLE IF NOT EXISTS maquinas (
+    plano_id INTEGER NOT NULL REFERENCES planos(id) ON DELETE CASCADE,
+    produtor TEXT NOT NULL,
+    descricao TEXT,
+    ano TEXT,
+    marca TEXT,
+    valor REAL
+);
+
+CREATE TABLE IF NOT EXISTS arrendamentos (
+    plano_id INTEGER NOT NULL REFERENCES planos(id) ON DELETE CASCADE,
+    produtor TEXT NOT NULL,
+    fazenda TEXT,
+    proprietario TEXT,
+    area_arrendada REAL,
+    prazo TEXT,
+    valor_ha REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_producao_safra_cultura ON producao (safra, cultura_key);
+CREATE INDEX IF NOT EXISTS idx_producao_cultura_ano ON producao (cultura_key, ano);
+CREATE INDEX IF NOT EXISTS idx_producao_produtor_safra ON producao (produtor, safra);
+CREATE INDEX IF NOT EXISTS idx_dividas_ano ON dividas (ano, categoria);
+CREATE INDEX IF NOT EXISTS idx_dividas_produtor_ano ON dividas (produtor, ano);
+CREATE INDEX IF NOT EXISTS idx_imoveis_produtor ON imoveis (produtor);
+CREATE INDEX IF NOT EXISTS idx_maquinas_produtor ON maquinas (produtor);
+CREATE INDEX IF NOT EXISTS idx_arrendamentos_produtor ON arrendamentos (produtor);
+CREATE INDEX IF NOT EXISTS idx_producao_plano ON producao (plano_id);
+CREATE INDEX IF NOT EXISTS idx_dividas_plano ON dividas (plano_id);
+CREATE INDEX IF NOT EXISTS idx_imoveis_plano ON imoveis (plano_id);
+CREATE INDEX IF NOT EXISTS idx_maquinas_plano ON maquinas (plano_id);
+CREATE INDEX IF NOT EXISTS idx_arrendamentos_plano ON arrendamentos (plano_id);
+"""
+
+# Tabelas por plano, na ordem de remoção/inserção
+FACT_TABLES = ('producao', 'dividas', 'imoveis', 'maquinas', 'arrendamentos')
+
+PRODUCTION_COLUMNS = [
+    'safra', 'ano', 'cultura', 'cultura_key', 'ciclo', 'sistema', 'area_plantada', 'custo_ha',
+    'custo_total', 'produtividade_ha', 'producao_total', 'preco_unitario', 'receita_total', 'lucro'
+]
+
+
+def _value(value):
+    """
+    Valor para o SQLite: NaN vira NULL, números numpy viram Python
+    """
+    if value is None or value != value:
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _text(value):
+    value = _value(value)
+    return None if value is None else str(value)
+
+
+def expand_json_paths(patterns):
+    """
+    Arquivos, diretórios (dados_extraidos_*.json) e globs em uma lista
+    ordenada e sem repetições
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(path.glob('dados_extraidos_*.json'))
+        elif any(char in pattern for char in '*?['):
+            candidates = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            key = candidate.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(candidate)
+    return paths
+
+
+def plan_rows(all_data):
+    """
+    Linhas de cada tabela da carteira (sem plano_id/produtor) a partir dos
+    dados extraídos
+    """
+    from plano_columnar import extraction_tables
+
+    tables = extraction_tables(all_data)
+
+    producao = tables['producao']
+    producao['safra'] = producao['safra'].astype(str)
+    rows = {'producao': [
+        (
+            row.safra, safra_ano_inicio(row.safra), _text(row.cultura),
+            normalize_name(_text(row.cultura) or ''), _text(row.ciclo), _text(row.sistema),
+            _value(row.area_plantada), _value(row.custo_ha), _value(row.custo_total),
+            _value(row.produtividade_ha), _value(row.producao_total), _value(row.preco_unitario),
+            _value(row.receita_total), _value(row.lucro)
+        )
+        for row in producao.itertuples(index=False)
+    ]}
+
+    financeiro = tables['financeiro']
+    # Int64 com pd.NA (fornecedores, sem ano) -> None
+    financeiro['ano'] = financeiro['ano'].astype(object).where(financeiro['ano'].notna(), None)
+    rows['dividas'] = [
+        (str(row.categoria), _value(row.ano), _value(row.valor))
+        for row in financeiro.itertuples(index=False)
+    ]
+    rows['imoveis'] = [
+        (_text(row.nome), _text(row.municipio), _value(row.area_ha), _value(row.valor_ha),
+         _value(row.valor_total))
+        for row in tables['imoveis'].itertuples(index=False)
+    ]
+    rows['maquinas'] = [
+        (_text(row.descricao), _text(row.ano), _text(row.marca), _value(row.valor))
+        for row in tables['maquinas'].itertuples(index=False)
+    ]
+    rows['arrendamentos'] = [
+        (_text(row.fazenda), _text(row.proprietario), _value(row.area_arrendada),
+         _text(row.prazo), _value(row.valor_ha))
+        for row in tables['arrendamentos'].itertuples(index=False)
+    ]
+    return rows
+
+
+TABLE_COLUMNS = {
+    'producao': PRODUCTION_COLUMNS,
+    'dividas': ['categoria', 'ano', 'valor'],
+    'imoveis': ['nome', 'municipio', 'area_ha', 'valor_ha', 'valor_total'],
+    'maquinas': ['descricao', 'ano', 'marca', 'valor'],
+    'arrendamentos': ['fazenda', 'proprietario', 'area_arrendada', 'prazo', 'valor_ha'],
+}
+
+
+class PortfolioStore:
+    """
+    Banco SQLite da carteira: um plano (o mais recente) por produtor
+
+    Reimportar o plano de um produtor substitui as linhas anteriores dele;
+    um JSON já importado sem alterações (mesmo SHA-256) é ignorado
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self.conn:
+                for table in FACT_TABLES + ('planos',):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def ingest(self, json_path, produtor=None):
+        """
+        Importa um dados_extraidos_*.json; retorna {tabela: linhas} ou None se
+        o arquivo já estava importado sem alterações
+        """
+        json_path = Path(json_path)
+        sha256 = file_sha256(json_path)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            all_data = json.load(f)
+
+        metadata = all_data.get('metadata', {})
+        produtor = produtor or metadata.get('produtor') or json_path.stem
+        atual = self.conn.execute(
+            "SELECT id, sha256 FROM planos WHERE produtor = ?", (produtor,)
+        ).fetchone()
+        if atual is not None and atual[1] == sha256:
+            return None
+
+        rows = plan_rows(all_data)
+        with self.conn:
+            if atual is not None:
+                # Plano novo do produtor substitui o anterior (cascata nas tabelas)
+                self.conn.execute("DELETE FROM planos WHERE id = ?", (atual[0],))
+            plano_id = self.conn.execute(
+                "INSERT INTO planos (produtor, arquivo, sha256, data_extracao, importado_em) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (produtor, metadata.get('arquivo', json_path.name), sha256,
+                 metadata.get('data_extracao'), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            ).lastrowid
+            for table in FACT_TABLES:
+                columns = ['plano_id', 'produtor'] + TABLE_COLUMNS[table]
+                placeholders = ', '.join('?' * len(columns))
+                self.conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    ((plano_id, produtor, *row) for row in rows[table])
+                )
+        return {table: len(rows[table]) for table in FACT_TABLES}
+
+    def remove(self, produtor):
+        with self.conn:
+            return self.conn.execute("DELETE FROM planos WHERE produtor = ?", (produtor,)).rowcount
+
+    def _query(self, sql, params=()):
+        cur = self.conn.execute(sql, params)
+        columns = [col[0] for col in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def area_by_culture(self, safra=None, cultura=None, produtor=None):
+        """
+        Área plantada, produção, receita e número de produtores por safra e
+        cultura (culturas agrupadas pelo nome normalizado)
+        """
+        where, params = [], []
+        if safra:
+            where.append("safra = ?")
+            params.append(safra)
+        if cultura:
+            where.append("cultura_key = ?")
+            params.append(normalize_name(cultura))
+        if produtor:
+            where.append("produtor = ?")
+            params.append(produtor)
+        return self._query(
+            f"""
+            SELECT safra, MIN(cultura) AS cultura,
+                   SUM(area_plantada) AS area_plantada,
+                   SUM(producao_total) AS producao_total,
+                   SUM(receita_total) AS receita_total,
+                   COUNT(DISTINCT produtor) AS produtores
+            FROM producao
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            GROUP BY safra, cultura_key
+            ORDER BY safra, area_plantada DESC
+            """,
+            params
+        )
+
+    def debt_maturity(self, ano_inicio=None, ano_fim=None, produtor=None):
+        """
+        Parcelas de dívida (bancárias e de imóveis) por ano de vencimento em
+        toda a carteira, com o número de produtores com parcela no ano
+        """
+        where, params = ["ano IS NOT NULL"], []
+        if ano_inicio is not None:
+            where.append("ano >= ?")
+            params.append(ano_inicio)
+        if ano_fim is not None:
+            where.append("ano <= ?")
+            params.append(ano_fim)
+        if produtor:
+            where.append("produtor = ?")
+            params.append(produtor)
+        return self._query(
+            f"""
+            SELECT ano,
+                   SUM(CASE WHEN categoria = 'dividas_bancarias' THEN valor ELSE 0.0 END) AS bancarias,
+                   SUM(CASE WHEN categoria = 'dividas_imoveis' THEN valor ELSE 0.0 END) AS imoveis,
+                   SUM(valor) AS total,
+                   COUNT(DISTINCT produtor) AS produtores
+            FROM dividas
+            WHERE {' AND '.join(where)}
+            GROUP BY ano
+            ORDER BY ano
+            """,
+            params
+        )
+
+    def producers(self):
+        """
+        Resumo por produtor: plano importado, área plantada na safra mais
+        recente, dívida total e patrimônio em imóveis
+        """
+        return self._query(
+            """
+            WITH ultima AS (
+                SELECT produtor, MAX(ano) AS ano FROM producao GROUP BY produtor
+            ),
+            area AS (
+                SELECT pr.produtor, SUM(pr.area_plantada) AS area
+                FROM producao pr JOIN ultima u ON u.produtor = pr.produtor AND u.ano = pr.ano
+                GROUP BY pr.produtor
+            ),
+            divida AS (
+                SELECT produtor, SUM(valor) AS valor FROM dividas GROUP BY produtor
+            ),
+            imovel AS (
+                SELECT produtor, SUM(valor_total) AS valor FROM imoveis GROUP BY produtor
+            )
+            SELECT p.produtor, p.arquivo, p.data_extracao,
+                   area.area AS area_ultima_safra,
+                   divida.valor AS divida_total,
+                   imovel.valor AS valor_imoveis
+            FROM planos p
+            LEFT JOIN area ON area.produtor = p.produtor
+            LEFT JOIN divida ON divida.produtor = p.produtor
+            LEFT JOIN imovel ON imovel.produtor = p.produtor
+            ORDER BY p.produtor
+            """
+        )
+
+
+def print_table(rows):
+    if not rows:
+        print("  (sem resultados)")
+        return
+    columns = list(rows[0])
+    cells = [
+        [f"{v:,.2f}" if isinstance(v, float) else ('-' if v is None else str(v)) for v in row.values()]
+        for row in rows
+    ]
+    widths = [max(len(col), *(len(row[i]) for row in cells)) for i, col in enumerate(columns)]
+    print("  " + "  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    for row in cells:
+        print("  " + "  ".join(
+            cell.rjust(w) if i else cell.ljust(w) for i, (cell, w) in enumerate(zip(row, widths))
+        ))
+
+
+def ingest_command(store, args):
+    paths = expand_json_paths(args.paths)
+    if not paths:
+        print(f"❌ Nenhum arquivo encontrado em: {', '.join(args.paths)}")
+        return 1
+    if args.produtor and len(paths) > 1:
+        print("❌ --produtor só pode ser usado com um único arquivo")
+        return 1
+
+    print("🗂️ CONSOLIDAÇÃO DA CARTEIRA")
+    print("="*80)
+    print(f"Banco: {store.db_path}")
+
+    falhas = 0
+    for path in paths:
+        try:
+            counts = store.ingest(path, args.produtor)
+        except Exception as e:
+            falhas += 1
+            print(f"  ❌ {path.name}: {e}")
+            continue
+        if counts is None:
+            print(f"  ♻️ {path.name}: sem alterações desde a última importação")
+        else:
+            print(f"  ✅ {path.name}: {sum(counts.values())} linhas")
+    return 1 if falhas else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', type=Path, default=None, help=f'Arquivo SQLite da carteira (padrão: {DEFAULT_DB})')
+    parser.add_argument('--json', action='store_true', help='Resultado das consultas em JSON')
+    subparsers = parser.add_subparsers(dest='comando', required=True, metavar='COMANDO')
+
+    ingest = subparsers.add_parser('ingest', help='Importa dados_extraidos_*.json para a carteira')
+    ingest.add_argument('paths', nargs='+', help='Arquivos JSON, diretórios ou globs')
+    ingest.add_argument('--produtor', default=None, help='Nome do produtor (padrão: o do JSON)')
+
+    area = subparsers.add_parser('area-cultura', help='Área plantada por cultura e safra')
+    area.add_argument('--safra', default=None, help="Safra no formato da extração (ex.: 2025-26)")
+    area.add_argument('--cultura', default=None)
+    area.add_argument('--produtor', default=None)
+
+    vencimentos = subparsers.add_parser('vencimentos', help='Parcelas de dívida por ano em toda a carteira')
+    vencimentos.add_argument('--de', type=int, default=None, dest='ano_inicio', help='Primeiro ano')
+    vencimentos.add_argument('--ate', type=int, default=None, dest='ano_fim', help='Último ano')
+    vencimentos.add_argument('--produtor', default=None)
+
+    subparsers.add_parser('produtores', help='Resumo por produtor')
+
+    remove = subparsers.add_parser('remove', help='Remove o plano de um produtor')
+    remove.add_argument('produtor')
+
+    args = parser.parse_args(argv)
+
+    with PortfolioStore(args.db) as store:
+        if args.comando == 'ingest':
+            return ingest_command(store, args)
+        if args.comando == 'remove':
+            removidos = store.remove(args.produtor)
+            print(f"🗑️ {args.produtor}: {'removido' if removidos else 'não encontrado'}")
+            return 0 if removidos else 1
+
+        inicio = time.perf_counter()
+        if args.comando == 'area-cultura':
+            rows = store.area_by_culture(args.safra, args.cultura, args.produtor)
+        elif args.comando == 'vencimentos':
+            rows = store.debt_maturity(args.ano_inicio, args.ano_fim, args.produtor)
+        else:
+            rows = store.producers()
+        tempo = time.perf_counter() - inicio
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print_table(rows)
+        print(f"\n⏱️  {len(rows)} linhas em {tempo * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
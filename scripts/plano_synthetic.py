@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Gera planos de negócios sintéticos com o mesmo layout dos arquivos reais
+(safras com cabeçalho na linha 7, Bancos, Endiv. Imóveis, Fornecedores,
+Bens Imóveis, Bens Móveis e Arrendamentos), para benchmarks e testes sem
+usar planilhas de clientes
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+PRODUCTION_HEADER = [
+    'CULTURA', 'CICLO', 'SISTEMA', 'Área Plantada', 'Custo/ha - R$', 'Custo Total',
+    'Produt./ha', 'Produção Total', 'Preço/unid', 'Receita Total', 'Lucro'
+]
+CULTURAS = ['SOJA', 'MILHO', 'ALGODÃO', 'TRIGO', 'FEIJÃO', 'SORGO']
+CICLOS = ['1ª SAFRA', '2ª SAFRA']
+SISTEMAS = ['SEQUEIRO', 'IRRIGADO']
+MESES = ['Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro']
+MUNICIPIOS = ['SORRISO/MT', 'LUCAS DO RIO VERDE/MT', 'RIO VERDE/GO', 'BALSAS/MA']
+MARCAS = ['JOHN DEERE', 'CASE', 'NEW HOLLAND', 'VALTRA', 'MASSEY FERGUSON']
+BANCOS = ['BANCO DO BRASIL', 'SICREDI', 'BRADESCO', 'ITAÚ', 'SANTANDER']
+
+
+def safra_names(count, first_year=21):
+    """
+    Nomes das planilhas de safra a partir de 21-22 (21-22, 22-23, ...)
+    """
+    return [f"{(first_year + i) % 100:02d}-{(first_year + i + 1) % 100:02d}" for i in range(count)]
+
+
+def _sheet(book, name, header, rows, header_row):
+    """
+    Planilha com título, cabeçalho em `header_row` (base 0) e linhas de dados
+    """
+    ws = book.create_sheet(name)
+    ws.append(['PLANO DE NEGÓCIOS - DADOS SINTÉTICOS'])
+    for _ in range(header_row - 1):
+        ws.append([])
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    return ws
+
+
+def _production_rows(rng, rows):
+    data = []
+    for i in range(rows):
+        area = rng.randint(50, 2000)
+        custo_ha = round(rng.uniform(2500, 6000), 2)
+        produtividade = round(rng.uniform(40, 80), 2)
+        preco = round(rng.uniform(60, 150), 2)
+        receita = area * produtividade * preco
+        data.append([
+            CULTURAS[i % len(CULTURAS)], rng.choice(CICLOS), rng.choice(SISTEMAS),
+            area, custo_ha, area * custo_ha, produtividade, area * produtividade,
+            preco, receita, receita - area * custo_ha
+        ])
+    data.append(['TOTAL'] + [None] * 2 + [sum(r[3] for r in data)] + [None] * 7)
+    return data
+
+
+def generate_workbook(path, safras=9, rows=10, seed=0):
+    """
+    Grava um plano sintético em `path` com `safras` planilhas de safra e
+    `rows` linhas de dados em cada planilha
+
+    O conteúdo é determinístico para o mesmo `seed`
+    """
+    import openpyxl
+
+    rng = random.Random(seed)
+    book = openpyxl.Workbook(write_only=True)
+
+    for safra in safra_names(safras):
+        _sheet(book, safra, PRODUCTION_HEADER, _production_rows(rng, rows), header_row=6)
+
+    anos_bancos = [str(ano) for ano in range(2025, 2033)]
+    _sheet(book, 'Bancos', ['BANCO', 'MODALIDADE'] + anos_bancos, [
+        [f"{rng.choice(BANCOS)} {i + 1}", rng.choice(['CUSTEIO', 'INVESTIMENTO'])]
+        + [rng.randint(0, 2_000_000) for _ in anos_bancos]
+        for i in range(rows)
+    ], header_row=5)
+
+    anos_imoveis = [str(ano) for ano in range(2023, 2034)]
+    _sheet(book, 'Endiv. Imóveis', ['IMÓVEL'] + anos_imoveis, [
+        [f"FAZENDA {i + 1}"] + [rng.randint(0, 1_000_000) for _ in anos_imoveis]
+        for i in range(rows)
+    ], header_row=6)
+
+    _sheet(book, 'Fornecedores', ['FORNECEDOR'] + MESES, [
+        [f"FORNECEDOR {i + 1}"] + [rng.randint(0, 300_000) for _ in MESES]
+        for i in range(rows)
+    ], header_row=5)
+
+    imoveis = []
+    for i in range(rows):
+        area = rng.randint(10, 3000)
+        valor_ha = rng.randint(10_000, 60_000)
+        imoveis.append([f"FAZENDA {i + 1}", rng.choice(MUNICIPIOS), area, valor_ha, area * valor_ha])
+    _sheet(book, 'Bens Imóveis',
+           ['DENOMINAÇÃO DO IMÓVEL', 'MUNICIPIO/UF', 'ÁREA (HA)', 'R$/ha', 'Valor Total'],
+           imoveis, header_row=5)
+
+    _sheet(book, 'Bens Móveis', ['DESCRIÇÃO', 'ANO', 'MARCA', 'VALOR AQUISIÇÃO'], [
+        [f"TRATOR {i + 1}", rng.randint(2005, 2025), rng.choice(MARCAS), rng.randint(50_000, 2_000_000)]
+        for i in range(rows)
+    ], header_row=5)
+
+    _sheet(book, 'Arrendamentos',
+           ['FAZENDA', 'PROPRIETÁRIO', 'ÁREA ARRENDADA', 'PRAZO', 'VALOR/ha (SC)'], [
+               [f"FAZENDA ARRENDADA {i + 1}", f"PROPRIETÁRIO {i + 1}", rng.randint(50, 1500),
+                str(rng.randint(2026, 2035)), rng.randint(5, 15)]
+               for i in range(rows)
+           ], header_row=5)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    book.save(path)
+    return path
+
+
+def generate_workbooks(output_dir, files=1, safras=9, rows=10, seed=0):
+    """
+    Gera `files` planos sintéticos em `output_dir`, cada um com seed própria
+
+    Retorna a lista de caminhos gerados
+    """
+    output_dir = Path(output_dir)
+    return [
+        generate_workbook(
+            output_dir / f"plano_sintetico_s{safras}_r{rows}_{i + 1:03d}.xlsx",
+            safras=safras, rows=rows, seed=seed + i
+        )
+        for i in range(files)
+    ]
+
+
+def add_generator_arguments(parser):
+    """
+    Parâmetros do gerador, comuns a este script e ao benchmark
+    """
+    parser.add_argument('--safras', type=int, default=9, help='Planilhas de safra por arquivo (padrão: 9)')
+    parser.add_argument('--rows', type=int, default=10, help='Linhas de dados por planilha (padrão: 10)')
+    parser.add_argument('--files', type=int, default=1, help='Quantidade de arquivos (padrão: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Semente dos dados aleatórios (padrão: 0)')
+    return parser
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output_dir', type=Path, help='Diretório dos arquivos gerados')
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    paths = generate_workbooks(args.output_dir, args.files, args.safras, args.rows, args.seed)
+    for path in paths:
+        print(f"📄 {path}")
+    print(f"\n✅ {len(paths)} planos sintéticos gerados em: {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Sessão de leitura do Plano de Negócios: abre o arquivo Excel uma única vez e
+entrega as planilhas já carregadas para todos os extratores
+"""
+
+import contextlib
+import math
+from itertools import islice
+from pathlib import Path
+
+from plano_profile import NULL_PROFILER
+
+# Motores de leitura: 'pandas' lê as planilhas inteiras; 'stream' percorre as
+# linhas com openpyxl em modo somente leitura, descartando linhas vazias/TOTAL
+ENGINES = ('pandas', 'stream')
+
+# Linhas vazias seguidas que encerram a leitura de uma planilha no modo stream
+# (planilhas com milhares de linhas formatadas, mas sem dados)
+MAX_BLANK_ROWS = 200
+
+
+def promote_header(raw, header_row):
+    """
+    Converte as células brutas de uma planilha em DataFrame com a linha
+    `header_row` como cabeçalho (ou sem cabeçalho, se None), reproduzindo em
+    memória o resultado de pd.read_excel(..., header=header_row)
+    """
+    import pandas as pd
+    from pandas.errors import EmptyDataError
+    from pandas.io.parsers import TextParser
+
+    rows = raw.iloc[header_row:] if header_row is not None else raw
+    # Células vazias voltam a ser '' como o leitor do pandas as entrega ao parser
+    rows = rows.astype(object).where(rows.notna(), '').values.tolist()
+    # skip_blank_lines=False como no read_excel (GH 39808): linhas vazias no meio
+    # de planilhas de uma coluna são mantidas
+    try:
+        parser = TextParser(rows, header=0 if header_row is not None else None, skip_blank_lines=False)
+        return parser.read()
+    except EmptyDataError:
+        # Planilha vazia: DataFrame vazio, como no read_excel
+        return pd.DataFrame()
+
+
+def _convert_cell(cell):
+    """
+    Valor da célula como o leitor openpyxl do pandas entrega ao parser
+    """
+    value = cell.value
+    if value is None:
+        return None
+    if cell.data_type == 'e':
+        return math.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _is_blank(row):
+    return all(v is None or (isinstance(v, str) and not v.strip()) for v in row)
+
+
+def _is_total(row):
+    """
+    Linha de totalização: a primeira célula preenchida começa com 'TOTAL'
+    """
+    first = next((v for v in row if v is not None and str(v).strip()), None)
+    return isinstance(first, str) and first.strip().upper().startswith('TOTAL')
+
+
+def iter_sheet_rows(worksheet):
+    """
+    Linhas da planilha como tuplas de valores, sem carregar a planilha inteira
+    """
+    for row in worksheet.iter_rows():
+        yield tuple(_convert_cell(cell) for cell in row)
+
+
+def until_blank_run(rows, limit=MAX_BLANK_ROWS):
+    """
+    Repassa as linhas até encontrar `limit` linhas vazias seguidas; as linhas
+    vazias só são repassadas quando alguma linha com dados vem depois delas
+    """
+    pending = []
+    for row in rows:
+        if _is_blank(row):
+            pending.append(row)
+            if len(pending) >= limit:
+                return
+            continue
+        yield from pending
+        pending.clear()
+        yield row
+
+
+def data_rows(rows):
+    """
+    Descarta linhas vazias e linhas de TOTAL
+    """
+    for row in rows:
+        if not _is_blank(row) and not _is_total(row):
+            yield row
+
+
+def _rows_to_grid(rows):
+    """
+    Iguala a largura das linhas (o modo somente leitura corta células vazias
+    no fim da linha) e troca vazios por '' como espera o parser
+    """
+    rows = list(rows)
+    width = max((len(row) for row in rows), default=0)
+    # Cortar colunas vazias à direita, como o leitor do pandas
+    while width and all(len(row) < width or row[width - 1] is None for row in rows):
+        width -= 1
+    return [
+        ['' if v is None else v for v in row[:width]] + [''] * (width - len(row[:width]))
+        for row in rows
+    ]
+
+
+class PlanoWorkbook:
+    """
+    Mantém o arquivo aberto e um cache das células brutas de cada planilha
+    (sem conversão de tipos); cada planilha é lida do disco no máximo uma vez
+
+    Com engine='stream', as planilhas são lidas sob demanda com openpyxl em
+    modo somente leitura: a leitura para após MAX_BLANK_ROWS linhas vazias
+    seguidas e, abaixo do cabeçalho, linhas vazias e de TOTAL são descartadas
+    durante a leitura, limitando a memória ao que a planilha tem de dados
+
+    `profiler` (StageProfiler) mede a abertura, a leitura de cada planilha e a
+    promoção do cabeçalho; os extratores usam o mesmo perfilador via
+    workbook.profiler
+    """
+
+    def __init__(self, file_path, sheet_names=None, engine='pandas', profiler=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de leitura desconhecido: {engine}")
+
+        self.file_path = Path(file_path)
+        self.engine = engine
+        self.profiler = profiler or NULL_PROFILER
+        self._raw = {}
+        self._frames = {}
+
+        # pandas/openpyxl só são importados ao abrir um arquivo, para que os
+        # scripts iniciem rápido quando o resultado vem do cache
+        with self.profiler.stage('abertura', self.file_path.name):
+            if engine == 'stream':
+                import openpyxl
+                self._excel = None
+                self._book = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            else:
+                import pandas as pd
+                self._excel = pd.ExcelFile(self.file_path)
+                self._book = None
+
+        if sheet_names:
+            self.load(sheet_names)
+
+    @classmethod
+    def open(cls, source, sheet_names=None, engine='pandas', profiler=None):
+        """
+        Sessão para usar com `with`: se `source` já for uma sessão aberta, ela
+        é usada e continua aberta na saída do bloco (pertence a quem a abriu);
+        senão o arquivo é aberto e fechado na saída do bloco
+        """
+        if isinstance(source, cls):
+            if sheet_names:
+                source.load(sheet_names)
+            return contextlib.nullcontext(source)
+        return cls(source, sheet_names, engine, profiler)
+
+    @property
+    def sheet_names(self):
+        if self._book is not None:
+            return self._book.sheetnames
+        return self._excel.sheet_names
+
+    def load(self, sheet_names):
+        """
+        Lê todas as planilhas pedidas que ainda não estão em cache, com o
+        arquivo já aberto
+
+        No modo stream as planilhas são lidas sob demanda em sheet()/raw()
+        """
+        if self._book is not None:
+            return
+        pending = [
+            name for name in sheet_names
+            if name in self.sheet_names and name not in self._raw
+        ]
+        for name in pending:
+            with self.profiler.stage('leitura_planilha', name) as record:
+                self._raw[name] = self._excel.parse(sheet_name=name, header=None, dtype=object)
+                record['linhas'] = len(self._raw[name])
+
+    def _worksheet(self, sheet_name):
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return self._book[sheet_name]
+
+    def raw(self, sheet_name):
+        """
+        Células brutas da planilha, sem cabeçalho nem conversão de tipos
+        """
+        import pandas as pd
+
+        if sheet_name not in self._raw:
+            if self._book is not None:
+                with self.profiler.stage('leitura_planilha', sheet_name) as record:
+                    rows = until_blank_run(iter_sheet_rows(self._worksheet(sheet_name)))
+                    self._raw[sheet_name] = pd.DataFrame(_rows_to_grid(rows), dtype=object).replace('', None)
+                    record['linhas'] = len(self._raw[sheet_name])
+            else:
+                if sheet_name not in self.sheet_names:
+                    raise ValueError(f"Worksheet named '{sheet_name}' not found")
+                self.load([sheet_name])
+        return self._raw[sheet_name]
+
+    def head(self, sheet_name, rows):
+        """
+        Primeiras `rows` linhas brutas da planilha como tuplas (vazios como
+        None); no modo stream lê só essas linhas
+        """
+        import pandas as pd
+
+        if self._book is not None and sheet_name not in self._raw:
+            return list(islice(iter_sheet_rows(self._worksheet(sheet_name)), rows))
+        top = self.raw(sheet_name).head(rows)
+        return [
+            tuple(None if pd.isna(v) else v for v in row)
+            for row in top.itertuples(index=False, name=None)
+        ]
+
+    def _stream_sheet(self, sheet_name, header):
+        """
+        Lê a planilha em fluxo: linhas até o cabeçalho e, depois dele, só
+        linhas com dados
+        """
+        import pandas as pd
+        from pandas.errors import EmptyDataError
+        from pandas.io.parsers import TextParser
+
+        rows = until_blank_run(iter_sheet_rows(self._worksheet(sheet_name)))
+        head = list(islice(rows, header + 1))
+        if len(head) <= header:
+            raise ValueError(f"Planilha '{sheet_name}' tem menos de {header + 1} linhas")
+        grid = _rows_to_grid([head[header], *data_rows(rows)])
+        try:
+            return TextParser(grid, header=0, skip_blank_lines=False).read()
+        except EmptyDataError:
+            return pd.DataFrame()
+
+    def sheet(self, sheet_name, header=None):
+        """
+        Planilha com a linha `header` promovida a cabeçalho, equivalente a
+        pd.read_excel(file_path, sheet_name=sheet_name, header=header)
+        """
+        key = (sheet_name, header)
+        if key not in self._frames:
+            if self._book is not None and header is not None and sheet_name not in self._raw:
+                # Leitura e cabeçalho acontecem juntos no fluxo
+                with self.profiler.stage('leitura_planilha', sheet_name) as record:
+                    self._frames[key] = self._stream_sheet(sheet_name, header)
+                    record['linhas'] = len(self._frames[key])
+            else:
+                raw = self.raw(sheet_name)
+                with self.profiler.stage('cabecalho', sheet_name) as record:
+                    self._frames[key] = promote_header(raw, header)
+                    record['linhas'] = len(self._frames[key])
+        # Cópia para que um extrator não altere o cache usado pelos demais
+        return self._frames[key].copy()
+
+    def release(self, sheet_name):
+        """
+        Descarta as células e DataFrames já lidos da planilha
+        """
+        self._raw.pop(sheet_name, None)
+        for key in [key for key in self._frames if key[0] == sheet_name]:
+            del self._frames[key]
+
+    def close(self):
+        if self._book is not None:
+            self._book.close()
+        else:
+            self._excel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Leitura direta do pacote .xlsx (zip), sem pandas/openpyxl: nomes das
+planilhas e impressão digital (hash) do conteúdo de cada uma
+"""
+
+import hashlib
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+DEFAULT_WORKBOOK_PART = 'xl/workbook.xml'
+
+# Forma canônica do XML da planilha (ver sheet_fingerprints): só sheetData,
+# sem as tags de linha, as células sem conteúdo, o estilo das células, o
+# tipo numérico explícito e o xml:space dos textos. Padrões separados e
+# começando por texto fixo (namespace padrão, como o Excel e o openpyxl
+# gravam), bem mais rápidos que uma única alternância em planilhas grandes
+SHEET_DATA = re.compile(rb'<(?:\w+:)?sheetData\b[^>]*>(.*)</(?:\w+:)?sheetData>', re.S)
+NOT_CONTENT = [
+    re.compile(rb'<row [^>]*>|</row>'),
+    re.compile(rb'<c [^>]*?(?:/>|>\s*</c>)'),
+    re.compile(rb' s="\d+"'),
+]
+NOT_CONTENT_TEXT = [b' t="n"', b' xml:space="preserve"']
+# Células de texto compartilhado: <c ... t="s"><v>índice</v></c>
+SHARED_STRING_CELL = re.compile(rb'(<c [^>]*? t=")s("[^>]*>)<v>(\d+)</v>')
+
+
+def _rels_part(part):
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', f"{name}.rels")
+
+
+def _resolve_target(source_part, target):
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _relationships(archive, part):
+    """
+    Relacionamentos de uma parte do pacote: Id -> (Type, caminho no zip)
+    """
+    try:
+        root = ET.fromstring(archive.read(_rels_part(part)))
+    except KeyError:
+        return {}
+    return {
+        rel.get('Id'): (rel.get('Type', ''), _resolve_target(part, rel.get('Target', '')))
+        for rel in root.iter(f'{{{NS_PKG_REL}}}Relationship')
+    }
+
+
+def _workbook_part(archive):
+    for rel_type, target in _relationships(archive, '').values():
+        if rel_type.endswith('/officeDocument'):
+            return target
+    return DEFAULT_WORKBOOK_PART
+
+
+def sheet_parts(archive):
+    """
+    Planilhas do arquivo na ordem das abas: nome -> caminho do XML no zip
+    (ex.: 'Bancos' -> 'xl/worksheets/sheet10.xml')
+    """
+    workbook_part = _workbook_part(archive)
+    rels = _relationships(archive, workbook_part)
+    root = ET.fromstring(archive.read(workbook_part))
+
+    parts = {}
+    for sheet in root.iter(f'{{{NS_MAIN}}}sheet'):
+        rel = rels.get(sheet.get(f'{{{NS_REL}}}id'))
+        if rel is not None:
+            parts[sheet.get('name')] = rel[1]
+    return parts
+
+
+def sheet_names(file_path):
+    """
+    Nomes das planilhas lendo apenas workbook.xml e seus relacionamentos
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        return list(sheet_parts(archive))
+
+
+def _shared_strings(archive, workbook_part):
+    """
+    Textos compartilhados (sharedStrings.xml) na ordem dos índices
+    """
+    for rel_type, target in _relationships(archive, workbook_part).values():
+        if rel_type.endswith('/sharedStrings'):
+            try:
+                root = ET.fromstring(archive.read(target))
+            except KeyError:
+                return []
+            return [
+                ''.join(t.text or '' for t in si.iter(f'{{{NS_MAIN}}}t'))
+                for si in root.iter(f'{{{NS_MAIN}}}si')
+            ]
+    return []
+
+
+def sheet_fingerprints(file_path):
+    """
+    Hash SHA-256 do conteúdo de cada planilha: nome -> hash
+
+    O hash é do XML das células em forma canônica, com os textos
+    compartilhados gravados na própria célula (<is><t>texto</t></is>, como
+    o openpyxl grava): ao salvar, o Excel e o openpyxl renumeram
+    sharedStrings.xml e reescrevem estilos, linhas e atributos da planilha,
+    o que não muda o conteúdo. Planilhas com o mesmo hash têm as mesmas
+    células (posição, fórmula e valor)
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        workbook_part = _workbook_part(archive)
+        parts = sheet_parts(archive)
+        inline = None
+
+        def shared(match):
+            nonlocal inline
+            if inline is None:
+                inline = [
+                    b'<is><t>' + escape(text).encode('utf-8') + b'</t></is>'
+                    for text in _shared_strings(archive, workbook_part)
+                ]
+            i = int(match.group(3))
+            text = inline[i] if i < len(inline) else b'<is><t></t></is>'
+            return match.group(1) + b'inlineStr' + match.group(2) + text
+
+        fingerprints = {}
+        for name, part in parts.items():
+            sheet_data = SHEET_DATA.search(archive.read(part))
+            data = sheet_data.group(1) if sheet_data else b''
+            for pattern in NOT_CONTENT:
+                data = pattern.sub(b'', data)
+            for text in NOT_CONTENT_TEXT:
+                data = data.replace(text, b'')
+            if b' t="s"' in data:
+                data = SHARED_STRING_CELL.sub(shared, data)
+            fingerprints[name] = hashlib.sha256(data).hexdigest()
+        return fingerprints
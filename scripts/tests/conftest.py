@@ -0,0 +1,86 @@
+"""
+Testes dos scripts do Plano de Negócios: os módulos ficam em scripts/ e são
+importados pelo nome, como os próprios scripts fazem
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """
+    Grava um .xlsx com as planilhas {nome: [linhas]} e devolve o caminho
+    """
+    openpyxl = pytest.importorskip("openpyxl")
+
+    def make(sheets, name="plano.xlsx"):
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        for sheet_name, rows in sheets.items():
+            ws = wb.create_sheet(sheet_name)
+            for row in rows:
+                ws.append(row)
+        path = tmp_path / name
+        wb.save(path)
+        return path
+
+    return make
+
+
+def plan_sheets(safras=("21-22", "22-23"), fator=1):
+    """
+    Planilhas de um plano pequeno no layout dos arquivos reais (o de
+    plano_synthetic); `fator` multiplica os valores para gerar versões
+    diferentes do mesmo plano
+    """
+    def sheet(header_row, header, rows):
+        return [["PLANO DE NEGÓCIOS"]] + [[None]] * (header_row - 1) + [header] + rows
+
+    producao = [
+        "CULTURA", "CICLO", "SISTEMA", "Área Plantada", "Custo/ha - R$", "Custo Total",
+        "Produt./ha", "Produção Total", "Preço/unid", "Receita Total", "Lucro",
+    ]
+    sheets = {
+        safra: sheet(6, producao, [
+            ["SOJA", "1ª SAFRA", "SEQUEIRO", 100 * fator, 4000, 400000 * fator, 60 + i,
+             (60 + i) * 100 * fator, 120, (60 + i) * 12000 * fator, (20 + i) * 12000 * fator],
+            ["MILHO", "2ª SAFRA", "SEQUEIRO", 50 * fator, 3000, 150000 * fator, 100,
+             5000 * fator, 50, 250000 * fator, 100000 * fator],
+            ["TOTAL", None, None, 150 * fator] + [None] * 7,
+        ])
+        for i, safra in enumerate(safras)
+    }
+    sheets.update({
+        "Bancos": sheet(5, ["BANCO", "MODALIDADE", "2025", "2026"], [
+            ["BANCO A", "CUSTEIO", 1000 * fator, 2000],
+            ["BANCO B", "INVESTIMENTO", 500, 500],
+        ]),
+        "Endiv. Imóveis": sheet(6, ["IMÓVEL", "2025", "2026"], [["FAZENDA A", 300 * fator, 300]]),
+        "Fornecedores": sheet(5, ["FORNECEDOR", "Março", "Abril"], [["FORNECEDOR A", 100 * fator, 50]]),
+        "Bens Imóveis": sheet(5, ["DENOMINAÇÃO DO IMÓVEL", "MUNICIPIO/UF", "ÁREA (HA)", "R$/ha", "Valor Total"], [
+            ["FAZENDA A", "SORRISO/MT", 500 * fator, 20000, 10000000 * fator],
+        ]),
+        "Bens Móveis": sheet(5, ["DESCRIÇÃO", "ANO", "MARCA", "VALOR AQUISIÇÃO"], [
+            ["TRATOR", 2020, "JOHN DEERE", 500000 * fator],
+        ]),
+        "Arrendamentos": sheet(5, ["FAZENDA", "PROPRIETÁRIO", "ÁREA ARRENDADA", "PRAZO", "VALOR/ha (SC)"], [
+            ["FAZENDA B", "JOÃO", 50 * fator, "2030", 10],
+        ]),
+    })
+    return sheets
+
+
+@pytest.fixture
+def make_plan(make_workbook):
+    """
+    Grava um plano pequeno (plan_sheets) e devolve o caminho
+    """
+    def make(name="plano.xlsx", **kwargs):
+        return make_workbook(plan_sheets(**kwargs), name=name)
+
+    return make
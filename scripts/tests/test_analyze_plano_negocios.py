@@ -0,0 +1,155 @@
+from datetime import date, datetime
+
+import pandas as pd
+
+from analyze_plano_negocios import (
+    analyze_excel_file, analyze_sheets, column_statistics, column_type_counts, detect_header_row,
+    text_cells
+)
+from plano_workbook import PlanoWorkbook
+
+
+def baseline_header_row(df):
+    # Detecção original, linha a linha com isinstance em cada célula
+    for idx in range(min(10, len(df))):
+        row = df.iloc[idx]
+        if row.notna().sum() >= 3:
+            if row.apply(lambda x: isinstance(x, str) if pd.notna(x) else False).sum() >= 2:
+                return idx
+    return None
+
+
+def test_detect_header_row_numeric_top_rows():
+    # Inteiros misturados com None numa coluna de objetos
+    df = pd.DataFrame([[1, None, 3], [4, 5, None], [7, 8, 9]], dtype=object)
+    assert detect_header_row(df) is None
+
+
+def test_detect_header_row_title_then_numbers():
+    df = pd.DataFrame([["Título", None, None], ["Safra", "Cultura", 1], [1, 2, 3]], dtype=object)
+    assert detect_header_row(df) == 1
+
+
+def test_analyze_sheet_with_numeric_first_rows(make_workbook, tmp_path):
+    path = make_workbook({
+        "Números": [[1, 2, 3], [4, None, 6], [7, 8, 9]],
+        "Dados": [["Nome", "Área", "Valor"], ["A", 10, 100.5]],
+    })
+
+    dados = analyze_excel_file(path, output_dir=tmp_path)
+
+    assert dados is not None
+    assert dados["planilhas"]["Números"]["linha_cabecalho"] is None
+    assert dados["planilhas"]["Números"]["dimensoes"] == {"linhas": 3, "colunas": 3}
+    assert dados["planilhas"]["Dados"]["linha_cabecalho"] == 0
+
+
+def test_analyze_workbook_with_empty_sheet(make_workbook, tmp_path):
+    path = make_workbook({
+        "Vazia": [],
+        "Dados": [["Nome", "Área", "Valor"], ["A", 10, 100.5]],
+    })
+
+    for engine in ("pandas", "stream"):
+        dados = analyze_excel_file(path, output_dir=tmp_path, engine=engine)
+
+        assert dados is not None
+        assert dados["planilhas"]["Vazia"]["dimensoes"] == {"linhas": 0, "colunas": 0}
+        assert dados["planilhas"]["Dados"]["dimensoes"] == {"linhas": 1, "colunas": 3}
+
+
+def test_text_cells_matches_isinstance():
+    columns = [
+        pd.Series(["a", 1, None, 2.5], dtype=object),
+        pd.Series([1, None], dtype=object),
+        pd.Series([pd.Timestamp("2025-01-01"), 1.5], dtype=object),
+        pd.Series([None, None], dtype=object),
+        pd.Series(["a", None]),
+        pd.Series([1.0, 2.0]),
+    ]
+    for col in columns:
+        assert text_cells(col).tolist() == [isinstance(v, str) for v in col]
+
+
+def test_detect_header_row_matches_double_read(make_workbook):
+    sheets = {
+        "Título": [["Plano de Negócios"], [None], ["Banco", 2025, 2026, "Obs"], ["A", 1, 2, None]],
+        "Números": [[1, 2, 3], [4, None, 6]],
+        "Misturada": [[1, "x", None, 2], ["Cultura", "Área", 3, None], ["Nome", "Área", "Valor"], ["S", 1, 2]],
+        "Datas": [[pd.Timestamp("2025-01-01"), 1.5, 2], ["Mês", "Valor", "Nota"], ["Jan", 1, "ok"]],
+        "Vazia": [],
+    }
+    path = make_workbook(sheets)
+
+    for engine in ("pandas", "stream"):
+        with PlanoWorkbook(path, engine=engine) as workbook:
+            for sheet_name in sheets:
+                esperado = baseline_header_row(pd.read_excel(path, sheet_name=sheet_name, header=None))
+                assert detect_header_row(workbook.sheet(sheet_name, header=None)) == esperado, sheet_name
+
+
+def test_column_type_counts_matches_apply_type():
+    columns = [
+        pd.Series(["a", "12", 1, 2.0, float("nan"), None, True, datetime(2025, 1, 1), -3, 1e20, 10**20, "b"], dtype=object),
+        pd.Series([1, 2.5, None, 3], dtype=object),
+        pd.Series([None, float("nan"), None], dtype=object),
+        pd.Series([date(2025, 1, 1), None], dtype=object),
+        pd.Series(["x", None, "y"]),
+        pd.Series([1.5, None]),
+        pd.Series([1, 2]),
+        pd.Series(pd.to_datetime(["2025-01-01", None])),
+        pd.Series([], dtype=object),
+    ]
+    for col in columns:
+        nulos = col.isna()
+        esperado = {tipo.__name__: qtd for tipo, qtd in col.apply(type).value_counts().items()}
+        contagens = column_type_counts(col, int(nulos.sum()), int(nulos.to_numpy().argmax()) if len(col) else 0)
+        assert contagens == esperado
+        if esperado:
+            assert max(contagens, key=contagens.get) == max(esperado, key=esperado.get)
+
+
+def test_column_statistics_matches_column_by_column():
+    df = pd.DataFrame({
+        "texto": ["a", None, "b", "c"],
+        "area": [1.5, None, 2.5, 10.0],
+        "qtd": [1, 2, 3, 4],
+        "vazia": [None, None, None, None],
+        "misturada": [1, "x", 2.0, None],
+    }).astype({"vazia": "float64"})
+
+    tipos_dados, valores_numericos = column_statistics(df)
+
+    assert tipos_dados == {
+        str(col): df[col].apply(type).value_counts().index[0].__name__ for col in df.columns
+    }
+    esperado = {}
+    for col in df.columns:
+        if df[col].dtype in ["float64", "int64"]:
+            validos = df[col].dropna()
+            if len(validos) > 0:
+                esperado[str(col)] = {
+                    "min": float(validos.min()), "max": float(validos.max()),
+                    "media": float(validos.mean()), "soma": float(validos.sum()),
+                    "qtd_valores": len(validos),
+                }
+    assert valores_numericos == esperado
+    assert "vazia" not in valores_numericos
+
+
+def test_parallel_analysis_matches_sequential(make_workbook):
+    sheets = {
+        f"Planilha {i}": [["Título"], ["Nome", "Área", "Valor"]] + [[f"Item {j}", j * i, j + 0.5] for j in range(20)]
+        for i in range(6)
+    }
+    sheets["Vazia"] = []
+    path = make_workbook(sheets)
+
+    for engine in ("pandas", "stream"):
+        with PlanoWorkbook(path, engine=engine) as workbook:
+            sequencial = list(analyze_sheets(workbook, sheet_workers=1))
+        with PlanoWorkbook(path, engine=engine) as workbook:
+            paralelo = list(analyze_sheets(workbook, sheet_workers=3))
+
+        assert [nome for nome, _, _ in paralelo] == list(sheets)
+        assert paralelo == sequencial
@@ -0,0 +1,59 @@
+import unicodedata
+
+import pytest
+
+from extract_plano_negocios_data import producer_name
+
+
+@pytest.mark.parametrize("form", ["NFC", "NFD"])
+def test_producer_name_with_accented_filename(form):
+    nome = unicodedata.normalize(form, "PLANO DE NEGÓCIOS JOÃO SILVA _2025.xlsx")
+    assert producer_name(nome) == "JOÃO SILVA"
+
+
+def test_producer_name_falls_back_to_stem():
+    assert producer_name("/tmp/planilha.xlsx") == "planilha"
+
+
+HEADER = [
+    "CULTURA", "CICLO", "SISTEMA", "Área Plantada", "Custo/ha - R$", "Custo Total",
+    "Produt./ha", "Produção Total", "Preço/unid", "Receita Total", "Lucro",
+]
+
+
+def safra_sheet(*rows):
+    return [["PLANO DE NEGÓCIOS"]] + [[None]] * 5 + [HEADER] + list(rows)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "stream"])
+def test_production_data_by_safra(make_workbook, engine):
+    from extract_plano_negocios_data import extract_production_data
+    from plano_workbook import PlanoWorkbook
+
+    path = make_workbook({
+        "21-22": safra_sheet(
+            ["SOJA", "1ª SAFRA", "SEQUEIRO", 100, 4000, 400000, 60, 6000, 120, 720000, 320000],
+            [None, None, None, None, None, None, None, None, None, None, None],
+            ["MILHO", "2ª SAFRA", None, "50", None, 150000, 100, 5000, 50, 250000, 100000],
+            [None, "linha sem cultura", None, 999, None, None, None, None, None, None, None],
+            ["TOTAL", None, None, 150, None, 550000, None, 11000, None, 970000, 420000],
+        ),
+        # Safra só com cabeçalho continua no resultado, zerada
+        "22-23": safra_sheet(),
+    })
+
+    with PlanoWorkbook(path, engine=engine) as workbook:
+        producao = extract_production_data(workbook)
+
+    assert list(producao) == ["2021-22", "2022-23"]
+    safra = producao["2021-22"]
+    culturas = list(safra["culturas"])
+    assert [c["cultura"] for c in culturas] == ["SOJA", "MILHO"]
+    assert culturas[1]["area_plantada"] == 50.0
+    assert culturas[1]["custo_ha"] == 0.0
+    assert {k: v for k, v in safra.items() if k != "culturas"} == {
+        "area_total": 150.0, "custo_total": 550000.0, "producao_total": 11000.0,
+        "receita_total": 970000.0, "lucro_total": 420000.0,
+    }
+    assert len(producao["2022-23"]["culturas"]) == 0
+    assert producao["2022-23"]["area_total"] == 0.0
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from plano_cache import ExtractionCache
+
+
+def test_key_follows_content_kind_and_version(make_workbook, tmp_path):
+    cache = ExtractionCache(tmp_path / "cache")
+    path = make_workbook({"Bancos": [["Banco", 2025], ["Banco A", 10]]})
+    copia = tmp_path / "copia.xlsx"
+    copia.write_bytes(path.read_bytes())
+
+    key = cache.key(path, "extracao", 5)
+
+    assert key.startswith("extracao-v5-")
+    assert cache.key(copia, "extracao", 5) == key
+    assert cache.key(path, "extracao", 6) != key
+    assert cache.key(path, "analise", 5) != key
+
+    outro = make_workbook({"Bancos": [["Banco", 2025], ["Banco A", 20]]}, name="outro.xlsx")
+    assert cache.key(outro, "extracao", 5) != key
+
+
+def test_put_is_atomic_and_get_returns_the_data(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache")
+
+    assert cache.get("extracao-v1-abc") is None
+    cache.put("extracao-v1-abc", {"producao": {"2024-25": 1.5}, "nome": "Fazenda ç"})
+
+    assert cache.get("extracao-v1-abc") == {"producao": {"2024-25": 1.5}, "nome": "Fazenda ç"}
+    # Sem arquivos temporários deixados para trás
+    assert [entry.name for entry in cache.cache_dir.iterdir()] == ["extracao-v1-abc.json"]
+
+
+def test_failed_put_keeps_the_previous_entry(tmp_path, monkeypatch):
+    import plano_cache
+
+    cache = ExtractionCache(tmp_path / "cache")
+    cache.put("k", {"versao": 1})
+
+    def dump_partial(data, f):
+        f.write('{"versao": ')
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(plano_cache, "dump_json", dump_partial)
+    with pytest.raises(OSError):
+        cache.put("k", {"versao": 2})
+
+    assert cache.get("k") == {"versao": 1}
+    assert [entry.name for entry in cache.cache_dir.iterdir()] == ["k.json"]
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache")
+    cache.put("k", {"a": 1})
+    (cache.cache_dir / "k.json").write_text('{"a": ')
+
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    # "a" é a mais antiga, mas é lida depois de "b"
+    os.utime(cache.cache_dir / "a.json", (1, 1))
+    os.utime(cache.cache_dir / "b.json", (2, 2))
+    assert cache.get("a") == {"n": 1}
+
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_eviction_by_size(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=150)
+    cache.put("a", {"texto": "x" * 100})
+    os.utime(cache.cache_dir / "a.json", (1, 1))
+
+    cache.put("b", {"texto": "y" * 100})
+
+    assert sorted(entry.name for entry in cache.cache_dir.glob("*.json")) == ["b.json"]
@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# Roda o plano.py em um processo novo e informa quais bibliotecas pesadas foram importadas
+RUN_CLI = """
+import json, runpy, sys
+sys.argv = ["plano.py"] + sys.argv[1:]
+try:
+    runpy.run_path("plano.py", run_name="__main__")
+except SystemExit as e:
+    codigo = e.code
+pesados = sorted(m for m in ("pandas", "numpy", "openpyxl", "pyarrow") if m in sys.modules)
+print(json.dumps({"codigo": codigo, "importados": pesados}), file=sys.stderr)
+"""
+
+
+def run_cli(*args):
+    processo = subprocess.run(
+        [sys.executable, "-c", RUN_CLI, *map(str, args)],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+    )
+    return processo.stdout, json.loads(processo.stderr.strip().splitlines()[-1])
+
+
+def test_list_sheets_does_not_import_pandas(make_workbook):
+    path = make_workbook({"21-22": [["CULTURA"]], "Bancos": [["BANCO"]], "Bens Móveis": [["DESCRIÇÃO"]]})
+
+    saida, resultado = run_cli("list-sheets", path, "--json")
+
+    assert resultado == {"codigo": 0, "importados": []}
+    assert json.loads(saida) == {str(path): ["21-22", "Bancos", "Bens Móveis"]}
+
+
+def test_help_does_not_import_pandas():
+    saida, resultado = run_cli("--help")
+
+    assert resultado == {"codigo": 0, "importados": []}
+    assert "list-sheets" in saida
+
+
+def test_list_sheets_reports_invalid_files(tmp_path):
+    invalido = tmp_path / "invalido.xlsx"
+    invalido.write_text("não é um xlsx")
+
+    processo = subprocess.run(
+        [sys.executable, "plano.py", "list-sheets", str(invalido)],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+
+    assert processo.returncode == 1
+    assert "invalido.xlsx" in processo.stderr
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from extract_plano_negocios_data import extract_file
+
+pa = pytest.importorskip("pyarrow")
+
+SCHEMAS = {
+    "producao": {
+        "safra": pa.dictionary(pa.int8(), pa.string()),
+        "cultura": pa.string(), "ciclo": pa.string(), "sistema": pa.string(),
+        "area_plantada": pa.float64(), "custo_ha": pa.float64(), "custo_total": pa.float64(),
+        "produtividade_ha": pa.float64(), "producao_total": pa.float64(),
+        "preco_unitario": pa.float64(), "receita_total": pa.float64(), "lucro": pa.float64(),
+    },
+    "financeiro": {
+        "categoria": pa.dictionary(pa.int8(), pa.string()),
+        "ano": pa.int64(), "valor": pa.float64(),
+    },
+    "imoveis": {
+        "nome": pa.string(), "municipio": pa.string(), "area_ha": pa.float64(),
+        "valor_ha": pa.float64(), "valor_total": pa.float64(),
+    },
+    "maquinas": {
+        "descricao": pa.string(), "ano": pa.string(), "marca": pa.string(), "valor": pa.float64(),
+    },
+    "arrendamentos": {
+        "fazenda": pa.string(), "proprietario": pa.string(), "area_arrendada": pa.float64(),
+        "prazo": pa.string(), "valor_ha": pa.float64(),
+    },
+}
+
+
+def plain(data_type):
+    """
+    Tipo sem distinguir string de large_string (o pandas 3 gera large_string)
+    """
+    if pa.types.is_dictionary(data_type):
+        return pa.dictionary(data_type.index_type, plain(data_type.value_type))
+    return pa.string() if pa.types.is_large_string(data_type) else data_type
+
+
+def read_table(path, output_format):
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_tables_schemas_and_metadata(make_plan, tmp_path, output_format):
+    path = make_plan()
+
+    output_dir = extract_file(path, tmp_path / "saida", output_format=output_format)
+    dados = json.loads(
+        extract_file(path, tmp_path / "json").read_text(encoding="utf-8")
+    )
+
+    suffix = ".parquet" if output_format == "parquet" else ".arrow"
+    assert sorted(p.name for p in output_dir.iterdir()) == sorted(
+        [f"{name}{suffix}" for name in SCHEMAS] + ["metadata.json"]
+    )
+
+    tables = {name: read_table(output_dir / f"{name}{suffix}", output_format) for name in SCHEMAS}
+    for name, schema in SCHEMAS.items():
+        assert {field.name: plain(field.type) for field in tables[name].schema} == schema, name
+
+    producao = tables["producao"].to_pylist()
+    assert [(row["safra"], row["cultura"]) for row in producao] == [
+        ("2021-22", "SOJA"), ("2021-22", "MILHO"), ("2022-23", "SOJA"), ("2022-23", "MILHO"),
+    ]
+    assert producao[0]["area_plantada"] == 100.0
+
+    financeiro = tables["financeiro"].to_pylist()
+    assert {(row["categoria"], row["ano"]): row["valor"] for row in financeiro} == {
+        ("dividas_bancarias", 2025): 1500.0, ("dividas_bancarias", 2026): 2500.0,
+        ("dividas_imoveis", 2025): 300.0, ("dividas_imoveis", 2026): 300.0,
+        ("dividas_fornecedores", None): 150.0,
+    }
+    assert tables["maquinas"].to_pylist() == [
+        {"descricao": "TRATOR", "ano": "2020", "marca": "JOHN DEERE", "valor": 500000.0}
+    ]
+
+    # Metadados e totais ficam no JSON ao lado das tabelas
+    sidecar = json.loads((output_dir / "metadata.json").read_text(encoding="utf-8"))
+    assert sidecar["metadata"]["arquivo"] == "plano.xlsx"
+    assert sidecar["totais_producao"] == {
+        safra: {k: v for k, v in safra_data.items() if k != "culturas"}
+        for safra, safra_data in dados["producao"].items()
+    }
+    assert sidecar["totais_propriedades"]["imoveis"] == {
+        "total_propriedades": 1, "area_total_ha": 500.0, "valor_total": 10000000.0
+    }
+
+
+def test_unknown_format_is_an_error(tmp_path):
+    from plano_columnar import write_tables
+
+    with pytest.raises(ValueError, match="csv"):
+        write_tables({}, {}, tmp_path, "csv")
@@ -0,0 +1,209 @@
+"""
+build_rows roda sem banco; os testes de integração carregam planos de
+verdade com COPY e só rodam com PLANO_TEST_DSN apontando para um Postgres
+com database/types.sql e database/tables.sql aplicados
+"""
+
+import json
+import os
+import uuid
+
+import pytest
+
+from plano_loader import REPLACE_ORDER, build_rows, machines_without_year, required_names
+
+TEST_DSN = os.environ.get("PLANO_TEST_DSN")
+
+
+def make_plan(produtor="TESTE"):
+    cultura = {
+        "cultura": "SOJA", "ciclo": "1ª SAFRA", "sistema": "SEQUEIRO", "area_plantada": 100.0,
+        "custo_ha": 4000.0, "custo_total": 400000.0, "produtividade_ha": 65.0,
+        "producao_total": 6500.0, "preco_unitario": 120.0, "receita_total": 780000.0,
+        "lucro": 380000.0,
+    }
+    return {
+        "metadata": {"arquivo": "plano.xlsx", "data_extracao": "2025-06-07 10:00:00", "produtor": produtor},
+        "producao": {
+            "2024-25": {"culturas": [cultura]},
+            "2025-26": {"culturas": [dict(cultura, preco_unitario=130.0)]},
+        },
+        "financeiro": {
+            "dividas_bancarias": {"2025": 1000.0, "2026": 2000.0},
+            "dividas_imoveis": {"2025": 500.0},
+            "dividas_fornecedores": 300.0,
+        },
+        "propriedades": {
+            "imoveis": {"lista": [
+                {"nome": "FAZENDA A", "municipio": "SORRISO/MT", "area_ha": 500.0,
+                 "valor_ha": 20000.0, "valor_total": 10000000.0},
+            ]},
+            "maquinas": {"lista": [
+                {"descricao": "TRATOR", "ano": "2020", "marca": "JD", "valor": 500000.0},
+            ]},
+            "arrendamentos": {"lista": [
+                {"fazenda": "FAZENDA B", "proprietario": "JOÃO", "area_arrendada": 50.0,
+                 "prazo": 2030, "valor_ha": 10.0},
+                {"fazenda": "FAZENDA C", "proprietario": "MARIA", "area_arrendada": 20.0,
+                 "prazo": 2030, "valor_ha": 8.0},
+            ]},
+        },
+    }
+
+
+def fake_lookups(all_data):
+    names = required_names(all_data)
+    return {
+        "safras": {ano: uuid.uuid4() for ano in names["safras"]},
+        **{table: {key: uuid.uuid4() for key in names[table]} for table in ("culturas", "sistemas", "ciclos")},
+    }
+
+
+def test_lease_costs_are_reais_per_safra():
+    plano = make_plan()
+    lookups = fake_lookups(plano)
+
+    columns, rows = build_rows("org", plano, lookups)["arrendamentos"]
+    arrendamento = dict(zip(columns, rows[0]))
+    custos = json.loads(arrendamento["custos_por_ano"])
+
+    safras = lookups["safras"]
+    # área x sacas/ha x preço da soja na safra
+    assert custos == {str(safras[2024]): 50 * 10 * 120.0, str(safras[2025]): 50 * 10 * 130.0}
+    assert all(isinstance(valor, float) for valor in custos.values())
+
+
+def test_lease_numbering_starts_at_numero_inicial():
+    plano = make_plan()
+
+    columns, rows = build_rows("org", plano, fake_lookups(plano), numero_inicial=3)["arrendamentos"]
+
+    numeros = [dict(zip(columns, row))["numero_arrendamento"] for row in rows]
+    assert numeros == ["ARR-003", "ARR-004"]
+
+
+def test_lease_cost_without_soy_price_is_an_error():
+    plano = make_plan()
+    for safra in plano["producao"].values():
+        for cultura in safra["culturas"]:
+            cultura["preco_unitario"] = 0.0
+
+    with pytest.raises(ValueError, match="preço da soja"):
+        build_rows("org", plano, fake_lookups(plano))
+
+
+def test_production_rows_belong_to_the_main_property():
+    plano = make_plan()
+
+    tables = build_rows("org", plano, fake_lookups(plano))
+
+    principal = tables["propriedades"][1][0][0]
+    for table in ("produtividades", "custos_producao"):
+        columns, rows = tables[table]
+        assert [dict(zip(columns, row))["propriedade_id"] for row in rows] == [principal]
+
+
+def test_consolidated_rows_are_named_after_the_plan():
+    plano = make_plan("FULANO")
+
+    columns, rows = build_rows("org", plano, fake_lookups(plano))["fornecedores"]
+
+    assert dict(zip(columns, rows[0]))["nome"] == "PLANO DE NEGÓCIOS (CONSOLIDADO) - FULANO (plano.xlsx)"
+
+
+def test_machines_without_year_are_reported():
+    plano = make_plan()
+    plano["propriedades"]["maquinas"]["lista"].append(
+        {"descricao": "PLANTADEIRA", "ano": None, "marca": None, "valor": 100000.0}
+    )
+
+    columns, rows = build_rows("org", plano, fake_lookups(plano))["maquinas_equipamentos"]
+
+    assert [dict(zip(columns, row))["equipamento"] for row in rows] == ["TRATOR"]
+    assert machines_without_year(plano) == ["PLANTADEIRA"]
+
+
+@pytest.fixture
+def organizacao():
+    psycopg = pytest.importorskip("psycopg")
+    organizacao_id = str(uuid.uuid4())
+    with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+        conn.execute(
+            "INSERT INTO organizacoes (id, nome, slug) VALUES (%s, %s, %s)",
+            (organizacao_id, "TESTE PLANO LOADER", f"teste-{organizacao_id}")
+        )
+    yield organizacao_id
+    with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+        for table in REPLACE_ORDER + ["safras", "culturas", "sistemas", "ciclos", "organizacoes"]:
+            column = "id" if table == "organizacoes" else "organizacao_id"
+            conn.execute(f"DELETE FROM {table} WHERE {column} = %s", (organizacao_id,))
+
+
+@pytest.fixture
+def loader():
+    pytest.importorskip("psycopg_pool")
+    from plano_loader import PlanoLoader
+
+    with PlanoLoader(TEST_DSN) as loader:
+        yield loader
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="defina PLANO_TEST_DSN para os testes com Postgres")
+class TestPostgresLoad:
+
+    def test_two_plans_for_the_same_organization(self, loader, organizacao):
+        counts, avisos = loader.load(organizacao, [make_plan("FULANO"), make_plan("BELTRANO")])
+
+        assert counts["arrendamentos"] == 4
+        assert counts["propriedades"] == 6
+        # Produção e registros consolidados de cada plano, sem somar entre planos
+        assert counts["produtividades"] == counts["custos_producao"] == 2
+        assert counts["fornecedores"] == 2
+        assert avisos == []
+
+        with loader.pool.connection() as conn:
+            numeros = [row[0] for row in conn.execute(
+                "SELECT numero_arrendamento FROM arrendamentos WHERE organizacao_id = %s ORDER BY 1",
+                (organizacao,)
+            )]
+            custos = conn.execute(
+                "SELECT custos_por_ano FROM arrendamentos WHERE organizacao_id = %s",
+                (organizacao,)
+            ).fetchone()[0]
+            fornecedores = [row[0] for row in conn.execute(
+                "SELECT valores_por_ano FROM fornecedores WHERE organizacao_id = %s",
+                (organizacao,)
+            )]
+            propriedades = conn.execute(
+                "SELECT count(DISTINCT propriedade_id) FROM produtividades WHERE organizacao_id = %s",
+                (organizacao,)
+            ).fetchone()[0]
+
+        assert numeros == ["ARR-001", "ARR-002", "ARR-003", "ARR-004"]
+        assert all(isinstance(valor, (int, float)) and valor > 0 for valor in custos.values())
+        assert [list(valores.values()) for valores in fornecedores] == [[300], [300]]
+        assert propriedades == 2
+
+    def test_same_plan_twice_is_an_error(self, loader, organizacao):
+        with pytest.raises(ValueError, match="planos repetidos"):
+            loader.load(organizacao, [make_plan(), make_plan()])
+
+    def test_machines_without_year_are_reported(self, loader, organizacao):
+        plano = make_plan()
+        plano["propriedades"]["maquinas"]["lista"].append(
+            {"descricao": "PLANTADEIRA", "ano": "", "marca": None, "valor": 100000.0}
+        )
+
+        counts, avisos = loader.load(organizacao, [plano])
+
+        assert counts["maquinas_equipamentos"] == 1
+        assert len(avisos) == 1 and "PLANTADEIRA" in avisos[0]
+
+    def test_reload_requires_replace(self, loader, organizacao):
+        loader.load(organizacao, [make_plan()])
+
+        with pytest.raises(ValueError, match="--replace"):
+            loader.load(organizacao, [make_plan()])
+
+        counts, _ = loader.load(organizacao, [make_plan()], replace=True)
+        assert counts["arrendamentos"] == 2
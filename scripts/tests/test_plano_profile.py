@@ -0,0 +1,136 @@
+import csv
+import json
+import tracemalloc
+
+from plano_profile import REPORT_FIELDS, Profiled, StageProfiler, write_profile_report
+
+
+def test_nested_stages_are_recorded_inner_first():
+    recebidos = []
+    profiler = StageProfiler(on_record=recebidos.append)
+
+    with profiler.stage("externa", "plano.xlsx"):
+        with profiler.stage("interna", "Bancos") as record:
+            record["linhas"] = 3
+
+    assert [(r["etapa"], r["detalhe"], r["linhas"]) for r in profiler.records] == [
+        ("interna", "Bancos", 3), ("externa", "plano.xlsx", None),
+    ]
+    assert recebidos == profiler.records
+    for record in profiler.records:
+        assert record["tempo_s"] >= 0 and record["cpu_s"] >= 0
+        assert "_pico" not in record
+    externa, interna = profiler.records[1], profiler.records[0]
+    assert externa["tempo_s"] >= interna["tempo_s"]
+
+
+def test_memory_peak_of_inner_stage_counts_in_outer_stage():
+    profiler = StageProfiler()
+    tracemalloc.start()
+    try:
+        with profiler.stage("externa"):
+            with profiler.stage("interna"):
+                bloco = bytearray(4 * 1024 * 1024)
+                del bloco
+    finally:
+        tracemalloc.stop()
+
+    interna, externa = profiler.records
+    assert interna["pico_tracemalloc_kb"] >= 4096
+    assert externa["pico_tracemalloc_kb"] >= interna["pico_tracemalloc_kb"]
+
+
+def test_without_tracemalloc_memory_peak_is_empty():
+    profiler = StageProfiler()
+
+    with profiler.stage("etapa"):
+        pass
+
+    assert profiler.records[0]["pico_tracemalloc_kb"] is None
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+
+    with profiler.stage("etapa") as record:
+        record["linhas"] = 1
+
+    assert profiler.records == []
+
+
+def test_profiled_extraction_records_each_stage(make_plan, tmp_path):
+    from extract_plano_negocios_data import extract_file
+
+    path = make_plan()
+
+    result = Profiled(extract_file)(path, output_dir=tmp_path)
+
+    assert result["resultado"] == tmp_path / "dados_extraidos_plano.json"
+    perfil = result["perfil"]
+    assert {record["arquivo"] for record in perfil} == {"plano.xlsx"}
+    etapas = [(record["etapa"], record["detalhe"]) for record in perfil]
+    assert etapas[-1] == ("total", "plano.xlsx")
+    assert ("abertura", "plano.xlsx") in etapas
+    assert ("leitura_planilha", "Bancos") in etapas
+    assert ("agregacao", "producao") in etapas
+    assert ("gravacao", "json") in etapas
+    leitura = next(r for r in perfil if r["etapa"] == "leitura_planilha" and r["detalhe"] == "Bancos")
+    assert leitura["linhas"] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_report_joins_the_records_of_the_batch(tmp_path):
+    registro = {
+        "arquivo": "plano.xlsx", "etapa": "total", "detalhe": None, "linhas": None,
+        "tempo_s": 1.5, "cpu_s": 1.0, "pico_tracemalloc_kb": 10.0, "pico_rss_kb": 2048,
+    }
+    results = [
+        ("plano.xlsx", {"resultado": None, "perfil": [registro]}, None),
+        ("erro.xlsx", None, "falhou"),
+    ]
+
+    json_path = write_profile_report(tmp_path / "perfil.json", results)
+    csv_path = write_profile_report(tmp_path / "perfil.csv", results)
+
+    assert json.loads(json_path.read_text(encoding="utf-8")) == [registro]
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == REPORT_FIELDS
+    assert rows[0]["etapa"] == "total" and rows[0]["tempo_s"] == "1.5"
+
+
+def test_profile_report_of_a_batch(make_plan, tmp_path):
+    from plano import main
+
+    make_plan(name="um.xlsx")
+    make_plan(name="dois.xlsx", fator=2)
+    relatorio = tmp_path / "perfil" / "extracao.csv"
+
+    codigo = main([
+        "extract", str(tmp_path / "*.xlsx"), "-w", "2", "-o", str(tmp_path / "saida"),
+        "--profile", str(relatorio),
+    ])
+
+    assert codigo == 0
+    with open(relatorio, encoding="utf-8", newline="") as f:
+        registros = list(csv.DictReader(f))
+    assert {r["arquivo"] for r in registros} == {"um.xlsx", "dois.xlsx"}
+    for arquivo in ("um.xlsx", "dois.xlsx"):
+        etapas = {r["etapa"] for r in registros if r["arquivo"] == arquivo}
+        assert {"total", "abertura", "leitura_planilha", "agregacao", "gravacao"} <= etapas
+    # Com --profile o cache fica desligado: as etapas são sempre medidas
+    assert (tmp_path / "saida" / "dados_extraidos_um.json").exists()
+
+
+def test_profile_of_analysis_with_sheet_workers(make_plan, tmp_path):
+    from analyze_plano_negocios import analyze_excel_file
+
+    path = make_plan()
+    profiler = StageProfiler(trace_memory=False)
+
+    analyze_excel_file(path, tmp_path, profiler=profiler, sheet_workers=2)
+
+    detalhes = {(r["etapa"], r["detalhe"]) for r in profiler.records}
+    for planilha in ("21-22", "Bancos", "Arrendamentos"):
+        assert ("deteccao_cabecalho", planilha) in detalhes
+        assert ("estatisticas_colunas", planilha) in detalhes
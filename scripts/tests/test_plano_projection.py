@@ -0,0 +1,115 @@
+import json
+import warnings
+
+import numpy as np
+import pytest
+
+from plano_projection import LIMIARES, PlanArrays, parse_range, project, risk_levels, summarize
+
+
+def make_plan_arrays():
+    return PlanArrays(
+        safras=["2024-25", "2025-26"],
+        anos=np.array([2024, 2025]),
+        culturas=["SOJA", "MILHO"],
+        area=np.array([[100.0, 50.0], [120.0, 0.0]]),
+        produtividade=np.array([[60.0, 100.0], [62.0, np.nan]]),
+        preco=np.array([[120.0, 50.0], [110.0, np.nan]]),
+        custo=np.array([[400000.0, 150000.0], [480000.0, 0.0]]),
+        divida=np.array([3000.0, 2000.0]),
+        servico_divida=np.array([1000.0, 0.0]),
+    )
+
+
+def scenario(plan, variacao_preco, variacao_produtividade, s):
+    """
+    Indicadores de um cenário calculados diretamente, cultura a cultura
+    """
+    receita = 0.0
+    for c in range(len(plan.culturas)):
+        valor = plan.area[s, c] * plan.produtividade[s, c] * plan.preco[s, c]
+        if not np.isnan(valor):
+            receita += (1 + variacao_preco[c]) * (1 + variacao_produtividade[c]) * valor
+    custo = plan.custo[s].sum()
+    ebitda = receita - custo
+    divida = plan.divida[s]
+
+    def ratio(a, b):
+        return a / b if b > 0 else np.nan
+
+    return {
+        "receita": receita, "custo": custo, "ebitda": ebitda,
+        "margem_ebitda": ratio(ebitda, receita), "divida": divida,
+        "divida_receita": ratio(divida, receita), "divida_ebitda": ratio(divida, ebitda),
+        "cobertura_servico": ratio(ebitda, plan.servico_divida[s]),
+    }
+
+
+def test_project_matches_scenario_by_scenario():
+    plan = make_plan_arrays()
+    precos = [-0.25, 0.0, 0.3]
+    produtividades = [[-0.2, 0.1], [0.0, 0.0]]
+
+    resultado = project(plan, precos, produtividades)
+
+    assert resultado["receita"].shape == (3, 2, 2)
+    for p, preco in enumerate(precos):
+        for q, produtividade in enumerate(produtividades):
+            for s in range(len(plan.safras)):
+                esperado = scenario(plan, [preco] * 2, produtividade, s)
+                for nome, valor in esperado.items():
+                    np.testing.assert_allclose(resultado[nome][p, q, s], valor, err_msg=nome)
+
+
+def test_risk_levels_follow_the_thresholds():
+    valores = np.array([0.0, 2.0, 2.01, 3.5, 5.0, 5.01, np.nan, -1.0])
+
+    niveis = risk_levels(valores, LIMIARES["divida_ebitda"])
+
+    assert niveis.tolist() == ["BAIXO", "BAIXO", "MEDIO", "MEDIO", "ALTO", "CRITICO", "CRITICO", "BAIXO"]
+
+
+def test_parse_range():
+    assert parse_range("-0.1:0.1:0.05").tolist() == [-0.1, -0.05, 0.0, 0.05, 0.1]
+    assert parse_range("-0.2,0,0.15").tolist() == [-0.2, 0.0, 0.15]
+
+
+def test_summary_of_an_extracted_plan(make_plan, tmp_path):
+    from extract_plano_negocios_data import extract_file
+
+    dados = json.loads(extract_file(make_plan(), tmp_path).read_text(encoding="utf-8"))
+    plan = PlanArrays.from_extraction(dados)
+
+    assert plan.safras == ["2021-22", "2022-23"]
+    assert plan.culturas == ["MILHO / 2ª SAFRA / SEQUEIRO", "SOJA / 1ª SAFRA / SEQUEIRO"]
+    np.testing.assert_allclose(plan.area, [[50.0, 100.0], [50.0, 100.0]])
+    np.testing.assert_allclose(plan.produtividade[:, 1], [60.0, 61.0])
+
+    precos = parse_range("-0.3:0.3:0.1")
+    resumo = summarize(plan, project(plan, precos, [0.0]), precos, [0.0])
+
+    base = resumo["safras"]["2021-22"]["base"]
+    assert base["receita"] == pytest.approx(60 * 12000 + 250000)
+    assert base["custo"] == pytest.approx(550000)
+    assert resumo["cenarios"]["total"] == len(precos)
+    for safra in resumo["safras"].values():
+        assert sum(safra["risco"]["divida_ebitda"].values()) == pytest.approx(1.0)
+        faixa = safra["percentis"]["receita"]
+        assert faixa["p5"] <= faixa["p50"] <= faixa["p95"]
+
+
+def test_summary_reports_scenario_less_indicators_as_missing():
+    plan = make_plan_arrays()
+    # Safra 2025-26 com EBITDA negativo em todos os cenários: dívida/EBITDA sem valor
+    plan.custo[1, 0] = 10 ** 9
+    precos = [-0.1, 0.0, 0.1]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        resumo = summarize(plan, project(plan, precos, [0.0]), precos, [0.0])
+
+    percentis = resumo["safras"]["2025-26"]["percentis"]
+    assert percentis["divida_ebitda"] == {"p5": None, "p50": None, "p95": None}
+    assert percentis["receita"]["p50"] == pytest.approx(120 * 62 * 110)
+    assert resumo["safras"]["2024-25"]["percentis"]["divida_ebitda"]["p50"] is not None
+    assert resumo["safras"]["2025-26"]["risco"]["divida_ebitda"]["CRITICO"] == 1.0
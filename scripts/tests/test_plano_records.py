@@ -0,0 +1,114 @@
+import io
+import json
+import math
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import plano_records
+from plano_records import CategoricalColumn, RecordTable, dump_json
+
+
+def materialize(obj):
+    """
+    `obj` com cada RecordTable trocado pela lista de dicts equivalente
+    """
+    if isinstance(obj, RecordTable):
+        return list(obj)
+    if isinstance(obj, dict):
+        return {key: materialize(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [materialize(value) for value in obj]
+    return obj
+
+
+def dumped(data, indent):
+    f = io.StringIO()
+    dump_json(data, f, indent=indent)
+    return f.getvalue()
+
+
+def expected(data, indent):
+    f = io.StringIO()
+    json.dump(materialize(data), f, ensure_ascii=False, indent=indent, default=str)
+    return f.getvalue()
+
+
+def make_table(rows=10):
+    df = pd.DataFrame({
+        "cultura": (["SOJA", "MILHO", None, "ALGODÃO \"pluma\""] * rows)[:rows],
+        "area": [float(i) * 1.1 for i in range(rows)],
+        "prazo": ([2030, "2031/32", None, 1.5] * rows)[:rows],
+    })
+    df.loc[1, "area"] = math.nan
+    df.loc[2, "area"] = math.inf
+    df.loc[3, "area"] = -math.inf
+    return RecordTable.from_frame(df, categorical=("cultura",))
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_dump_json_is_byte_identical_to_json_dump(indent):
+    tabela = make_table()
+    data = {
+        "metadata": {"arquivo": "plano ç.xlsx", "data": date(2025, 6, 7)},
+        "imoveis": {"lista": tabela, "total": 3, "vazia": RecordTable([], {})},
+        "listas": [tabela, {"x": [1, 2.5, None]}, []],
+        2025: {True: 1.0, None: "nulo", 1.5: "chave float"},
+        "vazio": {},
+    }
+
+    assert dumped(data, indent) == expected(data, indent)
+
+
+def test_rows_are_encoded_in_chunks(monkeypatch):
+    monkeypatch.setattr(plano_records, "ENCODE_CHUNK_ROWS", 3)
+    tabela = make_table(rows=10)
+
+    assert dumped({"lista": tabela}, 2) == expected({"lista": tabela}, 2)
+    assert len(list(tabela.iter_json())) == 10
+
+
+def test_record_table_reads_like_a_list_of_dicts():
+    tabela = make_table(rows=4)
+
+    registros = list(tabela)
+    assert len(tabela) == 4
+    assert registros[0] == {"cultura": "SOJA", "area": 0.0, "prazo": 2030}
+    assert tabela[3]["cultura"] == 'ALGODÃO "pluma"'
+    assert math.isnan(tabela[2]["cultura"])
+    assert tabela.column("prazo")[:2] == [2030, "2031/32"]
+
+
+def test_extracted_data_is_dumped_like_json(make_plan):
+    from extract_plano_negocios_data import extract_production_data, extract_property_data
+
+    path = make_plan()
+    data = {"producao": extract_production_data(path), "propriedades": extract_property_data(path)}
+
+    assert dumped(data, 2) == expected(data, 2)
+
+
+def test_records_are_kept_in_typed_columns():
+    tabela = make_table(rows=8)
+
+    cultura = tabela.columns["cultura"]
+    assert isinstance(cultura, CategoricalColumn)
+    assert cultura.categories == ["SOJA", "MILHO", 'ALGODÃO "pluma"']
+    assert cultura.codes.typecode == plano_records.CODE_TYPECODE
+    assert cultura.codes.tolist() == [0, 1, -1, 2] * 2
+    assert tabela.columns["area"].typecode == plano_records.NUMBER_TYPECODE
+    assert isinstance(tabela.columns["prazo"], list)
+
+
+def test_extracted_sections_use_the_categorical_fields_of_the_spec(make_plan):
+    from extract_plano_negocios_data import extract_production_data
+    from plano_specs import SHEET_SPECS
+
+    culturas = extract_production_data(make_plan())["2021-22"]["culturas"]
+
+    assert isinstance(culturas, RecordTable)
+    for field in SHEET_SPECS["safra"]["categorical"]:
+        assert isinstance(culturas.columns[field], CategoricalColumn)
+    assert sorted(culturas.columns["cultura"].categories) == ["MILHO", "SOJA"]
+    assert culturas.column("area_plantada") == [100.0, 50.0]
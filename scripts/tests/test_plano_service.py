@@ -0,0 +1,145 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+
+from plano_service import CONCLUIDO, ERRO, FINAL_STATUSES, ExtractionService, HttpError
+
+
+def test_concurrent_submits_of_same_file_share_the_job(tmp_path):
+    async def run():
+        service = ExtractionService(work_dir=tmp_path)
+        return await asyncio.gather(
+            service.submit(b"planilha", "plano.xlsx"),
+            service.submit(b"planilha", "plano.xlsx"),
+        ), service
+
+    (first, second), service = asyncio.run(run())
+
+    assert first[0] is second[0]
+    assert sorted([first[1], second[1]]) == [False, True]
+    assert service._queue.qsize() == 1
+
+
+def test_queue_slot_is_reserved_while_saving(tmp_path):
+    async def run():
+        service = ExtractionService(work_dir=tmp_path, max_queue=1)
+        return await asyncio.gather(
+            service.submit(b"plano 1", "um.xlsx"),
+            service.submit(b"plano 2", "dois.xlsx"),
+            return_exceptions=True,
+        ), service
+
+    results, service = asyncio.run(run())
+
+    assert results[0][1] is False
+    assert isinstance(results[1], HttpError)
+    assert results[1].status == HTTPStatus.SERVICE_UNAVAILABLE
+    assert service._queue.qsize() == 1
+
+
+def test_failed_save_drops_the_job(tmp_path):
+    # O diretório de trabalho é um arquivo: a gravação do envio falha
+    work_dir = tmp_path / "servico"
+    work_dir.write_text("")
+
+    async def run():
+        service = ExtractionService(work_dir=work_dir)
+        with pytest.raises(OSError):
+            await service.submit(b"planilha", "plano.xlsx")
+        return service
+
+    service = asyncio.run(run())
+
+    assert service.jobs == {}
+    assert service._reserved == 0
+    assert service._queue.qsize() == 0
+
+
+def test_failed_job_can_be_resubmitted(tmp_path):
+    async def run():
+        service = ExtractionService(work_dir=tmp_path)
+        job, _ = await service.submit(b"planilha", "plano.xlsx")
+        job.status = ERRO
+        return job, await service.submit(b"planilha", "plano.xlsx")
+
+    job, (novo, duplicado) = asyncio.run(run())
+
+    assert novo is not job
+    assert duplicado is False
+
+
+def test_oldest_finished_jobs_are_dropped(tmp_path):
+    async def run():
+        service = ExtractionService(work_dir=tmp_path, max_finished=2)
+        jobs = [(await service.submit(f"plano {i}".encode(), "plano.xlsx"))[0] for i in range(3)]
+        for job in jobs:
+            await service._finish(job, CONCLUIDO)
+        return service, jobs
+
+    service, jobs = asyncio.run(run())
+
+    assert list(service.jobs.values()) == jobs[1:]
+    assert not jobs[0].file_path.parent.exists()
+    assert all(job.file_path.exists() for job in jobs[1:])
+
+
+def test_resubmitted_job_is_not_dropped_with_the_failed_one(tmp_path):
+    async def run():
+        service = ExtractionService(work_dir=tmp_path, max_finished=1)
+        falhou, _ = await service.submit(b"planilha", "plano.xlsx")
+        await service._finish(falhou, ERRO)
+        novo, _ = await service.submit(b"planilha", "plano.xlsx")
+        outro, _ = await service.submit(b"outra planilha", "outro.xlsx")
+        await service._finish(outro, CONCLUIDO)
+        return service, novo
+
+    service, novo = asyncio.run(run())
+
+    assert service.jobs[novo.id] is novo
+    assert novo.file_path.exists()
+
+
+class SlowEvents:
+    """
+    Fila de eventos que entrega cada mensagem com atraso, como quando o
+    repasse fica para trás do resultado do processo de trabalho
+    """
+
+    def __init__(self, events, delay=0.05):
+        self._events = events
+        self._delay = delay
+
+    def get(self):
+        time.sleep(self._delay)
+        return self._events.get()
+
+    def __getattr__(self, name):
+        return getattr(self._events, name)
+
+
+def test_stage_events_arrive_before_the_job_finishes(make_plan, tmp_path):
+    path = make_plan()
+
+    async def run():
+        service = ExtractionService(work_dir=tmp_path / "servico", workers=1, use_cache=False)
+        await service.start()
+        service._events = SlowEvents(service._events)
+        try:
+            job, _ = await service.submit(path.read_bytes(), "plano.xlsx")
+            queue = job.subscribe()
+            events = []
+            while not events or events[-1]["status"] not in FINAL_STATUSES:
+                events.append(await asyncio.wait_for(queue.get(), 60))
+            return job, events
+        finally:
+            await service.stop()
+
+    job, events = asyncio.run(run())
+
+    assert job.status == CONCLUIDO, job.error
+    etapas = [event["etapa"] for event in events if "etapa" in event]
+    # A gravação é a última etapa medida no processo de trabalho
+    assert etapas[-1] == "gravacao"
+    assert events[-1]["status"] == CONCLUIDO
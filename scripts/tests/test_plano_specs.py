@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from plano_layout import LayoutIndex
+from plano_specs import extract_sheet, total_rows
+from plano_workbook import PlanoWorkbook
+
+TITULO = [["Plano de Negócios"]] + [[None]] * 4
+
+SHEETS = {
+    "Bancos": TITULO + [
+        ["Banco", 2025, 2026],
+        ["Banco A", 60, 70],
+        ["Banco B", 40, 30],
+        [None, None, None],
+        ["TOTAL", 100, 100],
+    ],
+    "Fornecedores": TITULO + [
+        ["Fornecedor", "Março", "Abril"],
+        ["Fornecedor A", 50, 50],
+        ["  Total geral", 50, 50],
+    ],
+    "Bens Imóveis": TITULO + [
+        ["DENOMINAÇÃO DO IMÓVEL", "MUNICIPIO/UF", "ÁREA (HA)", "Valor Total"],
+        ["Fazenda A", "Sorriso/MT", 100, 1000],
+        [None, "TOTAL", 100, 1000],
+    ],
+}
+
+
+@pytest.mark.parametrize("sheet_name", list(SHEETS))
+def test_engines_give_same_result_with_total_rows(make_workbook, sheet_name):
+    path = make_workbook(SHEETS)
+
+    results = {}
+    for engine in ("pandas", "stream"):
+        with PlanoWorkbook(path, engine=engine) as workbook:
+            results[engine] = extract_sheet(workbook, sheet_name, layouts=LayoutIndex())
+
+    if isinstance(results["pandas"], pd.DataFrame):
+        pd.testing.assert_frame_equal(results["pandas"], results["stream"], check_dtype=False)
+    else:
+        assert results["pandas"] == results["stream"]
+
+
+def test_total_rows_are_not_added_up(make_workbook):
+    path = make_workbook(SHEETS)
+
+    for engine in ("pandas", "stream"):
+        with PlanoWorkbook(path, engine=engine) as workbook:
+            bancos = extract_sheet(workbook, "Bancos", layouts=LayoutIndex())
+            fornecedores = extract_sheet(workbook, "Fornecedores", layouts=LayoutIndex())
+            imoveis = extract_sheet(workbook, "Bens Imóveis", layouts=LayoutIndex())
+
+        assert bancos == {"2025": 100.0, "2026": 100.0}
+        assert fornecedores == 100.0
+        assert imoveis["nome"].tolist() == ["Fazenda A"]
+
+
+def test_total_rows_mask():
+    df = pd.DataFrame([["A", 1], [None, " total"], ["  ", "TOTAL"], ["Subtotal", 2]], dtype=object)
+    assert total_rows(df).tolist() == [False, True, True, False]
+    assert total_rows(pd.DataFrame()).tolist() == []
+
+
+def test_total_rows_mask_without_text_columns():
+    # Colunas de objetos só com números e colunas numéricas
+    df = pd.DataFrame({"a": pd.Series([1, None, None], dtype=object), "b": [2.0, 3.0, None]})
+    assert total_rows(df).tolist() == [False, False, False]
+
+
+def test_extract_sheet_closes_only_the_sessions_it_opens(make_workbook, monkeypatch):
+    from extract_plano_negocios_data import extract_financial_data, extract_property_data
+
+    path = make_workbook(SHEETS)
+    fechadas = []
+    close = PlanoWorkbook.close
+    monkeypatch.setattr(PlanoWorkbook, "close", lambda self: (fechadas.append(self), close(self)))
+
+    assert extract_sheet(path, "Bancos", layouts=LayoutIndex()) == {"2025": 100.0, "2026": 100.0}
+    extract_financial_data(path)
+    extract_property_data(path)
+    assert len(fechadas) == 3
+
+    with PlanoWorkbook(path) as workbook:
+        extract_sheet(workbook, "Bancos", layouts=LayoutIndex())
+        extract_financial_data(workbook)
+        assert len(fechadas) == 3
+        assert extract_sheet(workbook, "Fornecedores", layouts=LayoutIndex()) == 100.0
+    assert fechadas[-1] is workbook
@@ -0,0 +1,78 @@
+import pytest
+
+from extract_plano_negocios_data import extract_file
+from plano_store import PortfolioStore
+
+
+@pytest.fixture
+def extract(make_plan, tmp_path):
+    """
+    Extrai o plano de um produtor e devolve o caminho do JSON
+    """
+    def run(produtor, **kwargs):
+        path = make_plan(name=f"PLANO DE NEGÓCIOS {produtor}_070625.xlsx", **kwargs)
+        return extract_file(path, tmp_path / "saida")
+
+    return run
+
+
+@pytest.fixture
+def store(tmp_path):
+    with PortfolioStore(tmp_path / "carteira.sqlite") as store:
+        yield store
+
+
+def test_ingest_and_queries(store, extract):
+    counts = store.ingest(extract("FULANO"))
+    store.ingest(extract("BELTRANO", fator=2))
+
+    assert counts == {"producao": 4, "dividas": 5, "imoveis": 1, "maquinas": 1, "arrendamentos": 1}
+
+    area = store.area_by_culture(safra="2021-22")
+    assert [(row["cultura"], row["area_plantada"], row["produtores"]) for row in area] == [
+        ("SOJA", 300.0, 2), ("MILHO", 150.0, 2),
+    ]
+    assert store.area_by_culture(cultura="soja", produtor="FULANO") == [
+        {"safra": "2021-22", "cultura": "SOJA", "area_plantada": 100.0, "producao_total": 6000.0,
+         "receita_total": 720000.0, "produtores": 1},
+        {"safra": "2022-23", "cultura": "SOJA", "area_plantada": 100.0, "producao_total": 6100.0,
+         "receita_total": 732000.0, "produtores": 1},
+    ]
+
+    assert store.debt_maturity(ano_inicio=2026) == [
+        {"ano": 2026, "bancarias": 5000.0, "imoveis": 600.0, "total": 5600.0, "produtores": 2},
+    ]
+
+    produtores = {row["produtor"]: row for row in store.producers()}
+    assert list(produtores) == ["BELTRANO", "FULANO"]
+    assert produtores["FULANO"]["area_ultima_safra"] == 150.0
+    assert produtores["FULANO"]["divida_total"] == 1500 + 2500 + 300 + 300 + 150
+    assert produtores["BELTRANO"]["valor_imoveis"] == 20000000.0
+
+
+def test_reingest_skips_unchanged_and_replaces_changed_plans(store, extract):
+    json_path = extract("FULANO")
+    store.ingest(json_path)
+
+    assert store.ingest(json_path) is None
+
+    # Novo plano do mesmo produtor substitui o anterior
+    store.ingest(extract("FULANO", fator=2, safras=("21-22",)))
+
+    assert [row["produtor"] for row in store.producers()] == ["FULANO"]
+    assert store.area_by_culture() == [
+        {"safra": "2021-22", "cultura": "SOJA", "area_plantada": 200.0, "producao_total": 12000.0,
+         "receita_total": 1440000.0, "produtores": 1},
+        {"safra": "2021-22", "cultura": "MILHO", "area_plantada": 100.0, "producao_total": 10000.0,
+         "receita_total": 500000.0, "produtores": 1},
+    ]
+    assert store.conn.execute("SELECT COUNT(*) FROM planos").fetchone()[0] == 1
+    assert store.conn.execute("SELECT COUNT(*) FROM dividas").fetchone()[0] == 5
+
+
+def test_remove_producer(store, extract):
+    store.ingest(extract("FULANO"))
+
+    assert store.remove("FULANO") == 1
+    for table in ("planos", "producao", "dividas", "imoveis", "maquinas", "arrendamentos"):
+        assert store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
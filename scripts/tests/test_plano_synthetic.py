@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from benchmark_plano_negocios import compare_results, main, run_benchmark
+from plano_synthetic import generate_workbook, generate_workbooks, safra_names
+from plano_xlsx import sheet_fingerprints
+
+pytest.importorskip("openpyxl")
+
+
+def test_safra_names_wrap_the_century():
+    assert safra_names(3) == ["21-22", "22-23", "23-24"]
+    assert safra_names(2, first_year=98) == ["98-99", "99-00"]
+
+
+def test_generator_is_deterministic_per_seed(tmp_path):
+    um = generate_workbook(tmp_path / "um.xlsx", safras=2, rows=5, seed=7)
+    dois = generate_workbook(tmp_path / "dois.xlsx", safras=2, rows=5, seed=7)
+    outro = generate_workbook(tmp_path / "outro.xlsx", safras=2, rows=5, seed=8)
+
+    assert sheet_fingerprints(um) == sheet_fingerprints(dois)
+    assert sheet_fingerprints(um) != sheet_fingerprints(outro)
+    assert list(sheet_fingerprints(um)) == [
+        "21-22", "22-23", "Bancos", "Endiv. Imóveis", "Fornecedores",
+        "Bens Imóveis", "Bens Móveis", "Arrendamentos",
+    ]
+
+
+def test_generated_plan_is_extracted_like_a_real_one(tmp_path):
+    from extract_plano_negocios_data import extract_file
+
+    (path,) = generate_workbooks(tmp_path, files=1, safras=3, rows=4, seed=1)
+    assert path.name == "plano_sintetico_s3_r4_001.xlsx"
+
+    dados = json.loads(extract_file(path, tmp_path / "saida").read_text(encoding="utf-8"))
+
+    assert list(dados["producao"]) == ["2021-22", "2022-23", "2023-24"]
+    # A linha TOTAL do gerador não entra como cultura
+    assert all(len(safra["culturas"]) == 4 for safra in dados["producao"].values())
+    assert list(dados["financeiro"]["dividas_bancarias"]) == [str(ano) for ano in range(2025, 2033)]
+    propriedades = dados["propriedades"]
+    assert propriedades["imoveis"]["total_propriedades"] == 4
+    assert propriedades["maquinas"]["total_itens"] == 4
+    assert propriedades["arrendamentos"]["total_contratos"] == 4
+
+
+def test_benchmark_result(tmp_path):
+    resultado = run_benchmark(tmp_path, files=1, safras=2, rows=3, repeat=2)
+
+    assert resultado["metadata"]["parametros"] == {
+        "arquivos": 1, "safras": 2, "linhas": 3, "seed": 0, "repeticoes": 2, "engine": "pandas"
+    }
+    assert set(resultado["resultados"]) == {
+        "extract_production_data", "extract_financial_data", "extract_property_data",
+        "analyze_excel_file",
+    }
+    for caso in resultado["resultados"].values():
+        assert len(caso["amostras_s"]) == 2
+        assert caso["min_s"] <= caso["mediana_s"]
+
+
+def benchmark(**medianas):
+    return {
+        "metadata": {"parametros": {"arquivos": 1}},
+        "resultados": {name: {"mediana_s": valor} for name, valor in medianas.items()},
+    }
+
+
+def test_compare_results_flags_regressions():
+    comparacao, regressoes = compare_results(
+        benchmark(a=1.3, b=1.0, novo=5.0), benchmark(a=1.0, b=1.0), threshold=1.2
+    )
+
+    assert [(name, razao) for name, _, _, razao in comparacao] == [("a", pytest.approx(1.3)), ("b", 1.0)]
+    assert regressoes == ["a"]
+
+
+def test_main_fails_on_regression_against_baseline(tmp_path, monkeypatch):
+    import benchmark_plano_negocios
+
+    baseline = tmp_path / "anterior.json"
+    baseline.write_text(json.dumps(benchmark(a=1.0)), encoding="utf-8")
+    monkeypatch.setattr(benchmark_plano_negocios, "run_benchmark", lambda *args: benchmark(a=2.0))
+
+    assert main(["--baseline", str(baseline)]) == 1
+    assert main(["--baseline", str(baseline), "--threshold", "3"]) == 0
@@ -0,0 +1,11 @@
+from plano_workbook import data_rows, until_blank_run
+
+
+def test_data_rows_drops_blank_and_total_rows():
+    rows = [("A", 1), (None, None), ("  ", None), (None, " Total geral"), ("Subtotal", 2), (3, "TOTAL")]
+    assert list(data_rows(iter(rows))) == [("A", 1), ("Subtotal", 2), (3, "TOTAL")]
+
+
+def test_until_blank_run_stops_at_blank_run():
+    rows = [("A",), (None,), ("B",)] + [(None,)] * 3 + [("C",)]
+    assert list(until_blank_run(iter(rows), limit=3)) == [("A",), (None,), ("B",)]
@@ -0,0 +1,115 @@
+import zipfile
+from xml.sax.saxutils import escape
+
+import openpyxl
+
+from plano_xlsx import sheet_fingerprints, sheet_names
+
+SHEETS = {
+    "Bancos": [["Banco", 2025, 2026], ["Banco A", 60, 70]],
+    "Fornecedores": [["Fornecedor", "Março", "Abril"], ["Fornecedor A", 50, 50]],
+    "21-22": [["CULTURA", "Área Plantada"], ["SOJA", 100], ["MILHO & SORGO", 50]],
+}
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def save_with_shared_strings(path, sheets):
+    """
+    Grava o .xlsx como o Excel: textos em sharedStrings.xml, indexados na
+    ordem em que aparecem nas abas
+    """
+    strings = []
+    sheet_xml = []
+    for rows in sheets.values():
+        xml_rows = []
+        for r, row in enumerate(rows, 1):
+            cells = []
+            for c, value in enumerate(row):
+                ref = f"{chr(65 + c)}{r}"
+                if isinstance(value, str):
+                    if value not in strings:
+                        strings.append(value)
+                    cells.append(f'<c r="{ref}" t="s"><v>{strings.index(value)}</v></c>')
+                else:
+                    cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            xml_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+        sheet_xml.append(f'<worksheet xmlns="{MAIN}"><sheetData>{"".join(xml_rows)}</sheetData></worksheet>')
+
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        archive.writestr("_rels/.rels", (
+            f'<Relationships xmlns="{PKG}">'
+            f'<Relationship Id="rId1" Type="{REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+        archive.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{MAIN}" xmlns:r="{REL}"><sheets>'
+            + "".join(
+                f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, name in enumerate(sheets, 1)
+            )
+            + '</sheets></workbook>'
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            f'<Relationships xmlns="{PKG}">{sheet_rels}'
+            f'<Relationship Id="rIdS" Type="{REL}/sharedStrings" Target="sharedStrings.xml"/></Relationships>'
+        ))
+        archive.writestr("xl/sharedStrings.xml", (
+            f'<sst xmlns="{MAIN}" count="{len(strings)}" uniqueCount="{len(strings)}">'
+            + "".join(f"<si><t>{escape(text)}</t></si>" for text in strings)
+            + "</sst>"
+        ))
+        for i, xml in enumerate(sheet_xml, 1):
+            archive.writestr(f"xl/worksheets/sheet{i}.xml", xml)
+    return path
+
+
+def test_sheet_names_in_tab_order(make_workbook):
+    assert sheet_names(make_workbook(SHEETS)) == list(SHEETS)
+
+
+def test_openpyxl_resave_keeps_fingerprints(tmp_path):
+    # O openpyxl regrava os textos na própria célula (inlineStr)
+    path = save_with_shared_strings(tmp_path / "excel.xlsx", SHEETS)
+    resaved = tmp_path / "resaved.xlsx"
+    openpyxl.load_workbook(path).save(resaved)
+
+    assert sheet_fingerprints(resaved) == sheet_fingerprints(path)
+
+
+def test_editing_one_sheet_changes_only_its_fingerprint(tmp_path):
+    antes = sheet_fingerprints(save_with_shared_strings(tmp_path / "antes.xlsx", SHEETS))
+
+    # Um texto novo na primeira aba renumera os textos compartilhados das demais
+    editado = {**SHEETS, "Bancos": [["Banco", 2025, 2026, "Observação"], ["Banco A", 60, 70]]}
+    depois = sheet_fingerprints(save_with_shared_strings(tmp_path / "depois.xlsx", editado))
+
+    assert [nome for nome in SHEETS if antes[nome] != depois[nome]] == ["Bancos"]
+
+
+def test_value_change_changes_fingerprint(make_workbook, tmp_path):
+    antes = sheet_fingerprints(make_workbook(SHEETS))
+    editado = {**SHEETS, "21-22": [["CULTURA", "Área Plantada"], ["SOJA", 101], ["MILHO & SORGO", 50]]}
+    depois = sheet_fingerprints(make_workbook(editado, name="editado.xlsx"))
+
+    assert [nome for nome in SHEETS if antes[nome] != depois[nome]] == ["21-22"]